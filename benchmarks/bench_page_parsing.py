@@ -0,0 +1,211 @@
+"""
+Benchmark page parsing: the original BeautifulSoup + backward brace scan versus
+the raw_decode based extractor and locator.
+
+Usage:
+    python benchmarks/bench_page_parsing.py                  # real pages saved in benchmarks/pages
+    python benchmarks/bench_page_parsing.py --live           # live watch and search pages
+    python benchmarks/bench_page_parsing.py page1.html ...   # other saved pages (.html or .html.gz)
+
+For each page it reports the time to parse the page and look up the keys the
+crawler needs, and the time of the key locator alone on the raw script texts.
+Saved pages named after a key of PAGES (e.g. watch.html.gz) are searched for
+that page's keys, others for DEFAULT_KEYS.
+"""
+import glob
+import gzip
+import os
+import re
+import sys
+import timeit
+
+from bs4 import BeautifulSoup
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from yt_crawler.config import HEADERS
+from yt_crawler.utils import parse_youtube_page_scripts, grab_dict_by_key, SCRIPT_TEXT_PATTERN
+
+
+PAGES = {
+    'watch': ('https://www.youtube.com/watch?v=nUgGY18iTJw', ['videoDetails', 'captionTracks', 'subMenuItems']),
+    'search': ('https://www.youtube.com/results?search_query=python+tutorial', ['sectionListRenderer', 'searchFilterButton']),
+}
+DEFAULT_KEYS = ['videoDetails', 'captionTracks', 'subMenuItems', 'sectionListRenderer', 'searchFilterButton']
+
+# Real pages saved from YouTube, see pages/NOTICE
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pages')
+
+
+# Original implementation, kept verbatim as the baseline
+def legacy_grab_dict_by_key(result_set, target_key):
+    """
+    Ultra-fast search using string operations only, avoiding regex entirely.
+    """
+    import json
+    
+    def find_key_in_dict(data, target_key):
+        """Recursively search for a key in nested dictionaries/lists"""
+        if isinstance(data, dict):
+            if target_key in data:
+                return data
+            for value in data.values():
+                result = find_key_in_dict(value, target_key)
+                if result is not None:
+                    return result
+        elif isinstance(data, list):
+            for item in data:
+                result = find_key_in_dict(item, target_key)
+                if result is not None:
+                    return result
+        return None
+    
+    def find_json_with_key(text, target_key):
+        """Find JSON objects containing the target key using string operations"""
+        search_pattern = f'"{target_key}"'
+        candidates = []
+        
+        # Find all occurrences of the key
+        pos = 0
+        while True:
+            key_pos = text.find(search_pattern, pos)
+            if key_pos == -1:
+                break
+            
+            # Find the start of the JSON object (nearest { before the key)
+            json_start = key_pos
+            brace_count = 0
+            while json_start >= 0:
+                if text[json_start] == '}':
+                    brace_count += 1
+                elif text[json_start] == '{':
+                    if brace_count == 0:
+                        break
+                    brace_count -= 1
+                json_start -= 1
+            
+            if json_start < 0:
+                pos = key_pos + 1
+                continue
+            
+            # Find the end of the JSON object
+            json_end = json_start + 1
+            brace_count = 1
+            in_string = False
+            escape_next = False
+            
+            while json_end < len(text) and brace_count > 0:
+                char = text[json_end]
+                
+                if escape_next:
+                    escape_next = False
+                elif char == '\\':
+                    escape_next = True
+                elif char == '"' and not escape_next:
+                    in_string = not in_string
+                elif not in_string:
+                    if char == '{':
+                        brace_count += 1
+                    elif char == '}':
+                        brace_count -= 1
+                
+                json_end += 1
+            
+            if brace_count == 0:
+                candidate = text[json_start:json_end]
+                candidates.append(candidate)
+            
+            pos = key_pos + 1
+        
+        return candidates
+    
+    target_pattern = f'"{target_key}"'
+    
+    for tag in result_set:
+        try:
+            tag_text = tag.get_text() if hasattr(tag, 'get_text') else str(tag)
+            
+            # Ultra-fast string check
+            if target_pattern not in tag_text or len(tag_text) < 50:
+                continue
+            
+            # Find JSON candidates
+            candidates = find_json_with_key(tag_text, target_key)
+            
+            # Parse candidates
+            for candidate in candidates:
+                try:
+                    data = json.loads(candidate)
+                    result = find_key_in_dict(data, target_key)
+                    if result is not None:
+                        return result
+                except json.JSONDecodeError:
+                    continue
+                    
+        except (AttributeError, TypeError):
+            continue
+    
+    return None
+
+def legacy_parse(html):
+    return BeautifulSoup(html, "html.parser").find_all('script')
+
+
+def bench(label, fn, number):
+    seconds = min(timeit.repeat(fn, number=number, repeat=3)) / number
+    print(f"  {label:<34} {seconds * 1000:9.2f} ms")
+    return seconds
+
+
+def run(name, html, keys, number=5):
+    print(f"{name}: {len(html) / 1e6:.2f} MB, keys {keys}")
+
+    def legacy_page():
+        scripts = legacy_parse(html)
+        return [legacy_grab_dict_by_key(scripts, key) for key in keys]
+
+    def fast_page():
+        scripts = parse_youtube_page_scripts(html)
+        return [grab_dict_by_key(scripts, key) for key in keys]
+
+    texts = SCRIPT_TEXT_PATTERN.findall(html)
+
+    def legacy_locator():
+        return [legacy_grab_dict_by_key(texts, key) for key in keys]
+
+    def fast_locator():
+        return [grab_dict_by_key(texts, key) for key in keys]
+
+    assert [bool(r) for r in legacy_page()] == [bool(r) for r in fast_page()], "Implementations disagree"
+
+    old = bench('BeautifulSoup parse + lookups', legacy_page, number)
+    new = bench('raw_decode extractor + lookups', fast_page, number)
+    print(f"  {'speedup':<34} {old / new:9.1f}x")
+    old = bench('backward brace scan (texts)', legacy_locator, number)
+    new = bench('single-pass locator (texts)', fast_locator, number)
+    print(f"  {'speedup':<34} {old / new:9.1f}x")
+
+
+def read_page(path):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        return f.read()
+
+
+def main(args):
+    if args == ['--live']:
+        for name, (url, keys) in PAGES.items():
+            response = requests.get(url, headers=HEADERS, timeout=30)
+            response.raise_for_status()
+            run(name, response.text, keys)
+        return
+
+    for path in args or sorted(glob.glob(os.path.join(PAGES_DIR, '*.html*'))):
+        name = os.path.basename(path).split('.')[0]
+        keys = PAGES[name][1] if name in PAGES else DEFAULT_KEYS
+        run(os.path.basename(path), read_page(path), keys)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,62 @@
+"""
+Benchmark transcript XML parsing: BeautifulSoup (xml_transcript_to_json_bs4)
+versus the streaming expat parser (xml_transcript_to_json).
+
+Usage:
+    python benchmarks/bench_transcript_parsing.py                   # synthetic hour-long transcripts
+    python benchmarks/bench_transcript_parsing.py transcript.xml ...  # saved caption tracks
+
+The synthetic transcripts have one segment every ~2 seconds, like
+auto-generated captions, with escaped entities in the text.
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from yt_crawler.utils import xml_transcript_to_json_bs4, xml_transcript_to_json
+
+
+def synthetic_transcript(hours: float) -> str:
+    segments = []
+    for i in range(int(hours * 3600 / 2)):
+        segments.append(f'<text start="{i * 2.0:.2f}" dur="2.1">segment {i} it&amp;#39;s &amp;quot;here&amp;quot; &amp;amp; now</text>')
+    return '<?xml version="1.0" encoding="utf-8" ?><transcript>' + ''.join(segments) + '</transcript>'
+
+
+def peak_memory(fn) -> float:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1e6
+
+
+def run(name: str, xml_string: str, number: int = 3) -> None:
+    n_segments = len(xml_transcript_to_json(xml_string)['transcript'])
+    print(f"{name}: {len(xml_string) / 1e6:.2f} MB, {n_segments} segments")
+
+    results = {}
+    for label, fn in [('BeautifulSoup (bs4)', xml_transcript_to_json_bs4), ('expat (streaming)', xml_transcript_to_json)]:
+        seconds = min(timeit.repeat(lambda: fn(xml_string), number=number, repeat=3)) / number
+        results[label] = seconds
+        print(f"  {label:<22} {seconds * 1000:9.2f} ms  peak {peak_memory(lambda: fn(xml_string)):7.1f} MB")
+
+    print(f"  {'speedup':<22} {results['BeautifulSoup (bs4)'] / results['expat (streaming)']:9.1f}x")
+
+
+def main(paths: list[str]) -> None:
+    if paths:
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                run(os.path.basename(path), f.read())
+        return
+
+    for hours in (1, 3):
+        run(f"synthetic {hours}h", synthetic_transcript(hours))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
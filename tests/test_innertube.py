@@ -0,0 +1,84 @@
+import pytest
+import sys
+import os
+import json
+import requests
+from requests.adapters import BaseAdapter
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from yt_crawler.innertube import InnertubeContext
+from yt_crawler.page import YoutubePage
+from yt_crawler.utils import fetch_youtube_continuation_data, build_continuation_payload
+from yt_crawler.config import HEADERS
+
+
+YTCFG = {"INNERTUBE_API_KEY": "KEY123", "INNERTUBE_CLIENT_VERSION": "2.20991231.00.00", "VISITOR_DATA": "VIS",
+         "INNERTUBE_CONTEXT": {"client": {"clientName": "WEB", "clientVersion": "2.20991231.00.00", "hl": "en"}}}
+
+
+class RecordingAdapter(BaseAdapter):
+    """Records requests and answers them with an empty JSON object"""
+
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{}'
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class TestInnertubeContext:
+    """Tests for the innertube client settings read from ytcfg"""
+
+    def test_defaults_before_any_page(self):
+        """Test that the configured client version is used until a page has been read"""
+        innertube = InnertubeContext()
+
+        assert innertube.expired
+        assert innertube.request_context()['client']['clientVersion'] == HEADERS['X-YouTube-Client-Version']
+        assert innertube.api_url("https://www.youtube.com/youtubei/v1/search") == "https://www.youtube.com/youtubei/v1/search"
+        assert build_continuation_payload("token", "ctp")['context'] == {
+            "client": {"clientName": "WEB", "clientVersion": HEADERS['X-YouTube-Client-Version'], "clientScreen": "WATCH"}}
+
+    def test_update_from_page_and_ttl(self):
+        """Test that settings are read from the ytcfg blob and only re-read once expired"""
+        innertube = InnertubeContext(ttl=3600)
+        page = YoutubePage([YTCFG, {"videoDetails": {}}])
+
+        assert innertube.update(page) is True
+        assert innertube.update(page) is False, "Fresh settings should not be read again"
+        assert innertube.api_key == "KEY123" and innertube.visitor_data == "VIS"
+
+        context = innertube.request_context()
+        context['client']['hl'] = 'de'
+        assert innertube.request_context()['client'] == {"clientName": "WEB", "clientVersion": "2.20991231.00.00",
+                                                         "hl": "en", "visitorData": "VIS"}, "Should return copies"
+
+        innertube.clear()
+        assert innertube.expired and innertube.api_key is None
+
+    def test_continuation_request_uses_settings(self):
+        """Test that continuation POSTs carry the context, headers and API key read from the page"""
+        innertube = InnertubeContext()
+        innertube.update([YTCFG])
+        session = requests.Session()
+        adapter = RecordingAdapter()
+        session.mount('https://', adapter)
+
+        fetch_youtube_continuation_data("token", "ctp", '/youtubei/v1/next?prettyPrint=false', session=session, innertube=innertube)
+
+        request = adapter.requests[0]
+        assert request.url == "https://www.youtube.com/youtubei/v1/next?prettyPrint=false&key=KEY123"
+        assert request.headers['X-YouTube-Client-Version'] == "2.20991231.00.00"
+        assert request.headers['X-Goog-Visitor-Id'] == "VIS"
+        assert json.loads(request.body)['context']['client']['clientVersion'] == "2.20991231.00.00"
@@ -0,0 +1,79 @@
+import pytest
+import sys
+import os
+import json
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from yt_crawler import YoutubeAPI
+from yt_crawler import json_backend
+from yt_crawler.json_backend import JsonBackend
+from yt_crawler.utils import parse_youtube_page_scripts
+
+
+PAGE = ('<script>ytcfg.set({"KEY": "é"}); window.ytcfg.obfuscatedData_ = [];'
+        'var setMessage = function(msg) {if (window.yt) {yt.setMsg(msg);}};setMessage({"MSG": 1});</script>'
+        '<script>var ytInitialPlayerResponse = {"videoDetails": {"title": "a }"}};var meta = 1;</script>'
+        '<script>var ytInitialData = {"tabs": []};</script>')
+
+
+class TestJsonBackend:
+    """Tests for the pluggable JSON backend"""
+
+    def test_invalid_backend(self):
+        """Test that unknown backend names are rejected"""
+        with pytest.raises(ValueError):
+            JsonBackend('yaml')
+
+    def test_missing_backend_falls_back(self, monkeypatch):
+        """Test that a backend that is not installed falls back to the stdlib"""
+        monkeypatch.setitem(sys.modules, 'ujson', None)
+
+        with pytest.warns(UserWarning):
+            backend = JsonBackend('ujson')
+
+        assert backend.name == 'json', "Should fall back to the standard library"
+        assert backend.loads(b'{"a": 1}') == {"a": 1}, "Fallback should decode JSON"
+
+    @pytest.mark.parametrize('name', ['json', 'orjson', 'simdjson', 'ujson'])
+    def test_raw_decode_and_page_parsing(self, name):
+        """Test that every backend decodes values followed by trailing script code"""
+        if name != 'json':
+            pytest.importorskip(name)
+        backend = JsonBackend(name)
+        text = '{"a": "é"};var meta = 2;'
+
+        assert backend.raw_decode(text, 0) == ({"a": "é"}, 10), "Should stop at the end of the value"
+        script = '{"js": "f() {};"};var meta = 2;'
+        assert backend.raw_decode(script, 0, len(script)) == ({"js": "f() {};"}, 17), "A statement end inside a string should not cut the value"
+        assert parse_youtube_page_scripts(PAGE, backend) == [
+            {"KEY": "é"}, {"videoDetails": {"title": "a }"}}, {"tabs": []}
+        ], "Page blobs should decode the same with every backend"
+        assert json.loads(backend.dumps({"a": [1]})) == {"a": [1]}, "dumps should return a JSON string"
+
+    @pytest.mark.parametrize('name', ['orjson', 'simdjson', 'ujson'])
+    def test_backend_decodes_values_before_trailing_code(self, name, monkeypatch):
+        """Test that page blobs followed by more script code are decoded by the backend itself"""
+        pytest.importorskip(name)
+        backend = JsonBackend(name)
+
+        class FailingDecoder:
+            def raw_decode(self, text, start):
+                raise AssertionError("Should not fall back to the standard library")
+
+        monkeypatch.setattr(json_backend, '_stdlib_decoder', FailingDecoder())
+
+        assert parse_youtube_page_scripts(PAGE, backend) == [
+            {"KEY": "é"}, {"videoDetails": {"title": "a }"}}, {"tabs": []}
+        ], "Every blob should be decoded by the backend"
+
+        start = PAGE.index('{"videoDetails"')
+        _, end = backend.raw_decode(PAGE, start, PAGE.index('</script>', start))
+        assert end == PAGE.index(';var meta'), "Should return the end of the value"
+
+    def test_api_json_backend(self):
+        """Test that YoutubeAPI exposes the selected backend"""
+        youtube_api = YoutubeAPI(json_backend='json')
+
+        assert youtube_api.json_backend.name == 'json', "Backend should be set on the client"
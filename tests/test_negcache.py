@@ -0,0 +1,94 @@
+import pytest
+import sys
+import os
+import time
+import asyncio
+import threading
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from yt_crawler.negcache import NegativeCache
+from yt_crawler.exceptions import ResourceUnavailableError
+from yt_crawler.page import YoutubePage
+from yt_crawler.utils import unavailable_error
+
+
+class TestNegativeCache:
+    """Tests for remembered unavailable resources"""
+
+    def test_track_remembers_unavailable_resources(self):
+        """Test that an unavailable resource is raised again from the cache without running the block"""
+        cache = NegativeCache(ttl=60)
+
+        with pytest.raises(ResourceUnavailableError):
+            with cache.track('transcript', 'abc'):
+                raise ResourceUnavailableError('transcript', "Could not find caption tracks")
+
+        ran = []
+        with pytest.raises(ResourceUnavailableError) as excinfo:
+            with cache.track('transcript', 'abc'):
+                ran.append(True)
+
+        assert not ran, "The block should not run for a remembered video"
+        assert excinfo.value.cached and excinfo.value.video_id == 'abc'
+        assert str(excinfo.value) == "Could not find caption tracks"
+        assert cache.get('comments', 'abc') is None, "Resources are remembered separately"
+
+    def test_atrack_keeps_sqlite_off_the_event_loop(self, tmp_path):
+        """Test that the async variant remembers outcomes and reads and writes SQLite in worker threads"""
+        cache = NegativeCache(ttl=60, path=str(tmp_path / "unavailable.sqlite"))
+        threads = []
+        for name in ('check', 'put'):
+            method = getattr(cache, name)
+            setattr(cache, name, lambda *args, method=method: threads.append(threading.get_ident()) or method(*args))
+
+        async def run():
+            with pytest.raises(ResourceUnavailableError):
+                async with cache.atrack('comments', 'abc'):
+                    raise ResourceUnavailableError('comments', "Comments are turned off")
+
+            with pytest.raises(ResourceUnavailableError) as excinfo:
+                async with cache.atrack('comments', 'abc'):
+                    pytest.fail("The block should not run for a remembered video")
+            return excinfo.value, threading.get_ident()
+
+        error, loop_thread = asyncio.run(run())
+
+        assert error.cached and error.video_id == 'abc'
+        assert len(threads) == 3, "Should check twice and store once"
+        assert loop_thread not in threads, "SQLite calls should not run on the event loop thread"
+
+    def test_other_errors_are_not_remembered(self):
+        """Test that transient failures do not mark a video as unavailable"""
+        cache = NegativeCache(ttl=60)
+
+        with pytest.raises(ConnectionError):
+            with cache.track('details', 'abc'):
+                raise ConnectionError("reset")
+
+        assert cache.stats() == {'hits': 0, 'stores': 0, 'entries': 0}
+
+    def test_ttl_and_persistence(self, tmp_path):
+        """Test that entries expire and survive restarts when stored on disk"""
+        path = str(tmp_path / "negative.sqlite")
+        NegativeCache(ttl=60, path=path).put('comments', 'abc', "Could not find sub menu items")
+
+        restarted = NegativeCache(ttl=0.01, path=path)
+        assert restarted.get('comments', 'abc') == "Could not find sub menu items", "Should be loaded from disk"
+
+        restarted.put('transcript', 'abc', "Could not find caption tracks")
+        time.sleep(0.02)
+        assert restarted.get('transcript', 'abc') is None, "Expired entries should be ignored"
+
+        restarted.discard('comments', 'abc')
+        assert restarted.get('comments', 'abc') is None
+
+    def test_unavailable_error_needs_conclusive_page(self):
+        """Test that only pages describing the video produce a ResourceUnavailableError"""
+        page = YoutubePage([{"playabilityStatus": {"status": "OK"}, "videoDetails": {}}])
+        bot_check = YoutubePage([{"playabilityStatus": {"status": "LOGIN_REQUIRED"}}])
+
+        assert isinstance(unavailable_error(page, 'transcript', "missing"), ResourceUnavailableError)
+        assert not isinstance(unavailable_error(bot_check, 'transcript', "missing"), ResourceUnavailableError)
+        assert not isinstance(unavailable_error(["<script>"], 'transcript', "missing"), ResourceUnavailableError)
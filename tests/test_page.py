@@ -0,0 +1,51 @@
+import pytest
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from yt_crawler.page import YoutubePage
+from yt_crawler.utils import grab_dict_by_key, parse_youtube_page_scripts
+
+
+PLAYER_RESPONSE = {"captions": {"captionTracks": [{"languageCode": "en"}]}, "videoDetails": {"videoId": "abc"}}
+INITIAL_DATA = {"contents": {"header": {"sortFilterSubMenuRenderer": {"subMenuItems": [{"title": "Top"}]}}}}
+
+
+class TestYoutubePage:
+    """Tests for memoized lookups on a parsed page"""
+
+    def test_find_in_document_order(self):
+        """Test that the first occurrence of a key in the page is returned"""
+        page = YoutubePage([{"a": {"key": 1}, "key": 2}, {"key": 3}])
+
+        assert page.find('key') == {"key": 1}, "Should return the first occurrence in document order"
+        assert page.find('missing') is None, "Should return None when the key is not found"
+
+    def test_find_many(self):
+        """Test that several keys are answered by one lookup"""
+        page = YoutubePage([PLAYER_RESPONSE, INITIAL_DATA])
+
+        result = page.find_many(['videoDetails', 'captionTracks', 'subMenuItems', 'missing'])
+
+        assert result['videoDetails'] is PLAYER_RESPONSE, "videoDetails should come from the player response"
+        assert result['captionTracks'] is PLAYER_RESPONSE['captions'], "captionTracks should be found"
+        assert result['subMenuItems'] is INITIAL_DATA['contents']['header']['sortFilterSubMenuRenderer'], "subMenuItems should be found"
+        assert result['missing'] is None, "Missing keys should map to None"
+
+    def test_lookups_are_memoized(self):
+        """Test that repeated lookups do not traverse the page again"""
+        page = YoutubePage([PLAYER_RESPONSE, INITIAL_DATA])
+        page.find_many(['videoDetails', 'subMenuItems'])
+
+        page._scan = None  # any further traversal would fail
+        assert page.find('videoDetails') is PLAYER_RESPONSE, "Lookup should be served from the memo"
+        assert grab_dict_by_key(page, 'subMenuItems') is not None, "grab_dict_by_key should use the page memo"
+
+    def test_parse_returns_page(self):
+        """Test that parsed pages are YoutubePage objects"""
+        page = parse_youtube_page_scripts('<script>var ytInitialData = {"tabs": []};</script>')
+
+        assert isinstance(page, YoutubePage), "Parsed page should be a YoutubePage"
+        assert page == [{"tabs": []}], "Page should hold the decoded blobs"
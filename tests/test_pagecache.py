@@ -0,0 +1,74 @@
+import pytest
+import sys
+import os
+import time
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from yt_crawler.pagecache import PageCache, video_id_for_url
+from yt_crawler.page import YoutubePage
+
+
+def page(size, partial=False):
+    result = YoutubePage([{"videoDetails": {}}], 'watch')
+    result.size = size
+    result.partial = partial
+    return result
+
+
+class TestPageCache:
+    """Tests for the in-process watch page cache"""
+
+    def test_video_id_for_url(self):
+        """Test that only watch URLs have a video ID"""
+        assert video_id_for_url("https://www.youtube.com/watch?v=abc&t=1") == "abc"
+        assert video_id_for_url("https://www.youtube.com/results?search_query=abc") is None
+
+    def test_hits_misses_and_partial_pages(self):
+        """Test that partial pages only serve callers that accept them"""
+        cache = PageCache(max_bytes=1000, ttl=60)
+        partial = page(100, partial=True)
+
+        assert cache.get("a") is None, "Empty cache should miss"
+        cache.put("a", partial)
+        assert cache.get("a") is partial, "Should serve the cached page"
+        assert cache.get("a", partial_ok=False) is None, "Partial page should not serve full page requests"
+
+        full = page(200)
+        cache.put("a", full)
+        cache.put("a", page(100, partial=True))
+        assert cache.get("a", partial_ok=False) is full, "Full page should not be replaced by a partial one"
+        assert cache.stats() == {'hits': 2, 'misses': 2, 'evictions': 0, 'pages': 1, 'bytes': 200}
+
+    def test_lru_eviction_by_size(self):
+        """Test that least recently used pages are evicted to stay within the byte budget"""
+        cache = PageCache(max_bytes=250, ttl=60)
+        cache.put("a", page(100))
+        cache.put("b", page(100))
+        cache.get("a")
+        cache.put("c", page(100))
+        cache.put("huge", page(1000))
+
+        assert cache.get("b") is None, "Least recently used page should be evicted"
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.get("huge") is None, "Pages over the budget should not be stored"
+        assert cache.stats()['bytes'] == 200 and cache.stats()['evictions'] == 1
+
+    def test_ttl_expiry(self):
+        """Test that expired pages are dropped"""
+        cache = PageCache(max_bytes=1000, ttl=0.01)
+        cache.put("a", page(100))
+        time.sleep(0.02)
+
+        assert cache.get("a") is None, "Expired page should miss"
+        assert len(cache) == 0 and cache.stats()['bytes'] == 0
+
+    def test_disabled_and_invalid(self):
+        """Test that max_bytes=0 stores nothing and negative settings are rejected"""
+        cache = PageCache(max_bytes=0)
+        cache.put("a", page(1))
+        assert cache.get("a") is None
+
+        with pytest.raises(ValueError):
+            PageCache(ttl=-1)
@@ -0,0 +1,93 @@
+import pytest
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from yt_crawler.pathcache import PathCache, PATH_CACHE, follow_path
+from yt_crawler.page import YoutubePage
+from yt_crawler.utils import find_nested_key, find_nested_key_path, iter_nested_key_paths
+
+
+def continuation(mutations, wrapper='entityBatchUpdate'):
+    return {"responseContext": {}, "frameworkUpdates": {wrapper: {"mutations": mutations}}}
+
+
+class TestPathCache:
+    """Tests for learned lookup paths"""
+
+    def test_follow_path(self):
+        """Test following keys and indices, and missing paths"""
+        data = {"a": [{"b": 1}]}
+
+        assert follow_path(data, ('a', 0, 'b')) == 1, "Should follow keys and indices"
+        assert follow_path(data, ('a', 3)) is None, "Missing index should return None"
+        assert follow_path(data, ('a', 0, 'b', 'c')) is None, "Indexing a scalar should return None"
+
+    def test_find_nested_key_path(self):
+        """Test that the path leads to the same dict find_nested_key returns"""
+        data = continuation([1, 2])
+
+        result, path = find_nested_key_path(data, 'mutations')
+
+        assert result is find_nested_key(data, 'mutations'), "Should match find_nested_key"
+        assert path == ('frameworkUpdates', 'entityBatchUpdate'), "Should return the path to the dict"
+
+    def test_hits_misses_and_relearning(self):
+        """Test that the learned path is used and re-learned after a layout change"""
+        cache = PathCache()
+
+        cache.find(continuation([1]), 'mutations', 'next', iter_nested_key_paths)
+        result = cache.find(continuation([2]), 'mutations', 'next', iter_nested_key_paths)
+        assert result == {"mutations": [2]}, "Second lookup should follow the learned path"
+        assert cache.stats() == {'hits': 1, 'misses': 1, 'paths': 1}, "Should count one miss then one hit"
+
+        result = cache.find(continuation([3], wrapper='newWrapper'), 'mutations', 'next', iter_nested_key_paths)
+        assert result == {"mutations": [3]}, "Layout changes should fall back to the full search"
+        cache.find(continuation([4], wrapper='newWrapper'), 'mutations', 'next', iter_nested_key_paths)
+        assert cache.stats() == {'hits': 2, 'misses': 2, 'paths': 1}, "New path should be re-learned"
+
+    def test_repeated_keys_are_not_learned(self):
+        """Test that keys found more than once are always searched, so the first match is returned"""
+        cache = PathCache()
+        first = {"contents": [{"contents": [1]}, {"contents": [2]}]}
+        second = {"header": {"contents": []}, "body": first}
+
+        assert cache.find(first, 'contents', 'news', iter_nested_key_paths) is first
+        assert cache.find(second, 'contents', 'news', iter_nested_key_paths) is second['header'], \
+            "Should return the first match, not the one at the path of the earlier document"
+        assert cache.stats()['paths'] == 0, "Repeated keys should not be learned"
+        assert not cache.learnable('contents', 'news')
+
+    def test_page_types_are_separate(self):
+        """Test that paths learned for one page type are not used for another"""
+        cache = PathCache()
+        cache.find({"a": {"key": 1}}, 'key', 'news', iter_nested_key_paths)
+
+        assert cache.find({"b": {"key": 2}}, 'key', 'trending', iter_nested_key_paths) == {"key": 2}
+        assert cache.stats() == {'hits': 0, 'misses': 2, 'paths': 2}
+
+    def test_page_lookups_use_shared_cache(self):
+        """Test that YoutubePage lookups learn and reuse paths per page type"""
+        PATH_CACHE.clear()
+        blobs = [{"ytcfg": {}}, {"contents": {"videoDetails": {"videoId": "a"}}}]
+
+        YoutubePage(blobs, 'watch').find('videoDetails')
+        result = YoutubePage(blobs, 'watch').find('videoDetails')
+
+        assert result == {"videoDetails": {"videoId": "a"}}, "Should find the key through the learned path"
+        assert PATH_CACHE.stats()['hits'] == 1, "Second page should hit the cache"
+        PATH_CACHE.clear()
+
+    def test_page_lookups_skip_repeated_keys(self):
+        """Test that YoutubePage lookups only learn keys found once in the page"""
+        PATH_CACHE.clear()
+        blobs = [{"a": {"title": 1}}, {"b": {"title": 2}, "c": {"videoDetails": {}}}]
+
+        YoutubePage(blobs, 'watch').find_many(['title', 'videoDetails'])
+        result = YoutubePage([{"x": {"title": 3}}, {"b": {"title": 2}, "c": {"videoDetails": {}}}], 'watch').find('title')
+
+        assert result == {"title": 3}, "Repeated keys should be searched again"
+        assert PATH_CACHE.stats()['paths'] == 1, "Only videoDetails should be learned"
+        PATH_CACHE.clear()
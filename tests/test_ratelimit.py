@@ -0,0 +1,80 @@
+import pytest
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from yt_crawler.ratelimit import RateLimiter, parse_retry_after
+from yt_crawler.transport import endpoint_for_url
+
+
+class TestEndpointForUrl:
+    """Test suite for endpoint_for_url function"""
+
+    @pytest.mark.parametrize("url, endpoint", [
+        ("https://www.youtube.com/watch?v=nUgGY18iTJw", 'watch'),
+        ("https://www.youtube.com/results?search_query=python", 'results'),
+        ("https://www.youtube.com/playlist?list=PLZXffy-ZvjZlYVoiACyccatARtwXOyt48", 'playlist'),
+        ("https://www.youtube.com/feed/news_destination/sports", 'feed'),
+        ("https://www.youtube.com/youtubei/v1/search", 'search'),
+        ("https://www.youtube.com/youtubei/v1/next?prettyPrint=false", 'next'),
+        ("https://www.youtube.com/api/timedtext?v=nUgGY18iTJw&lang=en", 'captions'),
+        ("https://www.youtube.com/", 'default'),
+    ])
+    def test_endpoint_classification(self, url: str, endpoint: str):
+        """Test that URLs map to their rate limit endpoint"""
+        assert endpoint_for_url(url) == endpoint
+
+
+class TestRateLimiter:
+    """Test suite for the shared token-bucket rate limiter"""
+
+    def test_burst_then_wait(self):
+        """Test that requests within the burst are free and later ones must wait"""
+        limiter = RateLimiter({'watch': (2.0, 3)})
+
+        waits = [limiter.reserve('watch') for _ in range(4)]
+
+        assert waits[:3] == [0.0, 0.0, 0.0], "Burst requests should not wait"
+        assert waits[3] == pytest.approx(0.5, abs=0.05), "Next request should wait one refill interval"
+
+    def test_endpoints_have_separate_budgets(self):
+        """Test that exhausting one endpoint does not throttle another"""
+        limiter = RateLimiter({'watch': (1.0, 1), 'next': (1.0, 1)})
+
+        limiter.reserve('watch')
+
+        assert limiter.reserve('next') == 0.0, "Other endpoints should keep their own budget"
+
+    def test_throttling_halves_rate_and_recovers(self):
+        """Test multiplicative decrease on 429/503 and additive increase on success"""
+        limiter = RateLimiter({'next': (10.0, 20)})
+
+        limiter.record('next', 429)
+        assert limiter.current_rate('next') == pytest.approx(5.0), "429 should halve the rate"
+
+        limiter.record('next', 503)
+        assert limiter.current_rate('next') == pytest.approx(2.5), "503 should halve the rate"
+
+        limiter.record('next', 200)
+        assert limiter.current_rate('next') == pytest.approx(2.6), "Success should add rate back"
+
+        for _ in range(200):
+            limiter.record('next', 200)
+        assert limiter.current_rate('next') == pytest.approx(10.0), "Rate should not exceed the budget"
+
+    def test_retry_after_blocks_endpoint(self):
+        """Test that Retry-After delays the next request to the endpoint"""
+        limiter = RateLimiter({'watch': (100.0, 100)})
+
+        limiter.record('watch', 429, retry_after='2')
+
+        assert limiter.reserve('watch') == pytest.approx(2.0, abs=0.05), "Should wait for Retry-After"
+
+    def test_parse_retry_after(self):
+        """Test parsing of Retry-After header values"""
+        assert parse_retry_after('3') == 3.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after('not a date') is None
+        assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
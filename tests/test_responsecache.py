@@ -0,0 +1,150 @@
+import pytest
+import sys
+import os
+import time
+import asyncio
+import requests
+from requests.adapters import BaseAdapter
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from yt_crawler.responsecache import ResponseCache
+from yt_crawler.transport import YoutubeSession, AsyncYoutubeSession
+
+
+class CountingAdapter(BaseAdapter):
+    """Answers every request with a fixed body, honouring If-None-Match"""
+
+    def __init__(self, etag=None):
+        super().__init__()
+        self.requests = []
+        self.etag = etag
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.headers['Content-Type'] = 'text/html; charset=utf-8'
+        if self.etag:
+            response.headers['ETag'] = self.etag
+        if self.etag and request.headers.get('If-None-Match') == self.etag:
+            response.status_code = 304
+            response._content = b''
+        else:
+            response.status_code = 200
+            response._content = f'body {len(self.requests)}'.encode()
+        return response
+
+    def close(self):
+        pass
+
+
+def session(cache, adapter):
+    result = YoutubeSession(response_cache=cache, retry_policy=None)
+    result.mount('https://', adapter)
+    return result
+
+
+class TestResponseCache:
+    """Tests for the disk response cache"""
+
+    def test_key(self):
+        """Test that POST bodies are part of the key"""
+        url = "https://www.youtube.com/youtubei/v1/next"
+
+        assert ResponseCache.key('get', url) == f"GET {url}"
+        assert ResponseCache.key('POST', url, b'{"a": 1}') != ResponseCache.key('POST', url, '{"a": 2}')
+
+    def test_request_key(self):
+        """Test that request keys do not depend on how the arguments are encoded"""
+        url = "https://www.youtube.com/youtubei/v1/next?prettyPrint=false"
+
+        assert ResponseCache.request_key('GET', 'https://www.youtube.com/watch', {'params': {'v': 'abc'}}) == \
+            ResponseCache.request_key('GET', 'https://www.youtube.com/watch?v=abc', {})
+        assert ResponseCache.request_key('POST', url, {'json': {'a': 1, 'b': [2]}}) == \
+            ResponseCache.request_key('POST', url, {'json': {'b': [2], 'a': 1}})
+
+    def test_shared_by_sync_and_async_sessions(self, tmp_path):
+        """Test that an async session serves an innertube response stored by a sync session"""
+        httpx = pytest.importorskip('httpx')
+        cache = ResponseCache(str(tmp_path / "responses.sqlite"), ttls={'next': 60})
+        url = "https://www.youtube.com/youtubei/v1/next?prettyPrint=false"
+        payload = {"context": {"client": {"clientName": "WEB"}}, "continuation": "token é"}
+
+        assert session(cache, CountingAdapter()).post(url, json=payload).text == "body 1"
+
+        requests_sent = []
+
+        def handler(request):
+            requests_sent.append(request)
+            return httpx.Response(200, text="async body")
+
+        async def run():
+            async_session = AsyncYoutubeSession(response_cache=cache, retry_policy=None)
+            async_session.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                return (await async_session.post(url, json=payload)).text
+            finally:
+                await async_session.aclose()
+
+        assert asyncio.run(run()) == "body 1", "Should serve the response stored by the sync session"
+        assert not requests_sent, "Should not download again"
+
+    def test_served_across_sessions(self, tmp_path):
+        """Test that a restarted session reads stored responses instead of downloading them"""
+        path = str(tmp_path / "responses.sqlite")
+        url = "https://www.youtube.com/watch?v=abc"
+
+        first = CountingAdapter()
+        assert session(ResponseCache(path), first).get(url).text == "body 1"
+
+        second = CountingAdapter()
+        cache = ResponseCache(path)
+        response = session(cache, second).get(url, stream=True)
+
+        assert response.text == "body 1", "Should serve the stored body"
+        assert "".join(response.iter_content(4, decode_unicode=True)) == "body 1", "Stored body should be iterable"
+        assert not second.requests, "Should not download again"
+        assert cache.stats()['hits'] == 1
+
+    def test_uncached_endpoints_and_errors(self, tmp_path):
+        """Test that endpoints without a TTL and error responses are not stored"""
+        cache = ResponseCache(str(tmp_path / "responses.sqlite"), ttls={'watch': 0})
+        adapter = CountingAdapter()
+        http = session(cache, adapter)
+
+        http.get("https://www.youtube.com/watch?v=abc")
+        http.get("https://www.youtube.com/watch?v=abc")
+        http.get("https://example.com/other")
+
+        assert len(adapter.requests) == 3, "Endpoints with a TTL of 0 should always be downloaded"
+        assert cache.stats()['responses'] == 0
+
+    def test_revalidation(self, tmp_path):
+        """Test that expired responses with an ETag are revalidated with If-None-Match"""
+        cache = ResponseCache(str(tmp_path / "responses.sqlite"), ttls={'captions': 0.01})
+        adapter = CountingAdapter(etag='"v1"')
+        http = session(cache, adapter)
+        url = "https://www.youtube.com/api/timedtext?v=abc"
+
+        assert http.get(url).text == "body 1"
+        time.sleep(0.02)
+        response = http.get(url)
+
+        assert adapter.requests[-1].headers['If-None-Match'] == '"v1"', "Should send the stored ETag"
+        assert response.status_code == 200 and response.text == "body 1", "304 should be answered from the cache"
+        assert cache.stats()['revalidated'] == 1
+
+    def test_purge_and_clear(self, tmp_path):
+        """Test that purge drops expired responses without validators"""
+        cache = ResponseCache(str(tmp_path / "responses.sqlite"), ttls={'watch': 0.01})
+        cache.put(cache.key('GET', 'u1'), 'u1', 'watch', 200, {}, b'a')
+        cache.put(cache.key('GET', 'u2'), 'u2', 'watch', 200, {'ETag': '"x"'}, b'b')
+        time.sleep(0.02)
+
+        assert cache.purge() == 1, "Only the response without validators should be purged"
+        cache.clear()
+        assert cache.stats()['responses'] == 0
+        cache.close()
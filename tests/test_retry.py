@@ -0,0 +1,118 @@
+import pytest
+import sys
+import os
+import requests
+from requests.adapters import BaseAdapter
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from yt_crawler.retry import RetryPolicy, CircuitBreaker
+from yt_crawler.exceptions import CircuitOpenError
+from yt_crawler.transport import YoutubeSession
+
+
+class TestRetryPolicy:
+    """Test suite for RetryPolicy"""
+
+    def test_page_get_retried_on_server_errors(self):
+        """Test that idempotent page GETs are retried on 5xx and connection errors"""
+        policy = RetryPolicy(max_attempts=3)
+
+        assert policy.should_retry('GET', 'watch', 0, status_code=502)
+        assert policy.should_retry('GET', 'watch', 0, status_code=None)
+        assert not policy.should_retry('GET', 'watch', 0, status_code=404), "Client errors should not be retried"
+        assert not policy.should_retry('GET', 'watch', 2, status_code=502), "Attempts should be capped"
+
+    def test_continuation_post_retried(self):
+        """Test that innertube continuation POSTs are treated as idempotent"""
+        policy = RetryPolicy()
+
+        assert policy.should_retry('POST', 'next', 0, status_code=500)
+        assert policy.should_retry('POST', 'search', 0, status_code=None)
+
+    def test_other_post_only_retried_when_not_processed(self):
+        """Test that non-idempotent POSTs are only retried when the server did not process them"""
+        policy = RetryPolicy()
+
+        assert not policy.should_retry('POST', 'default', 0, status_code=500)
+        assert not policy.should_retry('POST', 'default', 0, status_code=None, request_sent=True)
+        assert policy.should_retry('POST', 'default', 0, status_code=None, request_sent=False)
+        assert policy.should_retry('POST', 'default', 0, status_code=503)
+
+    def test_backoff_bounds(self):
+        """Test that jittered backoff stays within its exponential ceiling and honours Retry-After"""
+        policy = RetryPolicy(backoff_base=1.0, backoff_max=5.0)
+
+        for attempt in range(6):
+            assert 0 <= policy.backoff(attempt) <= min(5.0, 2 ** attempt)
+        assert policy.backoff(0, retry_after=7.0) == 7.0
+
+
+class TestCircuitBreaker:
+    """Test suite for CircuitBreaker"""
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that the circuit opens after the failure threshold and fails fast"""
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+
+        for _ in range(3):
+            breaker.before_request('www.youtube.com')
+            breaker.record_failure('www.youtube.com')
+
+        assert breaker.state('www.youtube.com') == 'open'
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request('www.youtube.com')
+        breaker.before_request('i.ytimg.com')  # other hosts are unaffected
+
+    def test_success_resets_failures(self):
+        """Test that a success resets the consecutive failure count"""
+        breaker = CircuitBreaker(failure_threshold=2)
+
+        breaker.record_failure('www.youtube.com')
+        breaker.record_success('www.youtube.com')
+        breaker.record_failure('www.youtube.com')
+
+        assert breaker.state('www.youtube.com') == 'closed'
+
+    def test_half_open_allows_single_trial(self):
+        """Test that after the recovery timeout exactly one trial request is let through"""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure('www.youtube.com')
+
+        breaker.before_request('www.youtube.com')
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request('www.youtube.com')
+
+        breaker.record_success('www.youtube.com')
+        assert breaker.state('www.youtube.com') == 'closed'
+
+    def test_interrupted_trial_is_released(self):
+        """Test that a trial request raising an unexpected exception opens the circuit again"""
+        class FailingAdapter(BaseAdapter):
+            def send(self, request, **kwargs):
+                raise requests.exceptions.InvalidURL("unexpected")
+
+            def close(self):
+                pass
+
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure('www.youtube.com')
+        session = YoutubeSession(circuit_breaker=breaker, retry_policy=None)
+        session.mount('https://', FailingAdapter())
+
+        with pytest.raises(requests.exceptions.InvalidURL):
+            session.get('https://www.youtube.com/watch?v=abc')
+
+        assert breaker.before_request('www.youtube.com'), "A new trial should be let through"
+        breaker.record_success('www.youtube.com')
+        assert breaker.state('www.youtube.com') == 'closed'
+
+    def test_release_trial_only_affects_trials(self):
+        """Test that release_trial does nothing once the trial's outcome was recorded"""
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=0)
+
+        assert not breaker.before_request('www.youtube.com'), "Closed circuits run no trial"
+        breaker.release_trial('www.youtube.com')
+
+        assert breaker.state('www.youtube.com') == 'closed'
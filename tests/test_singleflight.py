@@ -0,0 +1,172 @@
+import pytest
+import sys
+import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from yt_crawler.singleflight import SingleFlight, AsyncSingleFlight
+
+
+class TestSingleFlight:
+    """Test suite for request coalescing"""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test that concurrent calls with the same key run the function once"""
+        flight = SingleFlight()
+        calls = []
+        lock = threading.Lock()
+        entered = threading.Condition()
+        callers = 0
+
+        class CountingLock:
+            """Counts the callers that have checked for a running call"""
+            def __enter__(self):
+                nonlocal callers
+                lock.acquire()
+                with entered:
+                    callers += 1
+                    entered.notify_all()
+
+            def __exit__(self, *exc_info):
+                lock.release()
+
+        flight._lock = CountingLock()
+
+        def fetch():
+            calls.append(threading.get_ident())
+            # Finish only once every other caller has joined the running call
+            with entered:
+                assert entered.wait_for(lambda: callers >= 5, timeout=5)
+            return {'page': 'watch'}
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(executor.map(lambda _: flight.do('watch?v=nUgGY18iTJw', fetch), range(5)))
+
+        assert len(calls) == 1, "Function should run once for concurrent callers"
+        assert all(result is results[0] for result in results), "Every caller should get the same result"
+
+    def test_errors_are_shared_and_not_cached(self):
+        """Test that an error reaches waiting callers and the next call runs again"""
+        flight = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            flight.do('key', fail)
+        assert flight.do('key', lambda: 42) == 42, "Finished calls should not be cached"
+
+    def test_async_concurrent_calls_share_one_execution(self):
+        """Test that concurrent coroutines with the same key await one execution"""
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def run():
+            release = asyncio.Event()
+
+            async def fetch():
+                calls.append(1)
+                await release.wait()
+                return 'page'
+
+            async def finish():
+                release.set()
+
+            # gather starts the callers in order, so finish runs after all of them joined
+            return await asyncio.gather(*(flight.do('playlist?list=x', fetch) for _ in range(5)), finish())
+
+        assert asyncio.run(run()) == ['page'] * 5 + [None]
+        assert len(calls) == 1, "Coroutine should run once for concurrent callers"
+
+    def test_async_cancelled_caller_does_not_cancel_others(self):
+        """Test that cancelling the first caller leaves the shared call running for the others"""
+        flight = AsyncSingleFlight()
+
+        async def run():
+            release = asyncio.Event()
+
+            async def fetch():
+                await release.wait()
+                return 'page'
+
+            first = asyncio.ensure_future(flight.do('watch?v=x', fetch))
+            second = asyncio.ensure_future(flight.do('watch?v=x', fetch))
+            await asyncio.sleep(0)
+            first.cancel()
+            release.set()
+
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            return await second
+
+        assert asyncio.run(run()) == 'page', "Other callers should still get the result"
+
+    def test_covered_call_joins_running_call(self):
+        """Test that a call covered by a running call waits for its result instead of running"""
+        flight = SingleFlight()
+        started = threading.Event()
+        lock = threading.Lock()
+        entered = threading.Condition()
+        callers = 0
+
+        class CountingLock:
+            """Counts the callers that have checked for a running call"""
+            def __enter__(self):
+                nonlocal callers
+                lock.acquire()
+                with entered:
+                    callers += 1
+                    entered.notify_all()
+
+            def __exit__(self, *exc_info):
+                lock.release()
+
+        flight._lock = CountingLock()
+
+        def full():
+            started.set()
+            # Finish only once the partial caller has looked for a running call
+            with entered:
+                assert entered.wait_for(lambda: callers >= 2, timeout=5)
+            return 'full page'
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            full_result = executor.submit(flight.do, 'watch?v=x', full)
+            assert started.wait(5)
+            partial_result = executor.submit(flight.do, ('player', 'watch?v=x'), lambda: 'partial page', ('watch?v=x',))
+
+            assert partial_result.result() == 'full page', "The partial call should join the full one"
+            assert full_result.result() == 'full page'
+        assert flight.do(('player', 'watch?v=x'), lambda: 'partial page', ('watch?v=x',)) == 'partial page', \
+            "Without a running full call the partial call should run"
+
+    def test_async_covered_call_joins_running_call(self):
+        """Test that a covered coroutine awaits the running call it is covered by"""
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def run():
+            release = asyncio.Event()
+
+            async def full():
+                calls.append('full')
+                await release.wait()
+                return 'full page'
+
+            async def partial():
+                calls.append('partial')
+                return 'partial page'
+
+            async def finish():
+                release.set()
+
+            return await asyncio.gather(flight.do('watch?v=x', full),
+                                        flight.do(('player', 'watch?v=x'), partial, covered_by=('watch?v=x',)),
+                                        finish())
+
+        assert asyncio.run(run()) == ['full page', 'full page', None]
+        assert calls == ['full'], "Only the full call should run"
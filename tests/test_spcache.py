@@ -0,0 +1,45 @@
+import pytest
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from yt_crawler import YoutubeAPI
+from yt_crawler.spcache import SearchParamCache, search_filters_key
+
+
+class TestSearchParamCache:
+    """Tests for the remembered sp values of filter combinations"""
+
+    def test_key_ignores_filter_order(self):
+        """Test that the same combination always has the same key"""
+        assert search_filters_key({'sort_by': 'view_count', 'duration': 'over_20_minutes'}) == \
+            search_filters_key({'duration': 'over_20_minutes', 'sort_by': 'view_count'})
+
+    def test_survives_restart_and_invalidation(self, tmp_path):
+        """Test that values are saved to disk and dropped by invalidate"""
+        path = str(tmp_path / "sp.json")
+        filters = {'upload_date': 'today'}
+
+        cache = SearchParamCache(path)
+        assert cache.get(filters) is None
+        cache.put(filters, 'EgIIAg==')
+
+        restarted = SearchParamCache(path)
+        assert restarted.get(filters) == 'EgIIAg==', "Value should be loaded from disk"
+        assert restarted.invalidate(filters) is True
+        assert restarted.invalidate(filters) is False, "Nothing left to invalidate"
+        assert SearchParamCache(path).get(filters) is None, "Invalidation should be saved"
+
+    def test_crawl_mode_uses_remembered_value(self):
+        """Test that a remembered combination builds the URL without loading results pages"""
+        cache = SearchParamCache()
+        cache.put({'upload_date': 'today', 'sort_by': 'view_count'}, 'CAMSAggC')
+        youtube_api = YoutubeAPI(search_param_cache=cache)
+        youtube_api._fetch_page_scripts = None  # any request would fail
+
+        url = youtube_api._get_search_url("python tutorial", upload_date="today", sort_by="view_count", filter_mode='crawl')
+
+        assert url == "https://www.youtube.com/results?search_query=python+tutorial&sp=CAMSAggC"
+        assert cache.stats() == {'hits': 1, 'misses': 0, 'params': 1}
@@ -0,0 +1,98 @@
+import pytest
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from yt_crawler import YoutubeAPI
+from yt_crawler.transport import YoutubeSession, Http2Adapter
+
+
+class TestYoutubeSession:
+    """Tests for the pooled HTTP session shared by the mixins"""
+
+    def test_pool_configuration(self):
+        """Test that pool settings are applied to the mounted adapter"""
+        session = YoutubeSession(pool_connections=4, pool_maxsize=32, pool_block=True)
+        adapter = session.get_adapter('https://www.youtube.com/watch?v=nUgGY18iTJw')
+
+        assert adapter._pool_connections == 4, "pool_connections should be passed to the adapter"
+        assert adapter._pool_maxsize == 32, "pool_maxsize should be passed to the adapter"
+        assert adapter._pool_block is True, "pool_block should be passed to the adapter"
+
+    def test_keep_alive_disabled(self):
+        """Test that disabling keep-alive asks the server to close connections"""
+        session = YoutubeSession(keep_alive=False)
+
+        assert session.headers.get('Connection') == 'close', "Connection header should be 'close'"
+
+    def test_http2_adapter(self):
+        """Test that http2=True routes HTTPS requests through the HTTP/2 adapter"""
+        httpx = pytest.importorskip('httpx')
+        session = YoutubeSession(http2=True)
+        # Keep CA bundle variables from the environment from selecting another client
+        session.trust_env = False
+        adapter = session.get_adapter('https://www.youtube.com/watch?v=nUgGY18iTJw')
+        assert isinstance(adapter, Http2Adapter), "HTTPS should be mounted on the HTTP/2 adapter"
+
+        def handler(request):
+            return httpx.Response(200, headers={'Content-Type': 'text/html; charset=utf-8'}, text='<html>ok</html>')
+
+        adapter.client = httpx.Client(transport=httpx.MockTransport(handler))
+        response = session.get('https://www.youtube.com/watch?v=nUgGY18iTJw')
+
+        assert response.status_code == 200, "Status code should come from the HTTP/2 response"
+        assert response.text == '<html>ok</html>', "Body should be readable through requests"
+
+    def test_http2_adapter_tls_and_proxy_settings(self):
+        """Test that verify, cert and proxies reach the httpx client sending the request"""
+        httpx = pytest.importorskip('httpx')
+        session = YoutubeSession(http2=True)
+        adapter = session.get_adapter('https://www.youtube.com/watch?v=nUgGY18iTJw')
+        mock_client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, text='ok')))
+        settings = []
+
+        def client_for(verify, cert, proxy):
+            settings.append((verify, cert, proxy))
+            return mock_client
+
+        adapter._client_for = client_for
+        session.get('https://www.youtube.com/watch?v=nUgGY18iTJw', verify=False,
+                    proxies={'https': 'http://proxy.local:3128'})
+
+        assert settings == [(False, None, 'http://proxy.local:3128')], "Request settings should select the client"
+
+    def test_http2_adapter_clients_per_setting(self):
+        """Test that non-default settings get their own, reused httpx client"""
+        pytest.importorskip('httpx')
+        adapter = Http2Adapter()
+
+        assert adapter._client_for(True, None, None) is adapter.client, "Defaults should use the main client"
+        client = adapter._client_for(False, None, 'http://proxy.local:3128')
+        assert client is not adapter.client, "Other settings should use another client"
+        assert adapter._client_for(False, None, 'http://proxy.local:3128') is client, "Clients should be reused"
+        adapter.close()
+
+
+class TestYoutubeAPISession:
+    """Tests for session ownership on YoutubeAPI"""
+
+    def test_api_owns_pooled_session(self):
+        """Test that YoutubeAPI builds a single pooled session by default"""
+        youtube_api = YoutubeAPI(pool_maxsize=20)
+
+        assert isinstance(youtube_api.session, YoutubeSession), "Session should be a YoutubeSession"
+        assert youtube_api.session.pool_maxsize == 20, "Pool size should be forwarded to the session"
+
+    def test_api_accepts_custom_session(self):
+        """Test that a caller-provided session is used as-is"""
+        session = YoutubeSession()
+        with YoutubeAPI(session=session) as youtube_api:
+            assert youtube_api.session is session, "Provided session should be reused"
+
+    def test_default_timeout(self):
+        """Test that every request gets connect and read timeouts"""
+        youtube_api = YoutubeAPI(timeout=(2.0, 10.0))
+
+        assert youtube_api.session.timeout == (2.0, 10.0), "Timeout should be forwarded to the session"
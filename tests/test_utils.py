@@ -8,8 +8,9 @@ from typing import Any
 # Add the parent directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from yt_crawler.utils import xml_transcript_to_json_bs4, extract_youtube_page_scripts, grab_dict_by_key
+from yt_crawler.utils import xml_transcript_to_json_bs4, xml_transcript_to_json, json3_transcript_to_json, srv3_transcript_to_json, extract_youtube_page_scripts, parse_youtube_page_scripts, grab_dict_by_key, iter_json_objects, extract_json_from_scripts, find_nested_key, extract_youtube_player_response, get_deadline, request_timeout, fetch_youtube_continuation_data
 from yt_crawler.config import HEADERS
+from yt_crawler.page import KeyIndex, YoutubePage
 
 
 class TestExtractYoutubePageScripts:
@@ -29,11 +30,9 @@ class TestExtractYoutubePageScripts:
         # Verify the list is not empty
         assert len(result) > 0, "Result should not be empty"
         
-        # Verify all elements are BeautifulSoup script tags
-        from bs4 import BeautifulSoup
+        # Verify all elements are decoded JSON objects
         for script in result:
-            assert hasattr(script, 'name'), "Each element should be a BeautifulSoup tag"
-            assert script.name == 'script', "Each element should be a script tag"
+            assert isinstance(script, dict), "Each element should be a decoded JSON object"
     
     def test_extract_youtube_page_scripts_without_headers(self):
         """Test extracting YouTube page scripts without headers"""
@@ -49,11 +48,148 @@ class TestExtractYoutubePageScripts:
         # Verify the list is not empty
         assert len(result) > 0, "Result should not be empty"
         
-        # Verify all elements are BeautifulSoup script tags
-        from bs4 import BeautifulSoup
+        # Verify all elements are decoded JSON objects
         for script in result:
-            assert hasattr(script, 'name'), "Each element should be a BeautifulSoup tag"
-            assert script.name == 'script', "Each element should be a script tag"
+            assert isinstance(script, dict), "Each element should be a decoded JSON object"
+
+
+class TestParseYoutubePageScripts:
+    """Test suite for parse_youtube_page_scripts function"""
+    
+    def test_parse_youtube_page_scripts_assignments(self):
+        """Test decoding the embedded JSON assignments in document order"""
+        html = (
+            '<script>ytcfg.set({"INNERTUBE_API_KEY": "key"}); ytcfg.set("X", 1);</script>'
+            '<script>var ytInitialPlayerResponse = {"videoDetails": {"title": "a } b"}};var meta = 1;</script>'
+            '<script>window["ytInitialData"] = {"contents": {"subMenuItems": []}};</script>'
+        )
+        
+        result = parse_youtube_page_scripts(html)
+        
+        assert result == [
+            {"INNERTUBE_API_KEY": "key"},
+            {"videoDetails": {"title": "a } b"}},
+            {"contents": {"subMenuItems": []}},
+        ], "Should decode ytcfg, ytInitialPlayerResponse and ytInitialData in order"
+        assert grab_dict_by_key(result, 'subMenuItems') == {"subMenuItems": []}, "Should find keys in decoded blobs"
+    
+    def test_parse_youtube_page_scripts_fallback(self):
+        """Test falling back to script texts when the page has no embedded data"""
+        html = '<html><script src="a.js"></script><script>var x = {"key": 1};</script></html>'
+        
+        result = parse_youtube_page_scripts(html)
+        
+        assert result == ['', 'var x = {"key": 1};'], "Should return the raw script texts"
+
+
+class TestExtractYoutubePlayerResponse:
+    """Test suite for extract_youtube_player_response function"""
+    
+    def test_stops_after_player_response(self):
+        """Test that the download stops once the player response has been received"""
+        import io
+        
+        html = ('<script>ytcfg.set({"KEY": 1});</script>'
+                '<script>var ytInitialPlayerResponse = {"videoDetails": {"videoId": "a"}};var meta = 1;</script>'
+                + 'x' * 1_000_000 +
+                '<script>var ytInitialData = {"contents": {}};</script>').encode('utf-8')
+        
+        class Body(io.BytesIO):
+            def close(self):
+                self.bytes_read = self.tell()
+                super().close()
+        
+        body = Body(html)
+        
+        class Session:
+            def get(self, url, **kwargs):
+                assert kwargs.get('stream') is True, "Page should be streamed"
+                response = requests.Response()
+                response.status_code = 200
+                response.encoding = 'utf-8'
+                response.raw = body
+                return response
+        
+        page = extract_youtube_player_response("https://www.youtube.com/watch?v=a", session=Session())
+        
+        assert grab_dict_by_key(page, 'videoDetails') == {"videoDetails": {"videoId": "a"}}, "Should decode the player response"
+        assert page.partial is True, "Page should be flagged as partial"
+        assert body.bytes_read < len(html) // 2, "The rest of the page should not be downloaded"
+
+
+class TestRequestTimeout:
+    """Test suite for request_timeout function"""
+    
+    def test_capped_by_remaining_budget(self):
+        """Test that request timeouts never exceed the time left before the deadline"""
+        connect_timeout, read_timeout = request_timeout((5.0, 30.0), get_deadline(2.0))
+        
+        assert request_timeout((5.0, 30.0), None) == (5.0, 30.0), "Calls without a budget keep the full timeout"
+        assert connect_timeout <= 2.0 and read_timeout <= 2.0, "Timeouts should be capped by the budget"
+        assert request_timeout((5.0, 30.0), get_deadline(-1.0)) == (0.1, 0.1), "A spent budget should leave a minimal timeout"
+    
+    def test_continuation_request_timeout(self):
+        """Test that a capped timeout is sent with the continuation request"""
+        sent = {}
+        
+        class Session:
+            def post(self, url, **kwargs):
+                sent.update(kwargs)
+                response = requests.Response()
+                response.status_code = 200
+                response._content = b'{}'
+                return response
+        
+        fetch_youtube_continuation_data('token', 'tracking', '/youtubei/v1/next', session=Session(), timeout=(1.0, 1.5))
+        
+        assert sent['timeout'] == (1.0, 1.5), "The request should use the given timeout"
+
+
+class TestIterJsonObjects:
+    """Test suite for iter_json_objects function"""
+    
+    def test_iter_json_objects_skips_code_and_strings(self):
+        """Test that braces in code and inside strings do not confuse the locator"""
+        text = 'function f() { if (x) { y = {"key": "}{"}; } } var b = {"outer": {"key": 2}};'
+        
+        assert list(iter_json_objects(text)) == [{"key": "}{"}, {"outer": {"key": 2}}], "Should decode each object once"
+        assert list(iter_json_objects(text, 'outer')) == [{"outer": {"key": 2}}], "Should only yield objects with the key"
+        assert grab_dict_by_key([text], 'key') == {"key": "}{"}, "Should find the first occurrence in script texts"
+    
+    def test_iter_json_objects_is_lazy(self):
+        """Test that objects after the first match are not decoded"""
+        text = 'a = {"key": 1}; b = {"key": ' + '[' * 10 + '}'
+        
+        objects = iter_json_objects(text, 'key')
+        
+        assert next(objects) == {"key": 1}, "Should yield the first object before scanning further"
+
+
+class TestFindNestedKey:
+    """Test suite for find_nested_key function"""
+    
+    def test_find_nested_key_order(self):
+        """Test that dictionaries are searched depth-first, parents before children"""
+        data = {"a": [{"x": 1}, {"key": {"key": 2}}], "b": {"key": 3}}
+        
+        assert find_nested_key(data, 'key') == {"key": {"key": 2}}, "Should return the first containing dict"
+        assert find_nested_key(data, 'missing') is None, "Should return None when the key is not found"
+        assert find_nested_key(KeyIndex(data), 'key') is data['a'][1], "KeyIndex lookups should match"
+        assert KeyIndex(data).find_all('key') == [{"key": {"key": 2}}, {"key": 2}, {"key": 3}], "Should index every occurrence"
+    
+    def test_find_nested_key_deep_document(self):
+        """Test that very deep documents do not hit the recursion limit"""
+        data: dict = {}
+        node = data
+        for _ in range(sys.getrecursionlimit() * 2):
+            node['child'] = {}
+            node = node['child']
+        node['key'] = 1
+        
+        assert find_nested_key(data, 'key') == {"key": 1}, "Should find keys below the recursion limit"
+        assert grab_dict_by_key([data], 'key') == {"key": 1}, "grab_dict_by_key should not recurse either"
+        assert YoutubePage([data], 'watch').find_many(['key', 'missing']) == {'key': {"key": 1}, 'missing': None}, \
+            "Page lookups should not recurse either"
 
 
 class TestGrabDictByKey:
@@ -148,6 +284,76 @@ class TestXmlTranscriptToJsonBs4:
             assert isinstance(entry["text"], str), "Text should be a string"
 
 
+class TestXmlTranscriptToJson:
+    """Test suite for the streaming xml_transcript_to_json function"""
+    
+    def test_xml_transcript_to_json_entities(self):
+        """Test that segments are parsed and doubly escaped entities decoded"""
+        xml_content = ('<?xml version="1.0" encoding="utf-8" ?><transcript>'
+                       '<text start="0.5" dur="1.2">Hello &amp;amp; welcome</text>'
+                       '<text start="1.7" dur="2">it&amp;#39;s me</text>'
+                       '<text start="3.7" dur="1"></text></transcript>')
+        
+        result = xml_transcript_to_json(xml_content.encode('utf-8'))
+        
+        assert result == {"transcript": [
+            {"start": 0.5, "duration": 1.2, "text": "Hello & welcome"},
+            {"start": 1.7, "duration": 2.0, "text": "it's me"},
+            {"start": 3.7, "duration": 1.0, "text": ""},
+        ]}, "Should match the bs4 output structure with entities decoded"
+    
+    @pytest.mark.parametrize('xml_content', ['', '  \n', b'', 'not xml', '<html><body>Error</body></html>'])
+    def test_xml_transcript_to_json_empty_or_malformed(self, xml_content):
+        """Test that empty and non-XML bodies give an empty transcript, like the bs4 parser"""
+        assert xml_transcript_to_json(xml_content) == xml_transcript_to_json_bs4(xml_content) == {"transcript": []}
+    
+    def test_xml_transcript_to_json_truncated(self):
+        """Test that a truncated track keeps the segments closed before the cut"""
+        xml_content = '<transcript><text start="0" dur="1">a</text><text start="1" dur="2">b'
+        
+        assert xml_transcript_to_json(xml_content) == {"transcript": [{"start": 0.0, "duration": 1.0, "text": "a"}]}
+
+
+class TestCaptionTrackFormats:
+    """Test suite for json3_transcript_to_json and srv3_transcript_to_json"""
+    
+    expected = {"transcript": [
+        {"start": 0.5, "duration": 1.2, "text": "Hello & welcome"},
+        {"start": 1.7, "duration": 2.0, "text": "it's me"},
+    ]}
+    
+    def test_json3_transcript_to_json(self):
+        """Test that window and line-break events are skipped and segments joined"""
+        data = {"events": [
+            {"tStartMs": 0, "dDurationMs": 5000, "id": 1},
+            {"tStartMs": 500, "dDurationMs": 1200, "segs": [{"utf8": "Hello"}, {"utf8": " & welcome", "tOffsetMs": 300}]},
+            {"tStartMs": 1700, "dDurationMs": 2000, "aAppend": 1, "segs": [{"utf8": "\n"}]},
+            {"tStartMs": 1700, "dDurationMs": 2000, "segs": [{"utf8": "it's me"}]},
+        ]}
+        
+        assert json3_transcript_to_json(data) == self.expected, "Should match the xml transcript structure"
+    
+    def test_srv3_transcript_to_json(self):
+        """Test that word-level segments are joined and times converted to seconds"""
+        xml_content = ('<?xml version="1.0" encoding="utf-8" ?><timedtext format="3"><body>'
+                       '<p t="500" d="1200">Hello &amp; welcome</p>'
+                       '<p t="1700" d="2000"><s>it&#39;s</s><s t="200"> me</s></p>'
+                       '<p t="3700" d="10">\n</p></body></timedtext>')
+        
+        assert srv3_transcript_to_json(xml_content.encode('utf-8')) == self.expected, "Should match the xml transcript structure"
+    
+    @pytest.mark.parametrize('xml_content', ['', b'  ', 'not xml'])
+    def test_srv3_transcript_to_json_empty_or_malformed(self, xml_content):
+        """Test that empty and non-XML tracks give an empty transcript"""
+        assert srv3_transcript_to_json(xml_content) == {"transcript": []}
+    
+    def test_srv3_transcript_to_json_truncated(self):
+        """Test that a truncated track keeps the segments closed before the cut"""
+        xml_content = '<timedtext><body><p t="500" d="1200">Hello &amp; welcome</p><p t="1'
+        
+        assert srv3_transcript_to_json(xml_content) == {"transcript": self.expected["transcript"][:1]}
+
+
 class TestExtractJsonFromScripts:
     """Test suite for extract_json_from_scripts function"""
     
@@ -201,4 +407,13 @@ class TestExtractJsonFromScripts:
         result = extract_json_from_scripts(scripts, 'nonExistentKey12345')
         
         # Verify the result
-        assert result is None, "Should return None when target key is not found"
\ No newline at end of file
+        assert result is None, "Should return None when target key is not found"
+    
+    def test_extract_json_from_scripts_offline(self):
+        """Test finding a key in decoded pages and in raw script texts"""
+        page = parse_youtube_page_scripts('<script>var ytInitialData = {"header": {"searchFilterButton": {}}};</script>')
+        texts = ['if (a) { b(); }', 'var x = {"header": {"searchFilterButton": {}}} ; {"broken": ']
+        
+        assert extract_json_from_scripts(page, 'searchFilterButton') == {"searchFilterButton": {}}, "Should find the key in the page"
+        assert extract_json_from_scripts(texts, 'searchFilterButton') == {"searchFilterButton": {}}, "Should find the key in script texts"
+        assert extract_json_from_scripts(texts, 'missing') is None, "Should return None when the key is not found"
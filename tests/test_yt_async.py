@@ -0,0 +1,68 @@
+import pytest
+import sys
+import os
+import asyncio
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from yt_crawler import AsyncYoutubeAPI
+
+
+class TestAsyncYoutubeAPI:
+    """Tests for the asyncio YouTube client"""
+
+    def test_get_video_details_concurrently(self):
+        """Test that several video details can be fetched concurrently"""
+        video_ids = ["nUgGY18iTJw", "gaH4g0l6f9w"]
+
+        async def fetch_all():
+            async with AsyncYoutubeAPI() as youtube_api:
+                return await asyncio.gather(*(youtube_api.get_video_details(video_id) for video_id in video_ids))
+
+        results = asyncio.run(fetch_all())
+
+        assert len(results) == len(video_ids), "Should return one result per video ID"
+        for video_id, result in zip(video_ids, results):
+            assert 'videoDetails' in result, "Result should contain 'videoDetails' key"
+            assert 'microformat' in result, "Result should contain 'microformat' key"
+            assert result['videoDetails']['videoId'] == video_id, "Results should be returned in input order"
+
+    def test_get_video_comments_with_limit(self):
+        """Test that async get_video_comments respects the n_comments limit"""
+        video_id = "v9ZApdKADxs"
+        n_comments = 20
+
+        async def fetch():
+            async with AsyncYoutubeAPI() as youtube_api:
+                return await youtube_api.get_video_comments(video_id, n_comments=n_comments)
+
+        result = asyncio.run(fetch())
+
+        comments = result.get('comments')
+        assert isinstance(comments, list), "Comments should be a list"
+        assert len(comments) == n_comments, f"Comments list should contain exactly {n_comments} items, got {len(comments)}"
+
+    def test_search(self):
+        """Test that async search returns populated results"""
+        async def fetch():
+            async with AsyncYoutubeAPI() as youtube_api:
+                return await youtube_api.search("python is good", n_videos=30)
+
+        result = asyncio.run(fetch())
+
+        search_results = result.get('search_results')
+        assert isinstance(search_results, list), "Search results should be a list"
+        assert len(search_results) > 0, "Search results list should not be empty"
+        assert all('videoId' in item for item in search_results), "All search result items should contain 'videoId' key"
+
+    def test_get_video_transcript(self):
+        """Test that async get_video_transcript returns a populated transcript"""
+        async def fetch():
+            async with AsyncYoutubeAPI() as youtube_api:
+                return await youtube_api.get_video_transcript("nUgGY18iTJw")
+
+        result = asyncio.run(fetch())
+
+        assert isinstance(result.get('transcript'), list), "Transcript should be a list"
+        assert len(result['transcript']) > 0, "Transcript list should not be empty"
@@ -0,0 +1,125 @@
+import pytest
+import sys
+import os
+import asyncio
+import threading
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from yt_crawler import YoutubeAPI
+from yt_crawler.youtube_batch import _run_many, _arun_many
+
+
+class TestYoutubeBatch:
+    """Tests for bulk video fetching"""
+
+    @pytest.fixture
+    def youtube_api(self) -> YoutubeAPI:
+        """Create a YoutubeAPI instance for testing"""
+        return YoutubeAPI()
+
+    def test_get_video_details_many_ordered(self, youtube_api: YoutubeAPI):
+        """Test that get_video_details_many yields one result per ID in input order"""
+        video_ids = ["nUgGY18iTJw", "gaH4g0l6f9w", "v9ZApdKADxs"]
+
+        results = list(youtube_api.get_video_details_many(video_ids, concurrency=2, ordered=True))
+
+        assert [video_id for video_id, _ in results] == video_ids, "Results should follow input order"
+        for video_id, result in results:
+            assert isinstance(result, dict), f"Result for {video_id} should be a dictionary"
+            assert result['videoDetails']['videoId'] == video_id, "Result should belong to its video ID"
+
+    def test_get_video_details_many_yields_errors(self, youtube_api: YoutubeAPI):
+        """Test that a failing video ID is reported without stopping the batch"""
+        video_ids = ["nUgGY18iTJw", "invalid_id_123"]
+
+        results = dict(youtube_api.get_video_details_many(video_ids, concurrency=2))
+
+        assert set(results) == set(video_ids), "Every video ID should be yielded"
+        assert isinstance(results["nUgGY18iTJw"], dict), "Valid video should return details"
+        assert isinstance(results["invalid_id_123"], Exception), "Invalid video should yield its exception"
+
+    def test_get_video_transcripts_many(self, youtube_api: YoutubeAPI):
+        """Test that get_video_transcripts_many returns transcripts and errors per video"""
+        video_ids = ["nUgGY18iTJw", "v9ZApdKADxs"]  # second video has no captions
+
+        results = dict(youtube_api.get_video_transcripts_many(video_ids))
+
+        assert isinstance(results["nUgGY18iTJw"].get('transcript'), list), "Transcript should be a list"
+        assert isinstance(results["v9ZApdKADxs"], Exception), "Video without captions should yield an exception"
+
+
+class TestRunMany:
+    """Offline tests for the bounded-concurrency batch runners"""
+
+    def test_ordered_with_errors(self):
+        """Test that ordered results follow input order and failures are yielded, not raised"""
+        release = threading.Event()
+
+        def func(video_id):
+            if video_id == 'a':
+                # Finishes last, so input order differs from completion order
+                release.wait(5)
+            if video_id == 'b':
+                raise ValueError(video_id)
+            if video_id == 'c':
+                release.set()
+            return video_id.upper()
+
+        results = list(_run_many(func, ['a', 'b', 'c'], concurrency=3, ordered=True))
+
+        assert [video_id for video_id, _ in results] == ['a', 'b', 'c'], "Results should follow input order"
+        assert results[0][1] == 'A' and results[2][1] == 'C'
+        assert isinstance(results[1][1], ValueError), "A failing ID should yield its exception"
+
+    def test_async_ordered_with_errors(self):
+        """Test that the async runner keeps input order and yields failures"""
+        async def run():
+            release = asyncio.Event()
+
+            async def func(video_id):
+                if video_id == 'a':
+                    await release.wait()
+                if video_id == 'b':
+                    raise ValueError(video_id)
+                if video_id == 'c':
+                    release.set()
+                return video_id.upper()
+
+            return [result async for result in _arun_many(func, ['a', 'b', 'c'], concurrency=3, ordered=True)]
+
+        results = asyncio.run(run())
+
+        assert [video_id for video_id, _ in results] == ['a', 'b', 'c'], "Results should follow input order"
+        assert results[0][1] == 'A' and results[2][1] == 'C'
+        assert isinstance(results[1][1], ValueError), "A failing ID should yield its exception"
+
+    @pytest.mark.parametrize('ordered', [True, False])
+    def test_async_early_break_awaits_leftover_tasks(self, ordered):
+        """Test that closing the async runner early cancels and awaits the calls still in flight"""
+        async def run():
+            started, cancelled = [], []
+
+            async def func(video_id):
+                started.append(video_id)
+                if video_id == 'a':
+                    return 'A'
+                try:
+                    await asyncio.Event().wait()
+                except asyncio.CancelledError:
+                    cancelled.append(video_id)
+                    raise
+
+            results = _arun_many(func, ['a', 'b', 'c', 'd'], concurrency=3, ordered=ordered)
+            first = await results.__anext__()
+            await results.aclose()
+            leftover = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            return first, started, cancelled, leftover
+
+        first, started, cancelled, leftover = asyncio.run(run())
+
+        assert first == ('a', 'A')
+        assert 'd' not in started, "No call should start after the consumer stopped"
+        assert sorted(cancelled) == sorted(set(started) - {'a'}), "Calls in flight should be cancelled"
+        assert not leftover, "Cancelled calls should be awaited before the runner returns"
@@ -2,6 +2,7 @@ import pytest
 import sys
 import os
 import random
+import time
 
 # Add the parent directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -433,4 +434,18 @@ class TestYoutubeAPIComments:
                 assert sub_comment.get('author') is not None, "Filtered sub-comment author should not be None"
                 assert sub_comment.get('key') is not None, "Filtered sub-comment key should not be None"
             
-            print(f"Successfully tested filtering with random comment ID: {random_comment_id}")
\ No newline at end of file
+            print(f"Successfully tested filtering with random comment ID: {random_comment_id}")
+    
+    def test_get_video_comments_max_seconds(self, youtube_api: YoutubeAPI):
+        """Test that get_video_comments stops paginating when its time budget runs out"""
+        video_id = "lH3ox-mE1xY"
+        
+        start = time.monotonic()
+        result = youtube_api.get_video_comments(video_id, max_seconds=0)
+        elapsed = time.monotonic() - start
+        
+        # Only the first page of comments should be fetched
+        comments = result.get('comments')
+        assert isinstance(comments, list), "Comments should be a list"
+        assert len(comments) > 0, "Comments collected before the deadline should be returned"
+        assert elapsed < 30, "A zero budget should not paginate through the whole comment section"
@@ -1,11 +1,15 @@
 import pytest
 import sys
 import os
+import requests
+import warnings
 
 # Add the parent directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from yt_crawler import YoutubeAPI
+from yt_crawler.youtube_search import _encode_search_params, _search_url_sp, _validated_search_url
+from yt_crawler.page import YoutubePage
 
 
 class TestYoutubeSearch:
@@ -261,4 +265,154 @@ class TestYoutubeSearch:
         assert all(isinstance(video, dict) for video in search_results), "All search result items should be dictionaries"
         assert all('videoId' in video for video in search_results), "All search result items should contain 'videoId' key"
         assert all('thumbnail' in video for video in search_results), "All search result items should contain 'thumbnail' key"
-        assert all('title' in video for video in search_results), "All search result items should contain 'title' key"
\ No newline at end of file
+        assert all('title' in video for video in search_results), "All search result items should contain 'title' key"
+    
+    def test_search_max_seconds(self, youtube_api: YoutubeAPI):
+        """Test that search returns the first batch when its time budget runs out"""
+        result = youtube_api.search("python is good", n_videos=1000, max_seconds=0)
+        
+        search_results = result.get('search_results')
+        assert isinstance(search_results, list), "Search results should be a list"
+        assert 0 < len(search_results) < 1000, "Only results collected before the deadline should be returned"
+    
+    def test_search_fields(self, youtube_api: YoutubeAPI):
+        """Test that search keeps only the requested fields of each result"""
+        fields = ['videoId', 'title', 'viewCount', 'lengthSeconds']
+        result = youtube_api.search("python is good", n_videos=30, fields=fields)
+        
+        search_results = result.get('search_results')
+        assert len(search_results) > 0, "Search should return results"
+        assert all(list(video.keys()) == fields for video in search_results), "Each result should only contain the requested fields"
+        assert all(isinstance(video['title'], str) for video in search_results), "Titles should be plain strings"
+    
+    def test_search_filter_modes_agree(self, youtube_api: YoutubeAPI):
+        """Test that the locally encoded filter URL matches the one crawled from YouTube"""
+        filters = dict(upload_date="this_week", duration="4_20_minutes", features="hd", sort_by="view_count")
+        
+        local_url = youtube_api._get_search_url("python tutorial", filter_mode='local', **filters)
+        crawled_url = youtube_api._get_search_url("python tutorial", filter_mode='crawl', **filters)
+        
+        assert _search_url_sp(local_url) == _search_url_sp(crawled_url), "Local sp should match YouTube's filter links"
+
+
+def search_page(video_id):
+    """Decoded results page with one video and no continuation"""
+    return YoutubePage([{'contents': {'sectionListRenderer': {'contents': [
+        {'itemSectionRenderer': {'contents': [{'videoRenderer': {'videoId': video_id}}]}},
+        {'continuationItemRenderer': {'continuationEndpoint': {'clickTrackingParams': 'ctp', 'continuationCommand': {'token': None}}}},
+    ]}}}], 'results')
+
+
+class TestSearchParams:
+    """Tests for the local sp encoder (no network)"""
+    
+    def test_encode_search_params(self):
+        """Test single filters against the sp values found on YouTube's filter links"""
+        assert _encode_search_params({'sort_by': 'upload_date'}) == 'CAI='
+        assert _encode_search_params({'upload_date': 'today'}) == 'EgIIAg=='
+        assert _encode_search_params({'duration': 'under_4_minutes'}) == 'EgIYAQ=='
+        assert _encode_search_params({'features': 'live'}) == 'EgJAAQ=='
+        assert _encode_search_params({'features': '4k'}) == 'EgJwAQ=='
+        assert _encode_search_params({}) == ''
+    
+    def test_local_search_url_needs_no_request(self):
+        """Test that local mode builds the URL without fetching a results page"""
+        youtube_api = YoutubeAPI()
+        youtube_api._fetch_page_scripts = None  # any request would fail
+        
+        url = youtube_api._get_search_url("python tutorial", upload_date="this_week", duration="over_20_minutes",
+                                          features="hd", sort_by="view_count", filter_mode='local')
+        
+        assert url == "https://www.youtube.com/results?search_query=python+tutorial&sp=CAMSBggDGAIgAQ%3D%3D"
+        
+        with pytest.raises(ValueError):
+            youtube_api._get_search_url("python", filter_mode='guess')
+    
+    def test_remembered_params_dropped_only_when_rejected(self):
+        """Test that a remembered sp value is only dropped when the results page rejects it"""
+        youtube_api = YoutubeAPI()
+        filters = {'upload_date': 'today'}
+        youtube_api.search_param_cache.put(filters, 'OLD')
+        youtube_api._resolve_search_params = lambda url, active_filters: youtube_api.search_param_cache.get(active_filters) or 'NEW'
+        
+        def timeout(url):
+            raise requests.Timeout("timed out")
+        
+        youtube_api._fetch_page_scripts = timeout
+        with pytest.raises(requests.Timeout):
+            youtube_api.search("python", upload_date='today', filter_mode='crawl')
+        assert youtube_api.search_param_cache.get(filters) == 'OLD', "Request errors should not drop the value"
+        
+        fetched = []
+        
+        def fetch(url):
+            fetched.append(_search_url_sp(url))
+            return search_page('abc') if url.endswith('sp=NEW') else YoutubePage([{'contents': {}}], 'results')
+        
+        youtube_api._fetch_page_scripts = fetch
+        results = youtube_api.search("python", upload_date='today', filter_mode='crawl')
+        
+        assert fetched == ['OLD', 'NEW'], "Should retry once with a newly resolved value"
+        assert results == {'search_results': [{'videoId': 'abc'}]}
+    
+    def test_local_params_fall_back_to_crawl(self):
+        """Test that a local sp value YouTube does not accept is retried once with a crawled one"""
+        youtube_api = YoutubeAPI()
+        youtube_api._resolve_search_params = lambda url, active_filters: 'CRAWLED'
+        local_sp = _encode_search_params({'upload_date': 'today'})
+        fetched = []
+        
+        def fetch(url):
+            fetched.append(_search_url_sp(url))
+            return search_page('abc') if url.endswith('sp=CRAWLED') else YoutubePage([{'contents': {}}], 'results')
+        
+        youtube_api._fetch_page_scripts = fetch
+        results = youtube_api.search("python", upload_date='today', filter_mode='local')
+        
+        assert fetched == [local_sp, 'CRAWLED'], "Should fall back to the crawled sp value once"
+        assert results == {'search_results': [{'videoId': 'abc'}]}
+        
+        youtube_api._fetch_page_scripts = lambda url: YoutubePage([{'contents': {}}], 'results')
+        with pytest.raises(Exception, match="sectionListRenderer"):
+            youtube_api.search("python", upload_date='today', filter_mode='local')
+    
+    def test_local_params_not_retried_on_other_errors(self):
+        """Test that only a rejected results page falls back to crawled filters"""
+        youtube_api = YoutubeAPI()
+        youtube_api._resolve_search_params = lambda url, active_filters: pytest.fail("Should not crawl the filters")
+        single_page = YoutubePage([{'contents': {'sectionListRenderer': {'contents': [
+            {'itemSectionRenderer': {'contents': [{'videoRenderer': {'videoId': 'abc'}}]}},
+        ]}}}], 'results')
+        
+        youtube_api._fetch_page_scripts = lambda url: single_page
+        results = youtube_api.search("python", upload_date='today', filter_mode='local')
+        assert results == {'search_results': [{'videoId': 'abc'}]}, "One page without continuation is a valid result"
+        
+        youtube_api._fetch_page_scripts = lambda url: YoutubePage([{'contents': {'sectionListRenderer': {'contents': [{}]}}}], 'results')
+        with pytest.raises(Exception, match="Could not parse search results"):
+            youtube_api.search("python", upload_date='today', filter_mode='local')
+    
+    def test_local_params_rejected_with_http_400(self):
+        """Test that an HTTP 400 answer to a local sp value falls back to crawled filters"""
+        youtube_api = YoutubeAPI()
+        youtube_api._resolve_search_params = lambda url, active_filters: 'CRAWLED'
+        
+        def fetch(url):
+            if url.endswith('sp=CRAWLED'):
+                return search_page('abc')
+            response = requests.Response()
+            response.status_code = 400
+            raise requests.HTTPError("400 Client Error", response=response)
+        
+        youtube_api._fetch_page_scripts = fetch
+        assert youtube_api.search("python", upload_date='today', filter_mode='local') == {'search_results': [{'videoId': 'abc'}]}
+    
+    def test_validate_double_encoded_filter_link(self):
+        """Test that the double-encoded sp of YouTube's filter links matches the local value"""
+        local_url = "https://www.youtube.com/results?search_query=python&sp=EgIIAw%3D%3D"
+        crawled_url = "https://www.youtube.com/results?search_query=python&sp=EgIIAw%253D%253D"
+        
+        assert _search_url_sp(crawled_url) == _encode_search_params({'upload_date': 'this_week'}) == 'EgIIAw=='
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            assert _validated_search_url(local_url, crawled_url) == local_url, "Matching values should keep the local URL"
@@ -66,4 +66,14 @@ class TestYoutubeVideoDetails:
         ]
         
         assert all(key in player_microformat for key in required_microformat_keys), \
-            "playerMicroformatRenderer should contain all required keys"
\ No newline at end of file
+            "playerMicroformatRenderer should contain all required keys"
+    
+    def test_get_video_details_fields(self, youtube_api: YoutubeAPI):
+        """Test that only the requested fields are returned, from videoDetails or microformat"""
+        video_id = "nUgGY18iTJw"
+        
+        result = youtube_api.get_video_details(video_id, fields=['videoId', 'title', 'viewCount', 'publishDate'])
+        
+        assert list(result.keys()) == ['videoId', 'title', 'viewCount', 'publishDate'], "Result should only contain the requested fields"
+        assert result['videoId'] == video_id, "videoId should come from videoDetails"
+        assert result['publishDate'] is not None, "publishDate should come from microformat"
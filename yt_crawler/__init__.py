@@ -1,3 +1,3 @@
-from .youtube import YoutubeAPI
+from .youtube import YoutubeAPI, AsyncYoutubeAPI
 
-__all__ = ['YoutubeAPI']
+__all__ = ['YoutubeAPI', 'AsyncYoutubeAPI']
@@ -5,3 +5,97 @@ HEADERS = {
     "X-YouTube-Client-Name": "1",
     "X-YouTube-Client-Version": "2.20240321.08.00"
 }
+
+# Connection pool defaults for the shared HTTP session
+POOL_CONNECTIONS = 10  # number of per-host pools kept alive
+POOL_MAXSIZE = 10      # maximum connections kept alive per host
+
+# Connection limits for the async HTTP client
+ASYNC_MAX_CONNECTIONS = 100           # total concurrent connections
+ASYNC_MAX_KEEPALIVE_CONNECTIONS = 20  # idle connections kept open for reuse
+ASYNC_KEEPALIVE_EXPIRY = 5.0          # seconds an idle connection is kept
+
+# Per-endpoint request budgets as (requests per second, burst size).
+# Endpoints are classified from the request URL, see transport.endpoint_for_url.
+RATE_LIMITS = {
+    'watch': (5.0, 10),      # /watch?v= pages
+    'results': (2.0, 5),     # /results search pages
+    'playlist': (2.0, 5),    # /playlist?list= pages
+    'feed': (1.0, 3),        # /feed/... pages
+    'search': (5.0, 10),     # /youtubei/v1/search continuations
+    'next': (10.0, 20),      # /youtubei/v1/next continuations
+    'captions': (5.0, 10),   # caption track baseUrl fetches
+    'default': (5.0, 10),
+}
+
+# Adaptive slowdown (AIMD) applied when YouTube answers 429 or 503
+RATE_LIMIT_DECREASE_FACTOR = 0.5  # multiply the rate by this on throttling
+RATE_LIMIT_INCREASE_STEP = 0.1    # requests per second added back after each success
+RATE_LIMIT_MIN_RATE = 0.1         # never go slower than this
+
+# Retries for transient failures (connection errors, 429 and 5xx responses)
+RETRY_MAX_ATTEMPTS = 4     # total attempts per request, including the first
+RETRY_BACKOFF_BASE = 0.5   # seconds, doubled after every attempt
+RETRY_BACKOFF_MAX = 30.0   # upper bound of a single backoff
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Circuit breaker: stop sending requests to a host after this many consecutive
+# failures and try again with a single request once the recovery timeout passed
+CIRCUIT_FAILURE_THRESHOLD = 10
+CIRCUIT_RECOVERY_TIMEOUT = 30.0
+
+# Per-request timeouts in seconds: time to open a connection, and maximum
+# time between bytes received from the server
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 30.0
+
+# Shortest timeout in seconds given to a request of a call whose max_seconds
+# budget is nearly spent
+MIN_REQUEST_TIMEOUT = 0.1
+
+# JSON backend used to decode pages and innertube responses: 'orjson', 'simdjson',
+# 'ujson' or 'json'. Missing backends fall back to the standard library json module.
+JSON_BACKEND = 'json'
+
+# Bytes read at a time when streaming a watch page that is only needed up to
+# its ytInitialPlayerResponse
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# In-process cache of parsed watch pages shared by video details, transcripts
+# and comments (see pagecache.PageCache): seconds a page is reused, and budget
+# for the HTML size of the cached pages
+PAGE_CACHE_TTL = 300.0
+PAGE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Seconds raw responses are kept by the optional disk cache (see
+# responsecache.ResponseCache), per endpoint. 0 disables caching for an endpoint.
+RESPONSE_CACHE_TTLS = {
+    'watch': 7 * 24 * 3600.0,      # /watch?v= pages
+    'captions': 30 * 24 * 3600.0,  # caption tracks never change once published
+    'playlist': 24 * 3600.0,       # /playlist?list= pages
+    'results': 3600.0,             # /results search pages
+    'search': 3600.0,              # /youtubei/v1/search continuations
+    'next': 3600.0,                # /youtubei/v1/next continuations (comments)
+    'feed': 600.0,                 # /feed/... pages, e.g. news
+    'default': 0,
+}
+
+# How search filters are applied: 'local' encodes the sp URL parameter without
+# any request, 'crawl' follows the filter links of one results page per filter
+# (the original behaviour), 'validate' does both and warns when they differ
+SEARCH_FILTER_MODE = 'local'
+
+# JSON file remembering the sp value of each filter combination resolved in
+# 'crawl' or 'validate' mode across runs (see spcache.SearchParamCache).
+# None keeps it in memory only.
+SEARCH_PARAM_CACHE_PATH = None
+
+# Seconds a video is skipped after its watch page showed it has no transcript,
+# comments or details (see negcache.NegativeCache). 0 disables the cache.
+NEGATIVE_CACHE_TTL = 7 * 24 * 3600.0
+# SQLite file keeping those outcomes across runs. None keeps them in memory only.
+NEGATIVE_CACHE_PATH = None
+
+# Seconds the innertube client settings (API key, client version, visitor ID,
+# INNERTUBE_CONTEXT) read from a page's ytcfg are reused before being read again
+INNERTUBE_CONTEXT_TTL = 6 * 3600.0
@@ -0,0 +1,22 @@
+class CircuitOpenError(Exception):
+    """Raised without sending a request while the circuit breaker for a host is open"""
+
+    def __init__(self, host: str, retry_in: float):
+        self.host = host
+        self.retry_in = retry_in
+        super().__init__(f"Circuit open for {host}: too many consecutive failures, retrying in {retry_in:.1f}s")
+
+
+class ResourceUnavailableError(Exception):
+    """
+    Raised when a watch page was read but the video has no such resource, e.g. no
+    captions or comments turned off. These outcomes are remembered by
+    negcache.NegativeCache, and cached=True marks errors raised from that cache.
+    """
+
+    def __init__(self, resource: str, reason: str, video_id: str | None = None, cached: bool = False):
+        self.resource = resource
+        self.reason = reason
+        self.video_id = video_id
+        self.cached = cached
+        super().__init__(reason)
@@ -0,0 +1,113 @@
+import copy
+import threading
+import time
+from typing import Any
+from urllib.parse import urlsplit, urlunsplit
+from .config import HEADERS, INNERTUBE_CONTEXT_TTL
+
+
+class InnertubeContext:
+    """
+    Client settings YouTube's web app sends with every innertube request.
+
+    YouTube pages embed them in a ytcfg.set({...}) blob: the INNERTUBE_CONTEXT
+    sent in request bodies, the INNERTUBE_API_KEY, the current web client
+    version and the visitor ID. Requests with an outdated client version get
+    slower, degraded responses, so the values are read from the pages the
+    client loads anyway and refreshed once they are older than ttl seconds.
+
+    Until a page has been read, the defaults from config.HEADERS are used.
+    Thread-safe; each YoutubeAPI client has its own context.
+    """
+
+    def __init__(self, ttl: float = INNERTUBE_CONTEXT_TTL):
+        """
+        Args:
+            ttl (float): Seconds the values read from a page are used before being read again
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.api_key: str | None = None
+        self.client_version: str = HEADERS['X-YouTube-Client-Version']
+        self.client_name: str = HEADERS['X-YouTube-Client-Name']
+        self.visitor_data: str | None = None
+        self.context: dict[str, Any] = {'client': {'clientName': 'WEB', 'clientVersion': self.client_version}}
+        self.updated_at: float | None = None
+
+    @property
+    def expired(self) -> bool:
+        """Whether the values should be read again from the next page loaded"""
+        return self.updated_at is None or time.monotonic() - self.updated_at >= self.ttl
+
+    def update(self, scripts: list[Any]) -> bool:
+        """
+        Read the settings from a page's ytcfg blob if the current ones have expired.
+
+        Args:
+            scripts: Decoded JSON blobs of a YouTube page, see utils.parse_youtube_page_scripts
+
+        Returns:
+            bool: Whether the settings were updated
+        """
+        if not self.expired:
+            return False
+
+        ytcfg = next((blob for blob in scripts if isinstance(blob, dict) and 'INNERTUBE_CONTEXT' in blob), None)
+        if ytcfg is None:
+            return False
+
+        context = ytcfg['INNERTUBE_CONTEXT']
+        client = context.get('client', {})
+        with self._lock:
+            self.context = context
+            self.api_key = ytcfg.get('INNERTUBE_API_KEY', self.api_key)
+            self.client_version = ytcfg.get('INNERTUBE_CLIENT_VERSION') or client.get('clientVersion') or self.client_version
+            self.client_name = str(ytcfg.get('INNERTUBE_CONTEXT_CLIENT_NAME', self.client_name))
+            self.visitor_data = ytcfg.get('VISITOR_DATA') or client.get('visitorData') or self.visitor_data
+            self.updated_at = time.monotonic()
+        return True
+
+    def request_context(self) -> dict[str, Any]:
+        """
+        Returns:
+            dict: A copy of the context to send as "context" in an innertube request body
+        """
+        with self._lock:
+            context = copy.deepcopy(self.context)
+            client = context.setdefault('client', {})
+            client['clientVersion'] = self.client_version
+            if self.visitor_data:
+                client.setdefault('visitorData', self.visitor_data)
+        return context
+
+    def headers(self, headers: dict[str, str] = HEADERS) -> dict[str, str]:
+        """
+        Returns:
+            dict: headers with the current client name, version and visitor ID
+        """
+        with self._lock:
+            result = {**headers,
+                      'X-YouTube-Client-Name': self.client_name,
+                      'X-YouTube-Client-Version': self.client_version}
+            if self.visitor_data:
+                result['X-Goog-Visitor-Id'] = self.visitor_data
+        return result
+
+    def api_url(self, url: str) -> str:
+        """
+        Returns:
+            str: url with the API key appended to its query string, once a key is known
+        """
+        if not self.api_key:
+            return url
+        parts = urlsplit(url)
+        query = f"{parts.query}&key={self.api_key}" if parts.query else f"key={self.api_key}"
+        return urlunsplit(parts._replace(query=query))
+
+    def clear(self) -> None:
+        """Go back to the defaults, so the next page loaded sets the values again"""
+        with self._lock:
+            self._reset()
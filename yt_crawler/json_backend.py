@@ -0,0 +1,90 @@
+import importlib
+import json
+import re
+import warnings
+from typing import Any
+
+
+# Supported backends, fastest first. 'simdjson' is the pysimdjson package.
+JSON_BACKENDS = ('orjson', 'simdjson', 'ujson', 'json')
+
+_stdlib_decoder = json.JSONDecoder()
+
+# End of a JSON object followed by the end of its JavaScript statement, e.g. the
+# `});` of `ytcfg.set({...});` or the `};` of `var ytInitialData = {...};`.
+# Outside strings, JSON contains neither `;` nor `)`.
+_VALUE_END_PATTERN = re.compile(r'\}\s*[;)]')
+
+
+class JsonBackend:
+    """
+    JSON encoder/decoder used for every decode done by a YoutubeAPI client.
+
+    Page blobs and continuation responses are often hundreds of KB, so a
+    faster backend such as orjson noticeably cuts CPU time. Falls back to the
+    standard library json module when the requested backend is not installed.
+    """
+
+    def __init__(self, name: str = 'json'):
+        """
+        Args:
+            name (str): One of JSON_BACKENDS. Defaults to the stdlib 'json'.
+        """
+        if name not in JSON_BACKENDS:
+            raise ValueError(f"Invalid JSON backend '{name}'. Must be one of: {list(JSON_BACKENDS)}")
+
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            warnings.warn(f"JSON backend '{name}' is not installed, falling back to the standard library json module")
+            name, module = 'json', json
+
+        self.name = name
+        self._module = module
+
+    def loads(self, data: str | bytes) -> Any:
+        """Decode a JSON document"""
+        return self._module.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        """Encode obj as a JSON string"""
+        result = self._module.dumps(obj)
+        return result.decode('utf-8') if isinstance(result, bytes) else result
+
+    def raw_decode(self, text: str, start: int = 0, end: int | None = None) -> tuple[Any, int]:
+        """
+        Decode the JSON value starting at text[start], ignoring whatever follows it.
+
+        Backends other than the stdlib only decode whole documents. When the end
+        of the enclosing script is known, the value is taken to end at the first
+        `}` closing its statement (`};` or `})`), which skips trailing code such
+        as `;var meta = ...` after ytInitialPlayerResponse or the other
+        statements of a ytcfg.set(...) script, and is decoded once. A script
+        without such a statement end is cut at its last `}`. Values that do not
+        end there, e.g. because a string in them contains `};`, and calls without
+        an end, are decoded with json.JSONDecoder.raw_decode.
+
+        Args:
+            text (str): Text containing the JSON value
+            start (int): Index where the value starts
+            end (int, optional): Index where the enclosing script ends, if known
+
+        Returns:
+            tuple: (decoded value, index just after the value)
+
+        Raises:
+            json.JSONDecodeError: If no valid JSON value starts at text[start]
+        """
+        if self._module is not json and end is not None:
+            match = _VALUE_END_PATTERN.search(text, start, end)
+            value_end = match.start() + 1 if match else text.rfind('}', start, end) + 1
+            if value_end:
+                try:
+                    return self._module.loads(text[start:value_end]), value_end
+                except ValueError:
+                    pass
+
+        return _stdlib_decoder.raw_decode(text, start)
+
+
+DEFAULT_JSON_BACKEND = JsonBackend()
@@ -0,0 +1,198 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager, asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Iterator
+from .exceptions import ResourceUnavailableError
+from .config import NEGATIVE_CACHE_TTL
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS unavailable (
+    resource TEXT NOT NULL,
+    video_id TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (resource, video_id)
+)
+'''
+
+
+class NegativeCache:
+    """
+    Remembers videos that have no transcript, comments or details.
+
+    Many videos have no captions or have comments turned off, and recurring
+    crawls would otherwise download and parse their watch pages again just to
+    find that out. When a method raises ResourceUnavailableError the outcome is
+    stored for ttl seconds, and later calls for the same video and resource
+    raise it again without any request.
+
+    Resources are named after what is missing: 'details', 'transcript' and
+    'comments' (which also covers comment threads).
+
+    Entries live in memory, or in a SQLite database when a path is given so
+    they survive restarts and can be shared by several processes. Thread-safe.
+    """
+
+    def __init__(self, ttl: float = NEGATIVE_CACHE_TTL, path: str | None = None):
+        """
+        Args:
+            ttl (float): Seconds an unavailable resource is remembered. 0 disables the cache.
+            path (str, optional): SQLite database file. By default entries are kept in memory.
+        """
+        if ttl < 0:
+            raise ValueError("ttl must not be negative")
+
+        self.ttl = ttl
+        self.path = path
+        self._entries: dict[tuple[str, str], tuple[float, str]] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stores = 0
+
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            connection = self._connection()
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(_SCHEMA)
+            connection.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = sqlite3.connect(self.path, timeout=30.0)
+        return connection
+
+    def get(self, resource: str, video_id: str) -> str | None:
+        """
+        Returns:
+            str: Why the resource is unavailable, or None if it is not (or no longer) remembered
+        """
+        now = time.time()
+        if self.path is None:
+            with self._lock:
+                entry = self._entries.get((resource, video_id))
+                if entry is not None and entry[0] <= now:
+                    del self._entries[(resource, video_id)]
+                    entry = None
+        else:
+            entry = self._connection().execute(
+                'SELECT expires_at, reason FROM unavailable WHERE resource = ? AND video_id = ? AND expires_at > ?',
+                (resource, video_id, now)).fetchone()
+
+        if entry is None:
+            return None
+        with self._lock:
+            self.hits += 1
+        return entry[1]
+
+    def put(self, resource: str, video_id: str, reason: str) -> None:
+        """Remember that a video has no such resource"""
+        if self.ttl <= 0:
+            return
+
+        expires_at = time.time() + self.ttl
+        if self.path is None:
+            with self._lock:
+                self._entries[(resource, video_id)] = (expires_at, reason)
+        else:
+            connection = self._connection()
+            with connection:
+                connection.execute('INSERT OR REPLACE INTO unavailable (resource, video_id, reason, expires_at) VALUES (?, ?, ?, ?)',
+                                   (resource, video_id, reason, expires_at))
+        with self._lock:
+            self.stores += 1
+
+    def discard(self, resource: str, video_id: str) -> None:
+        """Forget a remembered outcome, e.g. after captions were added to a video"""
+        if self.path is None:
+            with self._lock:
+                self._entries.pop((resource, video_id), None)
+        else:
+            connection = self._connection()
+            with connection:
+                connection.execute('DELETE FROM unavailable WHERE resource = ? AND video_id = ?', (resource, video_id))
+
+    def check(self, resource: str, video_id: str) -> None:
+        """
+        Raises:
+            ResourceUnavailableError: If the video is remembered to have no such resource
+        """
+        reason = self.get(resource, video_id)
+        if reason is not None:
+            raise ResourceUnavailableError(resource, reason, video_id, cached=True)
+
+    @contextmanager
+    def track(self, resource: str, video_id: str) -> Iterator[None]:
+        """
+        Check the cache before fetching a resource, and remember a ResourceUnavailableError raised inside the block.
+
+        Usage:
+            with self.negative_cache.track('transcript', video_id):
+                ...
+
+        Raises:
+            ResourceUnavailableError: Remembered or raised inside the block
+        """
+        self.check(resource, video_id)
+        try:
+            yield
+        except ResourceUnavailableError as e:
+            e.video_id = video_id
+            self.put(resource, video_id, e.reason)
+            raise
+
+    @asynccontextmanager
+    async def atrack(self, resource: str, video_id: str) -> AsyncIterator[None]:
+        """
+        Async version of track, used by AsyncYoutubeAPI.
+
+        Usage:
+            async with self.negative_cache.atrack('transcript', video_id):
+                ...
+
+        Raises:
+            ResourceUnavailableError: Remembered or raised inside the block
+        """
+        await self._run(self.check, resource, video_id)
+        try:
+            yield
+        except ResourceUnavailableError as e:
+            e.video_id = video_id
+            await self._run(self.put, resource, video_id, e.reason)
+            raise
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.path is None:
+            return fn(*args)
+        # SQLite calls block for up to the lock timeout, so they run in a worker thread instead of the event loop
+        return await asyncio.to_thread(fn, *args)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns:
+            dict: 'hits' and 'stores' counters and the number of remembered 'entries'
+        """
+        if self.path is None:
+            count = len(self._entries)
+        else:
+            (count,) = self._connection().execute('SELECT COUNT(*) FROM unavailable WHERE expires_at > ?',
+                                                  (time.time(),)).fetchone()
+        with self._lock:
+            return {'hits': self.hits, 'stores': self.stores, 'entries': count}
+
+    def clear(self) -> None:
+        """Forget every outcome and reset the counters"""
+        if self.path is None:
+            with self._lock:
+                self._entries.clear()
+        else:
+            connection = self._connection()
+            with connection:
+                connection.execute('DELETE FROM unavailable')
+        with self._lock:
+            self.hits = 0
+            self.stores = 0
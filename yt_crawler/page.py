@@ -0,0 +1,193 @@
+from .pathcache import PATH_CACHE, Path
+from typing import Any, Iterable, Iterator
+
+
+class YoutubePage(list):
+    """
+    Decoded JSON blobs of one YouTube page, with memoized key lookups.
+
+    A page is parsed once (see utils.parse_youtube_page_scripts) and then
+    shared by every helper that reads it: video details ask for videoDetails,
+    transcripts for captionTracks and comments for subMenuItems. Each lookup
+    result is remembered, and find_many answers several keys with a single
+    traversal of the parsed trees.
+
+    When the page type is known, lookups first try the path where the key was
+    found on earlier pages of that type (see pathcache.PathCache).
+
+    It is a list of the blobs in document order, so it can be passed anywhere
+    a list of page scripts is expected.
+    """
+
+    def __init__(self, blobs: Iterable[Any] = (), page_type: str | None = None):
+        """
+        Args:
+            blobs (iterable): Decoded JSON blobs of the page, in document order
+            page_type (str, optional): Kind of page, e.g. 'watch' or 'results'
+        """
+        super().__init__(blobs)
+        self.page_type = page_type
+        # Set when only the start of the page was downloaded, see
+        # utils.extract_youtube_player_response
+        self.partial = False
+        # Size of the HTML the page was parsed from, used by pagecache.PageCache
+        self.size = 0
+        self._lookups: dict[str, dict[str, Any] | None] = {}
+
+    def find(self, target_key: str) -> dict[str, Any] | None:
+        """
+        Find the first dictionary containing target_key, in document order.
+
+        Args:
+            target_key (str): The key to search for
+
+        Returns:
+            dict: The dictionary containing the target key, or None if not found
+        """
+        if target_key in self._lookups:
+            return self._lookups[target_key]
+        return self.find_many([target_key])[target_key]
+
+    def find_many(self, target_keys: Iterable[str]) -> dict[str, dict[str, Any] | None]:
+        """
+        Find the first dictionary containing each key, traversing the page once.
+
+        Args:
+            target_keys (iterable): Keys to search for
+
+        Returns:
+            dict: Maps each key to the dictionary containing it, or None if not found
+        """
+        target_keys = list(target_keys)
+        remaining = {key for key in target_keys if key not in self._lookups}
+
+        if remaining and self.page_type is not None:
+            for key in list(remaining):
+                result = PATH_CACHE.follow(self, key, self.page_type)
+                if result is not None:
+                    self._lookups[key] = result
+                    remaining.discard(key)
+
+        if remaining:
+            learnable: set[str] = set()
+            if self.page_type is not None:
+                learnable = {key for key in remaining if PATH_CACHE.learnable(key, self.page_type)}
+            found = self._scan(remaining, learnable)
+            for key in remaining:
+                matches = found.get(key, [])
+                self._lookups[key] = matches[0][0] if matches else None
+                if matches and key in learnable:
+                    PATH_CACHE.learn(key, self.page_type, matches[0][1] if len(matches) == 1 else None)
+
+        return {key: self._lookups[key] for key in target_keys}
+
+    def _scan(self, target_keys: set[str], counted: Iterable[str] = ()) -> dict[str, list[tuple[dict[str, Any], Path]]]:
+        """
+        Walk the blobs once, stopping as soon as every key has been found.
+
+        Args:
+            target_keys (set): Keys to search for
+            counted (iterable): Keys also searched for a second time, so the caller knows
+                                whether they occur only once
+
+        Returns:
+            dict: Maps each found key to its first matches, as (containing dict, path from the page)
+        """
+        remaining = {key: 2 if key in counted else 1 for key in target_keys}
+        found: dict[str, list[tuple[dict[str, Any], Path]]] = {}
+        path: list[str | int] = []
+
+        # Stack of (node, iterator over its items), starting from the list of
+        # blobs, so deeply nested pages cannot hit the recursion limit
+        stack: list[tuple[Any, Iterator[tuple[Any, Any]]]] = [(self, enumerate(self))]
+        while stack:
+            node, items = stack[-1]
+            for step, value in items:
+                if step in remaining:
+                    matches = found.setdefault(step, [])
+                    matches.append((node, tuple(path)))
+                    if len(matches) == remaining[step]:
+                        del remaining[step]
+                        if not remaining:
+                            return found
+                value_type = type(value)
+                if value_type is dict:
+                    path.append(step)
+                    stack.append((value, iter(value.items())))
+                    break
+                if value_type is list:
+                    path.append(step)
+                    stack.append((value, enumerate(value)))
+                    break
+            else:
+                stack.pop()
+                if path:
+                    path.pop()
+
+        return found
+
+
+class KeyIndex:
+    """
+    Index of a parsed document: key -> dictionaries containing it.
+
+    Built with one walk of the document, after which every lookup takes
+    constant time. Worth it when many different keys are looked up in the same
+    large response; for a single lookup use utils.find_nested_key.
+    """
+
+    def __init__(self, obj: Any):
+        """
+        Args:
+            obj: Parsed JSON document (dict or list)
+        """
+        self._index: dict[str, list[dict[str, Any]]] = {}
+
+        if isinstance(obj, dict):
+            self._add(obj)
+            stack = [iter(obj.values())]
+        elif isinstance(obj, list):
+            stack = [iter(obj)]
+        else:
+            return
+
+        while stack:
+            for node in stack[-1]:
+                node_type = type(node)
+                if node_type is dict:
+                    self._add(node)
+                    stack.append(iter(node.values()))
+                    break
+                if node_type is list:
+                    stack.append(iter(node))
+                    break
+            else:
+                stack.pop()
+
+    def _add(self, node: dict[str, Any]) -> None:
+        index = self._index
+        for key in node:
+            containing = index.get(key)
+            if containing is None:
+                index[key] = [node]
+            else:
+                containing.append(node)
+
+    def find(self, target_key: str) -> dict[str, Any] | None:
+        """
+        Returns:
+            dict: The first dictionary containing target_key, the same one
+                  utils.find_nested_key returns, or None if not found
+        """
+        containing = self._index.get(target_key)
+        return containing[0] if containing else None
+
+    def find_all(self, target_key: str) -> list[dict[str, Any]]:
+        """
+        Returns:
+            list: Every dictionary containing target_key, in document order
+        """
+        return list(self._index.get(target_key, ()))
+
+    def __contains__(self, target_key: str) -> bool:
+        return target_key in self._index
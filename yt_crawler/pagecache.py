@@ -0,0 +1,130 @@
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qs
+from .page import YoutubePage
+from .config import PAGE_CACHE_MAX_BYTES, PAGE_CACHE_TTL
+
+
+def video_id_for_url(url: str) -> str | None:
+    """
+    Returns:
+        str: The video ID of a /watch?v= URL, or None for any other URL
+    """
+    parts = urlsplit(url)
+    if parts.path != '/watch':
+        return None
+    return parse_qs(parts.query).get('v', [None])[0]
+
+
+class PageCache:
+    """
+    In-process TTL/LRU cache of parsed watch pages, keyed by video ID.
+
+    get_video_details, get_video_transcript, get_video_comments and
+    get_video_comment_threads all read the same watch page, so a full pull of
+    one video downloads and parses it once. Details and transcripts only need
+    the player response at the start of the page (see
+    utils.extract_youtube_player_response) and can be served from either a
+    partial or a full page; comments need the full page.
+
+    Entries expire ttl seconds after they were stored, and the least recently
+    used pages are evicted once the cached HTML exceeds max_bytes. Cached pages
+    are shared between callers and must be treated as read-only.
+
+    Thread-safe; the same cache can be shared by several clients.
+    """
+
+    def __init__(self, max_bytes: int = PAGE_CACHE_MAX_BYTES, ttl: float = PAGE_CACHE_TTL):
+        """
+        Args:
+            max_bytes (int): Budget for the HTML size of the cached pages. 0 disables the cache.
+            ttl (float): Seconds a page is served from the cache
+        """
+        if max_bytes < 0 or ttl < 0:
+            raise ValueError("max_bytes and ttl must not be negative")
+
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # video ID -> (expiry time, page), least recently used first
+        self._pages: OrderedDict[str, tuple[float, YoutubePage]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, video_id: str, partial_ok: bool = True) -> YoutubePage | None:
+        """
+        Args:
+            video_id (str): YouTube video ID
+            partial_ok (bool): Accept a page that was only downloaded up to its player response
+
+        Returns:
+            YoutubePage: The cached page, or None on a miss
+        """
+        with self._lock:
+            entry = self._pages.get(video_id)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._remove(video_id)
+                entry = None
+
+            if entry is None or (entry[1].partial and not partial_ok):
+                self.misses += 1
+                return None
+
+            self._pages.move_to_end(video_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, video_id: str, page: list) -> None:
+        """
+        Store a parsed watch page. A full page is never replaced by a partial one,
+        and pages without decoded blobs or larger than the budget are not stored.
+
+        Args:
+            video_id (str): YouTube video ID
+            page (list): Page returned by utils.parse_youtube_page_scripts
+        """
+        if not isinstance(page, YoutubePage) or page.size > self.max_bytes:
+            return
+
+        with self._lock:
+            entry = self._pages.get(video_id)
+            if entry is not None:
+                if page.partial and not entry[1].partial and entry[0] > time.monotonic():
+                    return
+                self._remove(video_id)
+
+            self._pages[video_id] = (time.monotonic() + self.ttl, page)
+            self._bytes += page.size
+
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._pages))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, video_id: str) -> None:
+        _, page = self._pages.pop(video_id)
+        self._bytes -= page.size
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns:
+            dict: 'hits', 'misses', 'evictions', number of cached 'pages' and their total 'bytes'
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'pages': len(self._pages), 'bytes': self._bytes}
+
+    def clear(self) -> None:
+        """Drop every cached page and reset the counters"""
+        with self._lock:
+            self._pages.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._pages)
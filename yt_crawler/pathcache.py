@@ -0,0 +1,141 @@
+import threading
+from itertools import islice
+from typing import Any, Callable, Iterator
+
+
+Path = tuple[str | int, ...]
+
+
+def follow_path(obj: Any, path: Path) -> Any:
+    """
+    Follow a path of dict keys and list indices from obj.
+
+    Returns:
+        The value at the end of the path, or None if the path does not exist in obj
+    """
+    node = obj
+    try:
+        for step in path:
+            node = node[step]
+    except (KeyError, IndexError, TypeError):
+        return None
+    return node
+
+
+class PathCache:
+    """
+    Remembers where a key was last found in each kind of YouTube document.
+
+    Nearly every watch page, search page or innertube response of one kind has
+    the same shape, so the dictionary containing e.g. 'mutations' is almost
+    always at the same path. Lookups try that path first, which costs a few
+    dict accesses, and fall back to a full search when YouTube's layout
+    changes, re-learning the new path.
+
+    Only keys found once in a document are learned: for keys that occur
+    several times a learned path could lead to a later occurrence than the
+    first one a full search returns, so they are always searched.
+
+    Thread-safe; one cache is shared by all clients (see PATH_CACHE).
+    """
+
+    def __init__(self):
+        # None marks keys found more than once in documents of the page type
+        self._paths: dict[tuple[str, str], Path | None] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def follow(self, obj: Any, target_key: str, page_type: str) -> dict[str, Any] | None:
+        """
+        Try the learned path of target_key in documents of page_type.
+
+        Args:
+            obj: Parsed document
+            target_key (str): The key to look up
+            page_type (str): Kind of document, e.g. 'watch' or 'next'
+
+        Returns:
+            dict: The dictionary containing target_key, or None on a miss
+        """
+        path = self._paths.get((page_type, target_key))
+        node = follow_path(obj, path) if path is not None else None
+        found = isinstance(node, dict) and target_key in node
+
+        with self._lock:
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        return node if found else None
+
+    def learnable(self, target_key: str, page_type: str) -> bool:
+        """
+        Returns:
+            bool: False if target_key was found more than once in a document of page_type,
+                  so full searches need not look for a second occurrence
+        """
+        key = (page_type, target_key)
+        return key not in self._paths or self._paths[key] is not None
+
+    def learn(self, target_key: str, page_type: str, path: Path | None) -> None:
+        """
+        Record the path where target_key was found in a document of page_type.
+
+        Args:
+            path (tuple): Path of the only dictionary containing target_key, or None if
+                          several dictionaries contain it, so the key is never followed
+        """
+        with self._lock:
+            self._paths[(page_type, target_key)] = path
+
+    def find(self, obj: Any, target_key: str, page_type: str,
+             search: Callable[[Any, str], Iterator[tuple[dict[str, Any], Path]]]) -> dict[str, Any] | None:
+        """
+        Look up target_key, trying the learned path before a full search.
+
+        Args:
+            obj: Parsed document
+            target_key (str): The key to look up
+            page_type (str): Kind of document, e.g. 'watch' or 'next'
+            search (callable): Full search yielding (containing dict, path) in document order
+
+        Returns:
+            dict: The first dictionary containing target_key, or None if not found
+        """
+        result = self.follow(obj, target_key, page_type)
+        if result is not None:
+            return result
+
+        if not self.learnable(target_key, page_type):
+            first = next(search(obj, target_key), None)
+            return first[0] if first is not None else None
+
+        # Look for a second occurrence to know whether the path can be learned
+        found = list(islice(search(obj, target_key), 2))
+        if not found:
+            return None
+
+        self.learn(target_key, page_type, found[0][1] if len(found) == 1 else None)
+        return found[0][0]
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns:
+            dict: 'hits', 'misses' and the number of learned 'paths'
+        """
+        with self._lock:
+            paths = sum(path is not None for path in self._paths.values())
+            return {'hits': self.hits, 'misses': self.misses, 'paths': paths}
+
+    def clear(self) -> None:
+        """Forget all learned paths and reset the counters"""
+        with self._lock:
+            self._paths.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Shared by every client: document layouts do not depend on the client
+PATH_CACHE = PathCache()
@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from .config import RATE_LIMITS, RATE_LIMIT_DECREASE_FACTOR, RATE_LIMIT_INCREASE_STEP, RATE_LIMIT_MIN_RATE
+
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a Retry-After header value into seconds.
+    
+    Args:
+        value (str): Header value, either delta-seconds or an HTTP date
+        
+    Returns:
+        float or None: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Token bucket whose refill rate adapts to throttling (additive increase, multiplicative decrease).
+    
+    Not thread-safe on its own; RateLimiter serialises access.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def reserve(self, now: float) -> float:
+        """Take one token and return how many seconds the caller must wait before using it"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+    def throttled(self, now: float, retry_after: float | None) -> None:
+        """Slow down after a 429/503 response"""
+        self.rate = max(RATE_LIMIT_MIN_RATE, self.rate * RATE_LIMIT_DECREASE_FACTOR)
+        self.tokens = min(self.tokens, 0.0)
+        if retry_after is not None:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def succeeded(self) -> None:
+        """Speed back up towards the configured rate after a successful response"""
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + RATE_LIMIT_INCREASE_STEP)
+
+
+class RateLimiter:
+    """
+    Shared, thread-safe rate limiter with a token bucket per endpoint.
+    
+    Every outgoing request calls acquire (or acquire_async) before it is sent
+    and record once the response arrives. A 429 or 503 halves that endpoint's
+    rate and honours Retry-After; each success adds a little rate back until
+    the configured budget is reached again.
+    """
+
+    def __init__(self, limits: dict[str, tuple[float, int]] | None = None):
+        """
+        Args:
+            limits (dict, optional): Endpoint name -> (requests per second, burst size).
+                                     Missing endpoints fall back to config.RATE_LIMITS.
+        """
+        self.limits = {**RATE_LIMITS, **(limits or {})}
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, endpoint: str) -> TokenBucket:
+        bucket = self._buckets.get(endpoint)
+        if bucket is None:
+            rate, burst = self.limits.get(endpoint, self.limits['default'])
+            bucket = self._buckets[endpoint] = TokenBucket(rate, burst)
+        return bucket
+
+    def reserve(self, endpoint: str) -> float:
+        """
+        Reserve a request slot for an endpoint without blocking.
+        
+        Returns:
+            float: Seconds to wait before sending the request
+        """
+        with self._lock:
+            return self._bucket(endpoint).reserve(time.monotonic())
+
+    def acquire(self, endpoint: str) -> None:
+        """Block until a request to the endpoint may be sent"""
+        wait = self.reserve(endpoint)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, endpoint: str) -> None:
+        """Wait, without blocking the event loop, until a request to the endpoint may be sent"""
+        wait = self.reserve(endpoint)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def record(self, endpoint: str, status_code: int, retry_after: str | None = None) -> None:
+        """
+        Feed a response status back into the endpoint's bucket.
+        
+        Args:
+            endpoint (str): Endpoint the request was sent to
+            status_code (int): HTTP status of the response
+            retry_after (str, optional): Value of the Retry-After response header
+        """
+        with self._lock:
+            bucket = self._bucket(endpoint)
+            if status_code in THROTTLE_STATUS_CODES:
+                bucket.throttled(time.monotonic(), parse_retry_after(retry_after))
+            elif status_code < 400:
+                bucket.succeeded()
+
+    def current_rate(self, endpoint: str) -> float:
+        """Current allowed requests per second for an endpoint"""
+        with self._lock:
+            return self._bucket(endpoint).rate
@@ -0,0 +1,274 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Mapping
+from urllib.parse import urlencode
+from .config import RESPONSE_CACHE_TTLS
+
+
+# Response headers that no longer describe the stored body: it is stored
+# decoded, so its encoding and length differ from what was sent on the wire
+_DROPPED_HEADERS = frozenset(('content-encoding', 'content-length', 'transfer-encoding', 'connection'))
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+)
+'''
+
+
+class CachedResponse:
+    """A response read from the ResponseCache"""
+
+    def __init__(self, url: str, status: int, headers: dict[str, str], body: bytes,
+                 etag: str | None, last_modified: str | None, expires_at: float):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the response can be served without contacting YouTube"""
+        return self.expires_at > time.time()
+
+    def validators(self) -> dict[str, str]:
+        """
+        Returns:
+            dict: If-None-Match / If-Modified-Since headers revalidating the stored response
+        """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Disk cache of raw HTTP responses in a SQLite database, used by the transport.
+
+    Responses are keyed by method and URL, plus the request body for innertube
+    POSTs, and kept for a per-endpoint TTL (see config.RESPONSE_CACHE_TTLS):
+    watch pages and caption tracks for days, news feeds for minutes. Endpoints
+    with a TTL of 0 are never cached. Fresh responses are served without
+    touching the network, rate limiter or circuit breaker, so a restarted crawl
+    does not download again the pages it already has. Expired responses that
+    carried an ETag or Last-Modified header are revalidated with a conditional
+    request, and a 304 answer extends their life without a download.
+
+    The database uses write-ahead logging, so several processes crawling in
+    parallel can share one cache file. Each thread gets its own connection.
+    """
+
+    def __init__(self, path: str, ttls: Mapping[str, float] | None = None):
+        """
+        Args:
+            path (str): SQLite database file, created if missing
+            ttls (dict, optional): Per-endpoint TTLs in seconds overriding config.RESPONSE_CACHE_TTLS
+        """
+        self.path = path
+        self.ttls = dict(RESPONSE_CACHE_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stores = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(_SCHEMA)
+        connection.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            # Waits up to 30 s for a lock held by another process or thread
+            connection = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def ttl_for(self, endpoint: str) -> float:
+        """
+        Args:
+            endpoint (str): Endpoint name, see transport.endpoint_for_url
+
+        Returns:
+            float: Seconds responses of the endpoint are kept, 0 if they are not cached
+        """
+        return self.ttls.get(endpoint, self.ttls.get('default', 0))
+
+    @staticmethod
+    def key(method: str, url: str, body: bytes | str | None = None) -> str:
+        """
+        Args:
+            method (str): HTTP method
+            url (str): Full request URL, including the query string
+            body (bytes, optional): Request body, e.g. the JSON payload of an innertube POST
+
+        Returns:
+            str: Cache key of the request
+        """
+        key = f"{method.upper()} {url}"
+        if body:
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+            key += ' ' + hashlib.sha256(body).hexdigest()
+        return key
+
+    @staticmethod
+    def request_key(method: str, url: str, options: Mapping[str, Any]) -> str:
+        """
+        Cache key of a request, built from the arguments it is sent with.
+
+        The key does not depend on how requests or httpx encode the URL and
+        body, so YoutubeAPI and AsyncYoutubeAPI clients sharing a cache file
+        find each other's responses.
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            options (dict): Keyword arguments of the request; params, data, json and content are used
+
+        Returns:
+            str: Cache key of the request, see ResponseCache.key
+        """
+        params = options.get('params')
+        if params:
+            url += ('&' if '?' in url else '?') + urlencode(params, doseq=True)
+
+        body = options.get('content') or options.get('data')
+        if isinstance(body, Mapping):
+            body = urlencode(body, doseq=True)
+        if options.get('json') is not None:
+            body = json.dumps(options['json'], separators=(',', ':'), sort_keys=True)
+        return ResponseCache.key(method, url, body)
+
+    def get(self, key: str) -> CachedResponse | None:
+        """
+        Look up a stored response, fresh or expired. Counts a hit for fresh responses.
+
+        Returns:
+            CachedResponse: The stored response, or None if the request was never stored
+        """
+        row = self._connection().execute(
+            'SELECT url, status, headers, body, etag, last_modified, expires_at FROM responses WHERE key = ?',
+            (key,)).fetchone()
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        url, status, headers, body, etag, last_modified, expires_at = row
+        cached = CachedResponse(url, status, json.loads(headers), bytes(body), etag, last_modified, expires_at)
+        with self._lock:
+            if cached.fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return cached
+
+    def put(self, key: str, url: str, endpoint: str, status: int, headers: Mapping[str, str], body: bytes) -> None:
+        """
+        Store a response for the TTL of its endpoint.
+
+        Args:
+            key (str): Cache key, see ResponseCache.key
+            url (str): Request URL
+            endpoint (str): Endpoint name, see transport.endpoint_for_url
+            status (int): Response status code
+            headers (dict): Response headers
+            body (bytes): Decoded response body
+        """
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0:
+            return
+
+        kept_headers = {name: value for name, value in headers.items() if name.lower() not in _DROPPED_HEADERS}
+        now = time.time()
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO responses (key, url, status, headers, body, etag, last_modified, stored_at, expires_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, url, status, json.dumps(kept_headers), sqlite3.Binary(body), headers.get('ETag'),
+                 headers.get('Last-Modified'), now, now + ttl))
+        with self._lock:
+            self.stores += 1
+
+    def refresh(self, key: str, endpoint: str) -> None:
+        """Extend the life of a stored response after YouTube answered 304 Not Modified"""
+        connection = self._connection()
+        with connection:
+            connection.execute('UPDATE responses SET expires_at = ? WHERE key = ?',
+                               (time.time() + self.ttl_for(endpoint), key))
+        with self._lock:
+            self.revalidated += 1
+
+    def purge(self) -> int:
+        """
+        Delete expired responses that cannot be revalidated (no ETag or Last-Modified).
+
+        Returns:
+            int: Number of deleted responses
+        """
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute(
+                'DELETE FROM responses WHERE expires_at <= ? AND etag IS NULL AND last_modified IS NULL',
+                (time.time(),))
+        return cursor.rowcount
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns:
+            dict: 'hits', 'misses', 'revalidated' and 'stores' counters of this process,
+                  and the number of stored 'responses'
+        """
+        (count,) = self._connection().execute('SELECT COUNT(*) FROM responses').fetchone()
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'revalidated': self.revalidated,
+                    'stores': self.stores, 'responses': count}
+
+    def clear(self) -> None:
+        """Delete every stored response and reset the counters"""
+        connection = self._connection()
+        with connection:
+            connection.execute('DELETE FROM responses')
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.revalidated = 0
+            self.stores = 0
+
+    def close(self) -> None:
+        """Close the database connections of every thread"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
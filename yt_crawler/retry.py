@@ -0,0 +1,158 @@
+import random
+import threading
+import time
+from .config import (RETRY_MAX_ATTEMPTS, RETRY_BACKOFF_BASE, RETRY_BACKOFF_MAX, RETRY_STATUS_CODES,
+                     CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RECOVERY_TIMEOUT)
+from .exceptions import CircuitOpenError
+
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Innertube endpoints that only read data; POSTing the same continuation twice is harmless
+IDEMPOTENT_POST_ENDPOINTS = ('next', 'search')
+
+# Statuses meaning the server did not process the request, safe to retry for any method
+NOT_PROCESSED_STATUS_CODES = (429, 503)
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request is retried and how long to back off.
+    
+    Idempotent requests (page GETs and innertube read POSTs such as
+    /youtubei/v1/next) are retried on connection errors and on any status in
+    retry_statuses. Other requests are only retried when they certainly were
+    not processed: the connection could not be opened, or the server answered
+    429/503.
+    """
+
+    def __init__(self, max_attempts: int = RETRY_MAX_ATTEMPTS, backoff_base: float = RETRY_BACKOFF_BASE,
+                 backoff_max: float = RETRY_BACKOFF_MAX, retry_statuses: tuple[int, ...] = RETRY_STATUS_CODES,
+                 idempotent_endpoints: tuple[str, ...] = IDEMPOTENT_POST_ENDPOINTS):
+        """
+        Args:
+            max_attempts (int): Total attempts per request, including the first
+            backoff_base (float): Backoff ceiling in seconds for the first retry, doubled after each attempt
+            backoff_max (float): Upper bound of a single backoff in seconds
+            retry_statuses (tuple): Response statuses that are retried for idempotent requests
+            idempotent_endpoints (tuple): Endpoints whose POSTs are safe to repeat
+        """
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = retry_statuses
+        self.idempotent_endpoints = idempotent_endpoints
+
+    def is_idempotent(self, method: str, endpoint: str) -> bool:
+        return method.upper() in IDEMPOTENT_METHODS or endpoint in self.idempotent_endpoints
+
+    def should_retry(self, method: str, endpoint: str, attempt: int, status_code: int | None = None, request_sent: bool = True) -> bool:
+        """
+        Args:
+            method (str): HTTP method of the request
+            endpoint (str): Endpoint name, see transport.endpoint_for_url
+            attempt (int): Zero-based number of the attempt that just failed
+            status_code (int, optional): Response status, or None if no response was received
+            request_sent (bool): False if the connection failed before the request was sent
+            
+        Returns:
+            bool: True if the request should be sent again
+        """
+        if attempt + 1 >= self.max_attempts:
+            return False
+        if status_code is None:
+            return not request_sent or self.is_idempotent(method, endpoint)
+        if status_code in NOT_PROCESSED_STATUS_CODES:
+            return True
+        return status_code in self.retry_statuses and self.is_idempotent(method, endpoint)
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """
+        Full-jitter exponential backoff: a random delay between 0 and
+        backoff_base * 2**attempt (capped at backoff_max), but never shorter
+        than the server's Retry-After.
+        """
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+    
+    After failure_threshold consecutive failures (connection errors or 5xx)
+    the circuit for the host opens and requests fail fast with
+    CircuitOpenError. Once recovery_timeout has passed a single trial request
+    is let through: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD, recovery_timeout: float = CIRCUIT_RECOVERY_TIMEOUT):
+        """
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit
+            recovery_timeout (float): Seconds the circuit stays open before a trial request
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._failures: dict[str, int] = {}
+        self._opened_at: dict[str, float] = {}
+        self._trial_in_flight: set[str] = set()
+        self._lock = threading.Lock()
+
+    def state(self, host: str) -> str:
+        """Current state for a host: 'closed', 'open' or 'half_open'"""
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return 'closed'
+            if time.monotonic() - opened_at < self.recovery_timeout:
+                return 'open'
+            return 'half_open'
+
+    def before_request(self, host: str) -> bool:
+        """
+        Returns:
+            bool: Whether the request is the trial of a half-open circuit. The caller
+                  must then call release_trial once the request has finished.
+
+        Raises:
+            CircuitOpenError: If the circuit for the host is open, or half-open with a trial already running
+        """
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return False
+            remaining = self.recovery_timeout - (time.monotonic() - opened_at)
+            if remaining > 0 or host in self._trial_in_flight:
+                raise CircuitOpenError(host, max(remaining, 0.0))
+            self._trial_in_flight.add(host)
+            return True
+
+    def release_trial(self, host: str) -> None:
+        """
+        Count a trial request that ended without a recorded outcome as failed.
+
+        Called in a finally block around the trial, so a trial interrupted by an
+        unexpected exception (an invalid URL, a cancelled task, KeyboardInterrupt)
+        opens the circuit again instead of blocking every later request.
+        """
+        with self._lock:
+            if host not in self._trial_in_flight:
+                return
+            self._trial_in_flight.discard(host)
+            self._failures[host] = self._failures.get(host, 0) + 1
+            self._opened_at[host] = time.monotonic()
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._failures[host] = 0
+            self._opened_at.pop(host, None)
+            self._trial_in_flight.discard(host)
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if host in self._trial_in_flight or self._failures[host] >= self.failure_threshold:
+                self._opened_at[host] = time.monotonic()
+            self._trial_in_flight.discard(host)
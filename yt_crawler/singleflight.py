@@ -0,0 +1,100 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one execution.
+    
+    While a call for a key is running, other threads calling do() with the
+    same key wait for it and receive the same result (or exception) instead
+    of running the function again. Nothing is cached once the call finishes.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any], covered_by: tuple[Hashable, ...] = ()) -> Any:
+        """
+        Args:
+            key: Identifies the work, e.g. the page URL
+            fn: Zero-argument callable doing the work
+            covered_by (tuple): Keys of other work whose result serves this call as well,
+                                e.g. a full page download for a call needing only its start.
+                                A running call for one of them is joined instead of running fn.
+            
+        Returns:
+            The result of fn, shared by every concurrent caller with the same key
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = next((self._calls[other] for other in covered_by if other in self._calls), None)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """
+    Asyncio version of SingleFlight for coroutine functions.
+
+    The function runs in its own task, which every caller awaits through
+    asyncio.shield, so cancelling any caller (the first one included) does
+    not cancel the shared call or the other callers.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]], covered_by: tuple[Hashable, ...] = ()) -> Any:
+        """
+        Args:
+            key: Identifies the work, e.g. the page URL
+            fn: Zero-argument coroutine function doing the work
+            covered_by (tuple): Keys of other work whose result serves this call as well,
+                                see SingleFlight.do
+            
+        Returns:
+            The result of fn, shared by every concurrent caller with the same key
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = next((self._calls[other] for other in covered_by if other in self._calls), None)
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,107 @@
+import json
+import os
+import tempfile
+import threading
+
+
+def search_filters_key(active_filters: dict[str, str]) -> str:
+    """
+    Returns:
+        str: Canonical key of a filter combination, independent of the search term
+             and of the order the filters were given in
+    """
+    return '&'.join(f"{name}={value}" for name, value in sorted(active_filters.items()))
+
+
+class SearchParamCache:
+    """
+    Remembers the sp URL parameter YouTube uses for each filter combination.
+
+    The sp value found by following the filter links of a results page does not
+    depend on the search term, so once a combination such as
+    upload_date=this_week&sort_by=view_count has been resolved it is applied to
+    every later query without loading any results page. Entries are dropped
+    when a search with a remembered value fails, so the next search resolves
+    it again.
+
+    With a path, the cache is stored as a JSON file and survives restarts; the
+    file is rewritten atomically after every change. Thread-safe.
+    """
+
+    def __init__(self, path: str | None = None):
+        """
+        Args:
+            path (str, optional): JSON file to load the cache from and save it to.
+                                  By default the cache only lives in memory.
+        """
+        self.path = path
+        self._params: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if path is not None and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self._params = json.load(f)
+
+    def get(self, active_filters: dict[str, str]) -> str | None:
+        """
+        Args:
+            active_filters (dict): Filter name -> option, see youtube_search._get_active_search_filters
+
+        Returns:
+            str: The remembered sp value (not URL-encoded), or None
+        """
+        with self._lock:
+            sp = self._params.get(search_filters_key(active_filters))
+            if sp is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return sp
+
+    def put(self, active_filters: dict[str, str], sp: str) -> None:
+        """Remember the sp value of a filter combination"""
+        with self._lock:
+            self._params[search_filters_key(active_filters)] = sp
+            self._save()
+
+    def invalidate(self, active_filters: dict[str, str]) -> bool:
+        """
+        Forget the sp value of a filter combination, e.g. after a search using it failed.
+
+        Returns:
+            bool: Whether a value was remembered
+        """
+        with self._lock:
+            removed = self._params.pop(search_filters_key(active_filters), None) is not None
+            if removed:
+                self._save()
+            return removed
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first so a crash never leaves a truncated cache
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self._params, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns:
+            dict: 'hits', 'misses' and the number of remembered 'params'
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'params': len(self._params)}
+
+    def clear(self) -> None:
+        """Forget every value and reset the counters"""
+        with self._lock:
+            self._params.clear()
+            self.hits = 0
+            self.misses = 0
+            self._save()
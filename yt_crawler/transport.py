@@ -0,0 +1,485 @@
+import asyncio
+import os
+import ssl
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter, BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, select_proxy, DEFAULT_CA_BUNDLE_PATH
+from urllib3.exceptions import NewConnectionError
+from urllib.parse import urlsplit
+from .ratelimit import RateLimiter, parse_retry_after
+from .retry import RetryPolicy, CircuitBreaker
+from .responsecache import ResponseCache, CachedResponse
+from .config import (POOL_CONNECTIONS, POOL_MAXSIZE, ASYNC_MAX_CONNECTIONS,
+                     ASYNC_MAX_KEEPALIVE_CONNECTIONS, ASYNC_KEEPALIVE_EXPIRY, CONNECT_TIMEOUT, READ_TIMEOUT)
+from typing import Any
+
+
+def endpoint_for_url(url: str) -> str:
+    """
+    Classify a request URL into the endpoint name used for rate limit budgets.
+    
+    Args:
+        url (str): Request URL
+        
+    Returns:
+        str: One of 'watch', 'results', 'playlist', 'feed', 'search', 'next', 'captions' or 'default'
+    """
+    path = urlsplit(url).path
+    if path == '/watch':
+        return 'watch'
+    if path == '/results':
+        return 'results'
+    if path == '/playlist':
+        return 'playlist'
+    if path.startswith('/feed/'):
+        return 'feed'
+    if path == '/youtubei/v1/search':
+        return 'search'
+    if path == '/youtubei/v1/next':
+        return 'next'
+    if path == '/api/timedtext':
+        return 'captions'
+    return 'default'
+
+
+def _is_failure(status_code: int) -> bool:
+    """Whether a response status counts against the circuit breaker"""
+    return status_code >= 500
+
+
+def _cached_requests_response(cached: CachedResponse, request: requests.PreparedRequest) -> requests.Response:
+    """Build a requests response from a ResponseCache entry"""
+    response = requests.Response()
+    response.status_code = cached.status
+    response.headers = CaseInsensitiveDict(cached.headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.reason = 'OK'
+    response.url = cached.url
+    response.request = request
+    # The body is already in memory, so iter_content and .text read it from there
+    response._content = cached.body
+    response._content_consumed = True
+    return response
+
+
+def _request_not_sent(exc: Exception) -> bool:
+    """Whether a requests exception happened before the request reached the server"""
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(exc.args[0], 'reason', exc.args[0]) if exc.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _ssl_context(verify: bool | str, cert: str | tuple[str, str] | None) -> ssl.SSLContext | bool:
+    """
+    Build the SSL context of an httpx client from requests' verify and cert arguments.
+    
+    Args:
+        verify (bool or str): Whether to verify the server certificate, or a CA bundle file or directory
+        cert (str or tuple, optional): Client certificate file, or a (certificate, key) pair
+    """
+    if verify is False and not cert:
+        return False
+
+    if isinstance(verify, str):
+        context = ssl.create_default_context(**({'capath': verify} if os.path.isdir(verify) else {'cafile': verify}))
+    else:
+        context = ssl.create_default_context(cafile=DEFAULT_CA_BUNDLE_PATH)
+    if verify is False:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    if cert:
+        certfile, keyfile = cert if isinstance(cert, tuple) else (cert, None)
+        context.load_cert_chain(certfile, keyfile)
+    return context
+
+
+class _HttpxRawStream:
+    """File-like wrapper letting requests read an httpx streaming response body"""
+
+    def __init__(self, response: Any):
+        self._response = response
+        self._chunks = response.iter_bytes()
+        self._buffer = b''
+
+    def read(self, amt: int | None = None, **kwargs: Any) -> bytes:
+        while amt is None or len(self._buffer) < amt:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if amt is None:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+        return data
+
+    def close(self) -> None:
+        self._response.close()
+
+    def release_conn(self) -> None:
+        self._response.close()
+
+
+class Http2Adapter(BaseAdapter):
+    """
+    requests transport adapter that sends requests over HTTP/2 using httpx.
+    
+    Mounted on a YoutubeSession, it lets page GETs and innertube continuation
+    POSTs from many threads share a few multiplexed connections instead of
+    holding one HTTP/1.1 socket per in-flight request. Rate limiting, retries
+    and timeouts in YoutubeSession keep working unchanged.
+    
+    httpx sets TLS verification, client certificates and proxies per client, so
+    requests using other verify, cert or proxies settings than the defaults get
+    an httpx client of their own.
+    """
+
+    def __init__(self, max_connections: int = POOL_MAXSIZE, max_keepalive_connections: int = POOL_MAXSIZE):
+        """
+        Args:
+            max_connections (int): Maximum number of connections (each carries many streams)
+            max_keepalive_connections (int): Maximum number of idle connections kept open
+        """
+        super().__init__()
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("HTTP/2 support requires httpx with h2. Install it with 'pip install httpx[http2]'")
+
+        self._httpx = httpx
+        self._limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+        # Client for requests with verify=True, no client certificate and no proxy
+        self.client = httpx.Client(http2=True, limits=self._limits, trust_env=False)
+        self._clients: dict[tuple[Any, Any, str | None], Any] = {}
+        self._lock = threading.Lock()
+
+    def _timeout(self, timeout: Any) -> Any:
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+            return self._httpx.Timeout(read_timeout, connect=connect_timeout)
+        return self._httpx.Timeout(timeout)
+
+    def _client_for(self, verify: Any, cert: Any, proxy: str | None) -> Any:
+        """httpx client applying the verify, cert and proxy settings of a request"""
+        if verify is True and not cert and not proxy:
+            return self.client
+
+        if isinstance(cert, list):
+            cert = tuple(cert)
+        key = (verify, cert, proxy)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = self._httpx.Client(http2=True, limits=self._limits, trust_env=False,
+                                                                 verify=_ssl_context(verify, cert), proxy=proxy)
+        return client
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, timeout: Any = None,
+             verify: Any = True, cert: Any = None, proxies: Any = None) -> requests.Response:
+        """
+        Send a prepared request over HTTP/2. verify, cert and proxies have the
+        same meaning as for requests' HTTPAdapter.
+        """
+        client = self._client_for(verify, cert, select_proxy(request.url, proxies or {}))
+        httpx = self._httpx
+        httpx_request = client.build_request(request.method, request.url, headers=dict(request.headers),
+                                             content=request.body, timeout=self._timeout(timeout))
+        try:
+            httpx_response = client.send(httpx_request, stream=True)
+        except httpx.ConnectTimeout as e:
+            raise requests.exceptions.ConnectTimeout(e, request=request) from e
+        except httpx.ConnectError as e:
+            raise requests.ConnectionError(NewConnectionError(None, str(e)), request=request) from e
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.ReadTimeout(e, request=request) from e
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=request) from e
+
+        response = requests.Response()
+        response.status_code = httpx_response.status_code
+        response.headers = CaseInsensitiveDict(httpx_response.headers.multi_items())
+        # httpx already decodes the body, so it must not be decoded again
+        response.headers.pop('Content-Encoding', None)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = httpx_response.reason_phrase
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.raw = _HttpxRawStream(httpx_response)
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in [self.client, *clients]:
+            client.close()
+
+
+class YoutubeSession(requests.Session):
+    """
+    Pooled keep-alive HTTP session shared by every YoutubeAPI mixin.
+
+    Reusing one session means consecutive page loads and continuation POSTs
+    go over already-open TCP/TLS connections instead of opening a new one
+    for each request.
+    """
+
+    def __init__(self, pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE,
+                 pool_block: bool = False, keep_alive: bool = True, rate_limiter: RateLimiter | None = None,
+                 retry_policy: RetryPolicy | None = None, circuit_breaker: CircuitBreaker | None = None,
+                 timeout: tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT), http2: bool = False,
+                 response_cache: ResponseCache | None = None):
+        """
+        Args:
+            pool_connections (int): Number of per-host connection pools to keep
+            pool_maxsize (int): Maximum number of connections kept open per host
+            pool_block (bool): If True, wait for a free connection when a host's pool is
+                               exhausted instead of opening an extra, non-pooled one
+            keep_alive (bool): If False, ask the server to close each connection after use
+            rate_limiter (RateLimiter, optional): Limiter every request passes through
+            retry_policy (RetryPolicy, optional): Retries transient failures with backoff
+            circuit_breaker (CircuitBreaker, optional): Fails fast while a host is unhealthy
+            timeout (tuple): (connect, read) timeout in seconds applied to every request
+                             that does not set its own
+            http2 (bool): Send HTTPS requests over multiplexed HTTP/2 connections (needs httpx[http2])
+            response_cache (ResponseCache, optional): Disk cache serving repeated requests
+                                                      without a download
+        """
+        super().__init__()
+        self.timeout = timeout
+        self.response_cache = response_cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.mount('https://', Http2Adapter(max_connections=pool_maxsize) if http2 else adapter)
+        self.mount('http://', adapter)
+
+        if not keep_alive:
+            self.headers['Connection'] = 'close'
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> requests.Response:
+        """
+        Send a request through the response cache, rate limiter, circuit breaker and retry policy.
+        
+        Returns the last response once retries are exhausted, so callers keep
+        handling error statuses themselves. Connection errors are re-raised.
+        
+        Raises:
+            CircuitOpenError: If the circuit breaker for the host is open
+        """
+        cache = self.response_cache
+        endpoint = endpoint_for_url(url)
+        if cache is None or args or cache.ttl_for(endpoint) <= 0:
+            return self._send(method, url, *args, **kwargs)
+
+        key = cache.request_key(method, url, kwargs)
+        prepared = requests.Request(method, url, params=kwargs.get('params'), data=kwargs.get('data'),
+                                    json=kwargs.get('json')).prepare()
+        cached = cache.get(key)
+        if cached is not None and cached.fresh:
+            return _cached_requests_response(cached, prepared)
+
+        if cached is not None:
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), **cached.validators()}
+        # Cached responses are stored whole, so streamed requests are read in full
+        kwargs['stream'] = False
+        response = self._send(method, url, **kwargs)
+
+        if response.status_code == 304 and cached is not None:
+            cache.refresh(key, endpoint)
+            return _cached_requests_response(cached, prepared)
+        if response.status_code == 200:
+            cache.put(key, response.url, endpoint, response.status_code, response.headers, response.content)
+        return response
+
+    def _send(self, method: str, url: str, *args: Any, **kwargs: Any) -> requests.Response:
+        """Send a request through the rate limiter, circuit breaker and retry policy"""
+        kwargs.setdefault('timeout', self.timeout)
+        endpoint = endpoint_for_url(url)
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            trial = self.circuit_breaker is not None and self.circuit_breaker.before_request(host)
+            try:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire(endpoint)
+
+                try:
+                    response = super().request(method, url, *args, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    if self.circuit_breaker is not None:
+                        self.circuit_breaker.record_failure(host)
+                    if self.retry_policy is None or not self.retry_policy.should_retry(method, endpoint, attempt, request_sent=not _request_not_sent(e)):
+                        raise
+                    time.sleep(self.retry_policy.backoff(attempt))
+                    attempt += 1
+                    continue
+
+                retry_after = response.headers.get('Retry-After')
+                if self.rate_limiter is not None:
+                    self.rate_limiter.record(endpoint, response.status_code, retry_after)
+                if self.circuit_breaker is not None:
+                    if _is_failure(response.status_code):
+                        self.circuit_breaker.record_failure(host)
+                    else:
+                        self.circuit_breaker.record_success(host)
+
+                if self.retry_policy is None or not self.retry_policy.should_retry(method, endpoint, attempt, status_code=response.status_code):
+                    return response
+                response.close()
+                time.sleep(self.retry_policy.backoff(attempt, parse_retry_after(retry_after)))
+                attempt += 1
+            finally:
+                if trial:
+                    self.circuit_breaker.release_trial(host)
+
+
+class AsyncYoutubeSession:
+    """
+    Async HTTP session used by AsyncYoutubeAPI, backed by an httpx.AsyncClient.
+
+    Mirrors the small part of the requests.Session interface the mixins rely on
+    (get, post and request returning a response with status_code, text, json()
+    and raise_for_status()).
+    """
+
+    def __init__(self, max_connections: int = ASYNC_MAX_CONNECTIONS,
+                 max_keepalive_connections: int = ASYNC_MAX_KEEPALIVE_CONNECTIONS,
+                 keepalive_expiry: float = ASYNC_KEEPALIVE_EXPIRY, rate_limiter: RateLimiter | None = None,
+                 retry_policy: RetryPolicy | None = None, circuit_breaker: CircuitBreaker | None = None,
+                 timeout: tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT), http2: bool = False,
+                 response_cache: ResponseCache | None = None):
+        """
+        Args:
+            max_connections (int): Maximum number of concurrent connections
+            max_keepalive_connections (int): Maximum number of idle connections kept open
+            keepalive_expiry (float): Seconds an idle connection is kept before closing
+            rate_limiter (RateLimiter, optional): Limiter every request passes through
+            retry_policy (RetryPolicy, optional): Retries transient failures with backoff
+            circuit_breaker (CircuitBreaker, optional): Fails fast while a host is unhealthy
+            timeout (tuple): (connect, read) timeout in seconds applied to every request
+            http2 (bool): Multiplex requests over HTTP/2 connections (needs httpx[http2])
+            response_cache (ResponseCache, optional): Disk cache serving repeated requests
+                                                      without a download
+        """
+        self.response_cache = response_cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.timeout = timeout
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("AsyncYoutubeAPI requires httpx. Install it with 'pip install httpx'")
+
+        limits = httpx.Limits(max_connections=max_connections,
+                              max_keepalive_connections=max_keepalive_connections,
+                              keepalive_expiry=keepalive_expiry)
+        connect_timeout, read_timeout = timeout
+        self.client = httpx.AsyncClient(limits=limits, follow_redirects=True, http2=http2,
+                                        timeout=httpx.Timeout(read_timeout, connect=connect_timeout))
+
+    async def request(self, method: str, url: str, stream: bool = False, **kwargs: Any) -> Any:
+        """
+        Send a request through the response cache, rate limiter, circuit breaker and
+        retry policy. See YoutubeSession.request.
+        
+        With stream=True the body is not read; iterate it with response.aiter_text()
+        and close the response with response.aclose().
+        """
+        import httpx
+
+        cache = self.response_cache
+        endpoint = endpoint_for_url(url)
+        if cache is None or cache.ttl_for(endpoint) <= 0:
+            return await self._send(method, url, stream, **kwargs)
+
+        key = cache.request_key(method, url, kwargs)
+        request = self.client.build_request(method, url, params=kwargs.get('params'), content=kwargs.get('content'),
+                                            data=kwargs.get('data'), json=kwargs.get('json'))
+        # SQLite calls block, so they run in a worker thread instead of the event loop
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None and cached.fresh:
+            return httpx.Response(cached.status, headers=cached.headers, content=cached.body, request=request)
+
+        if cached is not None:
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), **cached.validators()}
+        # Cached responses are stored whole, so streamed requests are read in full
+        response = await self._send(method, url, False, **kwargs)
+
+        if response.status_code == 304 and cached is not None:
+            await asyncio.to_thread(cache.refresh, key, endpoint)
+            return httpx.Response(cached.status, headers=cached.headers, content=cached.body, request=request)
+        if response.status_code == 200:
+            await asyncio.to_thread(cache.put, key, str(response.url), endpoint, response.status_code,
+                                    response.headers, response.content)
+        return response
+
+    async def _send(self, method: str, url: str, stream: bool = False, **kwargs: Any) -> Any:
+        """Send a request through the rate limiter, circuit breaker and retry policy"""
+        import httpx
+
+        if isinstance(kwargs.get('timeout'), tuple):
+            connect_timeout, read_timeout = kwargs['timeout']
+            kwargs['timeout'] = httpx.Timeout(read_timeout, connect=connect_timeout)
+        endpoint = endpoint_for_url(url)
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            trial = self.circuit_breaker is not None and self.circuit_breaker.before_request(host)
+            try:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire_async(endpoint)
+
+                try:
+                    if stream:
+                        response = await self.client.send(self.client.build_request(method, url, **kwargs), stream=True)
+                    else:
+                        response = await self.client.request(method, url, **kwargs)
+                except httpx.TransportError as e:
+                    if self.circuit_breaker is not None:
+                        self.circuit_breaker.record_failure(host)
+                    request_sent = not isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                    if self.retry_policy is None or not self.retry_policy.should_retry(method, endpoint, attempt, request_sent=request_sent):
+                        raise
+                    await asyncio.sleep(self.retry_policy.backoff(attempt))
+                    attempt += 1
+                    continue
+
+                retry_after = response.headers.get('Retry-After')
+                if self.rate_limiter is not None:
+                    self.rate_limiter.record(endpoint, response.status_code, retry_after)
+                if self.circuit_breaker is not None:
+                    if _is_failure(response.status_code):
+                        self.circuit_breaker.record_failure(host)
+                    else:
+                        self.circuit_breaker.record_success(host)
+
+                if self.retry_policy is None or not self.retry_policy.should_retry(method, endpoint, attempt, status_code=response.status_code):
+                    return response
+                await response.aclose()
+                await asyncio.sleep(self.retry_policy.backoff(attempt, parse_retry_after(retry_after)))
+                attempt += 1
+            finally:
+                if trial:
+                    self.circuit_breaker.release_trial(host)
+
+    async def get(self, url: str, **kwargs: Any) -> Any:
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> Any:
+        return await self.request('POST', url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close the underlying client and its connections"""
+        await self.client.aclose()
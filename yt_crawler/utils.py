@@ -2,9 +2,19 @@ from bs4 import BeautifulSoup
 import requests
 import json
 import re
+import html
+from xml.parsers import expat
 import warnings
-from .config import HEADERS
-from typing import Any
+import time
+from .config import HEADERS, CONNECT_TIMEOUT, READ_TIMEOUT, MIN_REQUEST_TIMEOUT, STREAM_CHUNK_SIZE
+from .transport import AsyncYoutubeSession, endpoint_for_url
+from .page import YoutubePage, KeyIndex
+from .json_backend import JsonBackend, DEFAULT_JSON_BACKEND
+from .pathcache import PATH_CACHE, Path
+from .exceptions import ResourceUnavailableError
+from .innertube import InnertubeContext
+from typing import Any, Iterator
+from urllib.parse import urlsplit
 
 def xml_transcript_to_json_bs4(xml_string: str) -> dict[str, Any]:
     """Convert YouTube transcript XML to JSON using BeautifulSoup"""
@@ -28,242 +38,793 @@ def xml_transcript_to_json_bs4(xml_string: str) -> dict[str, Any]:
     return transcript_data
 
 
-def find_nested_key(obj: dict[str, Any] | list[Any] | Any, target_key: str) -> dict[str, Any] | None:
+# Entities found in caption text, decoded with str.replace before falling back
+# to html.unescape. '&amp;' comes last so '&amp;lt;' decodes to '&lt;' only once.
+_CAPTION_ENTITIES = (('&#39;', "'"), ('&quot;', '"'), ('&lt;', '<'), ('&gt;', '>'))
+
+
+def _unescape_caption_text(text: str) -> str:
+    """Decode the HTML entities YouTube leaves in caption text"""
+    if '&' not in text:
+        return text
+    for entity, char in _CAPTION_ENTITIES:
+        text = text.replace(entity, char)
+    if '&' in text.replace('&amp;', ''):
+        return html.unescape(text)
+    return text.replace('&amp;', '&')
+
+
+def _parse_caption_xml(xml_string: str | bytes, start_element: Any, end_element: Any, character_data: Any) -> None:
+    """
+    Stream caption XML through expat with the given handlers.
+    
+    Like the lenient bs4 parser, blank or non-XML bodies (e.g. an error page)
+    produce no segments, and a truncated track keeps the segments closed
+    before the point where it was cut.
+    """
+    if not xml_string or not xml_string.strip():
+        return
+    
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = character_data
+    try:
+        parser.Parse(xml_string, True)
+    except expat.ExpatError:
+        pass
+
+
+def xml_transcript_to_json(xml_string: str | bytes) -> dict[str, Any]:
+    """
+    Convert YouTube transcript XML to JSON with a streaming expat parser.
+    
+    Produces the same structure as xml_transcript_to_json_bs4 without building
+    a document tree: each <text> element is turned into an entry as soon as it
+    is closed. HTML entities left in the text after XML decoding (YouTube
+    escapes them twice, e.g. '&amp;#39;') are unescaped.
+    
+    Args:
+        xml_string (str or bytes): Transcript XML from a caption track baseUrl
+        
+    Returns:
+        dict: {"transcript": [{"start": float, "duration": float, "text": str}, ...]}
+    """
+    transcript: list[dict[str, Any]] = []
+    current: dict[str, Any] | None = None
+    text_parts: list[str] = []
+    
+    def start_element(name: str, attrs: dict[str, str]) -> None:
+        nonlocal current
+        if name == 'text':
+            current = {"start": float(attrs.get('start', 0)), "duration": float(attrs.get('dur', 0))}
+            text_parts.clear()
+    
+    def end_element(name: str) -> None:
+        nonlocal current
+        if name == 'text' and current is not None:
+            current["text"] = _unescape_caption_text(''.join(text_parts))
+            transcript.append(current)
+            current = None
+    
+    def character_data(data: str) -> None:
+        if current is not None:
+            text_parts.append(data)
+    
+    _parse_caption_xml(xml_string, start_element, end_element, character_data)
+    
+    return {"transcript": transcript}
+
+
+def srv3_transcript_to_json(xml_string: str | bytes) -> dict[str, Any]:
+    """
+    Convert a YouTube srv3 caption track (fmt=srv3) to the xml_transcript_to_json structure.
+    
+    srv3 tracks hold one <p t="ms" d="ms"> element per segment, with word-level
+    <s> children. Segments are streamed with expat like xml_transcript_to_json;
+    times are converted to seconds and empty segments are skipped.
+    
+    Args:
+        xml_string (str or bytes): srv3 caption XML
+        
+    Returns:
+        dict: {"transcript": [{"start": float, "duration": float, "text": str}, ...]}
+    """
+    transcript: list[dict[str, Any]] = []
+    current: dict[str, Any] | None = None
+    text_parts: list[str] = []
+    
+    def start_element(name: str, attrs: dict[str, str]) -> None:
+        nonlocal current
+        if name == 'p':
+            current = {"start": int(attrs.get('t', 0)) / 1000, "duration": int(attrs.get('d', 0)) / 1000}
+            text_parts.clear()
+    
+    def end_element(name: str) -> None:
+        nonlocal current
+        if name == 'p' and current is not None:
+            text = ''.join(text_parts)
+            if text.strip():
+                current["text"] = text
+                transcript.append(current)
+            current = None
+    
+    def character_data(data: str) -> None:
+        if current is not None:
+            text_parts.append(data)
+    
+    _parse_caption_xml(xml_string, start_element, end_element, character_data)
+    
+    return {"transcript": transcript}
+
+
+def json3_transcript_to_json(data: dict[str, Any]) -> dict[str, Any]:
+    """
+    Convert a decoded YouTube json3 caption track (fmt=json3) to the xml_transcript_to_json structure.
+    
+    Each event with text segments becomes one entry; window and line-break
+    events are skipped. Times are converted from milliseconds to seconds.
+    
+    Args:
+        data (dict): Decoded json3 response
+        
+    Returns:
+        dict: {"transcript": [{"start": float, "duration": float, "text": str}, ...]}
+    """
+    transcript: list[dict[str, Any]] = []
+    for event in data.get('events', []):
+        segs = event.get('segs')
+        if not segs:
+            continue
+        text = ''.join(seg.get('utf8', '') for seg in segs)
+        if not text.strip():
+            continue
+        transcript.append({
+            "start": event.get('tStartMs', 0) / 1000,
+            "duration": event.get('dDurationMs', 0) / 1000,
+            "text": text
+        })
+    
+    return {"transcript": transcript}
+
+
+# playabilityStatus values of watch pages that really describe the video, so a
+# missing resource on them means the video does not have it. Bot checks and
+# consent pages (e.g. LOGIN_REQUIRED) are not conclusive.
+CONCLUSIVE_PLAYABILITY_STATUSES = ('OK', 'ERROR', 'UNPLAYABLE')
+
+
+def unavailable_error(scripts: list[Any], resource: str, reason: str) -> Exception:
+    """
+    Build the error raised when a resource is missing from a watch page.
+    
+    Args:
+        scripts: Decoded JSON blobs of the watch page
+        resource (str): 'details', 'transcript' or 'comments'
+        reason (str): Error message
+        
+    Returns:
+        Exception: ResourceUnavailableError when the page is conclusive, so the outcome
+                   can be remembered by the negative cache; a plain Exception otherwise
+    """
+    playability = grab_dict_by_key(scripts, 'playabilityStatus') if isinstance(scripts, YoutubePage) else None
+    status = (playability or {}).get('playabilityStatus', {}).get('status')
+    if status in CONCLUSIVE_PLAYABILITY_STATUSES:
+        return ResourceUnavailableError(resource, reason)
+    return Exception(reason)
+
+
+def get_deadline(max_seconds: float | None) -> float | None:
+    """
+    Convert a time budget into an absolute time.monotonic() deadline.
+    
+    Args:
+        max_seconds (float, optional): Time budget in seconds, or None for no limit
+        
+    Returns:
+        float or None: Deadline, or None if there is no limit
+    """
+    if max_seconds is None:
+        return None
+    return time.monotonic() + max_seconds
+
+
+def deadline_passed(deadline: float | None) -> bool:
+    """Check whether a deadline from get_deadline has been reached"""
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def request_timeout(timeout: tuple[float, float], deadline: float | None) -> tuple[float, float]:
     """
-    Recursively search for a key in nested dictionaries/lists
+    Cap a request timeout by the time left before a deadline, so a slow request
+    cannot overrun a max_seconds budget by the full timeout.
     
     Args:
-        obj: The object to search in (dict, list, or other)
+        timeout (tuple): (connect, read) timeout in seconds, e.g. the session's
+        deadline (float, optional): Deadline from get_deadline
+        
+    Returns:
+        tuple: (connect, read) timeout, neither longer than the remaining budget
+    """
+    if deadline is None:
+        return timeout
+    remaining = max(deadline - time.monotonic(), MIN_REQUEST_TIMEOUT)
+    connect_timeout, read_timeout = timeout
+    return min(connect_timeout, remaining), min(read_timeout, remaining)
+
+
+def find_nested_key(obj: dict[str, Any] | list[Any] | Any, target_key: str, page_type: str | None = None) -> dict[str, Any] | None:
+    """
+    Search for a key in nested dictionaries/lists
+    
+    Dictionaries are visited depth-first in document order, using an explicit
+    stack so deeply nested innertube responses cannot hit the recursion limit.
+    To run many lookups against the same document, build a page.KeyIndex.
+    
+    Args:
+        obj: The object to search in (dict, list, KeyIndex or other)
         target_key (str): The key to search for
+        page_type (str, optional): Kind of document, e.g. 'next' for comment continuations.
+            When given, the path where the key was last found in such documents is
+            tried first, see pathcache.PathCache.
         
     Returns:
         dict: The dictionary containing the target key, or None if not found
     """
+    if isinstance(obj, KeyIndex):
+        return obj.find(target_key)
+    
+    if page_type is not None:
+        return PATH_CACHE.find(obj, target_key, page_type, iter_nested_key_paths)
+    
     if isinstance(obj, dict):
         if target_key in obj:
             return obj
-        for value in obj.values():
-            result = find_nested_key(value, target_key)
-            if result is not None:
-                return result
+        stack = [iter(obj.values())]
     elif isinstance(obj, list):
-        for item in obj:
-            result = find_nested_key(item, target_key)
-            if result is not None:
-                return result
+        stack = [iter(obj)]
+    else:
+        return None
+    
+    # Stack of iterators over the children of the nodes being visited; decoded
+    # JSON only holds plain dicts and lists, so exact type checks are enough
+    while stack:
+        for node in stack[-1]:
+            node_type = type(node)
+            if node_type is dict:
+                if target_key in node:
+                    return node
+                stack.append(iter(node.values()))
+                break
+            if node_type is list:
+                stack.append(iter(node))
+                break
+        else:
+            stack.pop()
     return None
 
 
-def extract_json_from_scripts(scripts: list[BeautifulSoup], target_key: str) -> dict[str, Any] | None:
+def find_nested_key_path(obj: dict[str, Any] | list[Any] | Any, target_key: str) -> tuple[dict[str, Any], Path] | None:
+    """
+    Like find_nested_key, but also return the path of keys and indices to the result
+    
+    Returns:
+        tuple: (dictionary containing the target key, path), or None if not found
+    """
+    return next(iter_nested_key_paths(obj, target_key), None)
+
+
+def iter_nested_key_paths(obj: dict[str, Any] | list[Any] | Any, target_key: str) -> Iterator[tuple[dict[str, Any], Path]]:
+    """
+    Lazily find every dictionary containing target_key, in the order find_nested_key visits them
+    
+    Yields:
+        tuple: (dictionary containing the target key, path of keys and indices to it)
+    """
+    if isinstance(obj, dict):
+        if target_key in obj:
+            yield obj, ()
+        stack = [iter(obj.items())]
+    elif isinstance(obj, list):
+        stack = [enumerate(obj)]
+    else:
+        return
+    
+    path: list[str | int] = []
+    while stack:
+        for step, node in stack[-1]:
+            node_type = type(node)
+            if node_type is dict:
+                path.append(step)
+                if target_key in node:
+                    yield node, tuple(path)
+                stack.append(iter(node.items()))
+                break
+            if node_type is list:
+                path.append(step)
+                stack.append(enumerate(node))
+                break
+        else:
+            stack.pop()
+            if path:
+                path.pop()
+
+
+def extract_json_from_scripts(scripts: list[Any], target_key: str) -> dict[str, Any] | None:
     """
-    Extract and parse JSON data from BeautifulSoup script elements, searching for a specific key
+    Extract and parse JSON data from a page's scripts, searching for a specific key
+    
+    Uses the same scan-once extraction as grab_dict_by_key: lookups on a
+    YoutubePage come from its memoized index and raw script texts are decoded
+    lazily with iter_json_objects.
     
     Args:
-        scripts: List of BeautifulSoup script elements
+        scripts: Decoded JSON blobs or script texts from parse_youtube_page_scripts
         target_key (str): The key to search for in the parsed JSON data
         
     Returns:
         dict: The dictionary containing the target key, or None if not found
     """
+    if isinstance(scripts, YoutubePage):
+        return scripts.find(target_key)
+    
     for script in scripts:
-        if script.string:  # Check if script has content
-            try:
-                # Extract potential JSON from script content
-                script_content = script.string.strip()
-                
-                # Look for JSON-like patterns
-                json_matches = re.findall(r'\{.*\}', script_content, re.DOTALL)
-                
-                for json_str in json_matches:
-                    try:
-                        data = json.loads(json_str)
-                        result = find_nested_key(data, target_key)
-                        if result:
-                            return result
-                    except json.JSONDecodeError:
-                        continue
-                        
-            except Exception:
-                continue
+        if isinstance(script, (dict, list)):
+            result = find_nested_key(script, target_key)
+            if result:
+                return result
+            continue
+        
+        # Script tags from earlier versions of parse_youtube_page_scripts are still accepted
+        script_text = script if isinstance(script, str) else getattr(script, 'string', None)
+        if not script_text:
+            continue
+        
+        for data in iter_json_objects(script_text, target_key):
+            result = find_nested_key(data, target_key)
+            if result:
+                return result
     
     return None
 
 
-def fetch_youtube_continuation_data(continuation_token: str, click_tracking_params: str, api_url: str) -> dict[str, Any]:
+def build_continuation_payload(continuation_token: str, click_tracking_params: str, context: dict[str, Any] | None = None) -> dict[str, Any]:
     """
-    Fetch YouTube comments data using continuation token and click tracking params.
+    Build the innertube request body for a continuation request.
     
     Args:
         continuation_token (str): The continuation token for pagination
         click_tracking_params (str): The click tracking parameters
+        context (dict, optional): Innertube context read from the page's ytcfg, see
+            InnertubeContext.request_context. Modified in place.
         
     Returns:
-        dict: Parsed JSON response from YouTube API
-        
-    Raises:
-        Exception: If the API request fails
+        dict: JSON payload for a /youtubei/v1 continuation POST
     """
-    comment_url = f"https://www.youtube.com{api_url}"
-    
-    # Payload with continuation and click tracking
-    payload = {
-        "context": {
+    if context is None:
+        context = {
             "client": {
                 "clientName": "WEB",
-                "clientVersion": "2.20240321.08.00",
-                "clientScreen": "WATCH"
+                "clientVersion": HEADERS["X-YouTube-Client-Version"]
             }
-        },
+        }
+    context.setdefault("client", {}).setdefault("clientScreen", "WATCH")
+    
+    return {
+        "context": context,
         "continuation": continuation_token,
         "clickTracking": {
             "clickTrackingParams": click_tracking_params
         }
     }
+
+
+def fetch_youtube_continuation_data(continuation_token: str, click_tracking_params: str, api_url: str, session: requests.Session | None = None, json_backend: JsonBackend | None = None, innertube: InnertubeContext | None = None, timeout: tuple[float, float] | None = None) -> dict[str, Any]:
+    """
+    Fetch YouTube comments data using continuation token and click tracking params.
+    
+    Args:
+        continuation_token (str): The continuation token for pagination
+        click_tracking_params (str): The click tracking parameters
+        api_url (str): Innertube endpoint path, e.g. '/youtubei/v1/next'
+        session (requests.Session, optional): Session to send the request with, so
+            connections are reused across continuation pages
+        json_backend (JsonBackend, optional): Decoder for the response, stdlib json by default
+        innertube (InnertubeContext, optional): Client settings read from YouTube pages (context,
+            client version, visitor ID and API key). The defaults in config.HEADERS are used otherwise.
+        timeout (tuple, optional): (connect, read) timeout of this request, see request_timeout.
+            The session's timeout is used otherwise.
+        
+    Returns:
+        dict: Parsed JSON response from YouTube API
+        
+    Raises:
+        Exception: If the API request fails
+    """
+    comment_url, payload, headers = _continuation_request(continuation_token, click_tracking_params, api_url, innertube)
     
-    response = requests.post(comment_url, json=payload, headers=HEADERS)
+    if session is not None:
+        options = {} if timeout is None else {'timeout': timeout}
+        response = session.post(comment_url, json=payload, headers=headers, **options)
+    else:
+        response = requests.post(comment_url, json=payload, headers=headers, timeout=timeout or (CONNECT_TIMEOUT, READ_TIMEOUT))
     
     # Check the response
     if response.status_code == 200:
-        return response.json()
+        return (json_backend or DEFAULT_JSON_BACKEND).loads(response.content)
+    else:
+        raise Exception(f"Failed to fetch comments: HTTP {response.status_code}")
+
+
+def _continuation_request(continuation_token: str, click_tracking_params: str, api_url: str,
+                          innertube: InnertubeContext | None) -> tuple[str, dict[str, Any], dict[str, str]]:
+    """
+    Returns:
+        tuple: (URL, JSON payload, headers) of a continuation POST
+    """
+    url = f"https://www.youtube.com{api_url}"
+    if innertube is None:
+        return url, build_continuation_payload(continuation_token, click_tracking_params), HEADERS
+    
+    payload = build_continuation_payload(continuation_token, click_tracking_params, innertube.request_context())
+    return innertube.api_url(url), payload, innertube.headers()
+
+
+async def afetch_youtube_continuation_data(continuation_token: str, click_tracking_params: str, api_url: str, session: AsyncYoutubeSession, json_backend: JsonBackend | None = None, innertube: InnertubeContext | None = None, timeout: tuple[float, float] | None = None) -> dict[str, Any]:
+    """
+    Async version of fetch_youtube_continuation_data.
+    
+    Args:
+        continuation_token (str): The continuation token for pagination
+        click_tracking_params (str): The click tracking parameters
+        api_url (str): Innertube endpoint path, e.g. '/youtubei/v1/next'
+        session (AsyncYoutubeSession): Async session to send the request with
+        json_backend (JsonBackend, optional): Decoder for the response, stdlib json by default
+        innertube (InnertubeContext, optional): Client settings read from YouTube pages
+        timeout (tuple, optional): (connect, read) timeout of this request, the session's by default
+        
+    Returns:
+        dict: Parsed JSON response from YouTube API
+        
+    Raises:
+        Exception: If the API request fails
+    """
+    comment_url, payload, headers = _continuation_request(continuation_token, click_tracking_params, api_url, innertube)
+    
+    options = {} if timeout is None else {'timeout': timeout}
+    response = await session.post(comment_url, json=payload, headers=headers, **options)
+    
+    if response.status_code == 200:
+        return (json_backend or DEFAULT_JSON_BACKEND).loads(response.content)
     else:
         raise Exception(f"Failed to fetch comments: HTTP {response.status_code}")
+
+
+# Assignments of the JSON blobs YouTube embeds in its pages, e.g.
+# `var ytInitialData = {...};`, `window["ytInitialPlayerResponse"] = {...};`, `ytcfg.set({...});`
+# The pattern starts with the variable names so the regex engine can skip
+# quickly over the rest of the page.
+PAGE_DATA_PATTERN = re.compile(
+    r'(?:ytInitialData|ytInitialPlayerResponse)(?:["\']\])?\s*=\s*(?=\{)'
+    r'|ytcfg\.set\(\s*(?=\{)'
+)
+
+# Fallback for pages without the usual assignments (e.g. consent or error pages)
+SCRIPT_TEXT_PATTERN = re.compile(r'<script\b[^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE)
+
+_json_decoder = json.JSONDecoder()
+
+
+def page_type_for_url(url: str) -> str:
+    """
+    Kind of page a URL returns, used to learn lookup paths (see pathcache.PathCache).
+    
+    Returns:
+        str: The endpoint name (see transport.endpoint_for_url), with each /feed/ page,
+             e.g. 'feed/news' or 'feed/trending', as a kind of its own
+    """
+    endpoint = endpoint_for_url(url)
+    if endpoint == 'feed':
+        return urlsplit(url).path.strip('/')
+    return endpoint
+
+
+def parse_youtube_page_scripts(html: str, json_backend: JsonBackend | None = None, page_type: str | None = None) -> list[Any]:
+    """
+    Decode the JSON blobs embedded in a YouTube page's HTML.
+    
+    The ytInitialData, ytInitialPlayerResponse and ytcfg.set assignments are
+    located directly in the response text and decoded with raw_decode, in
+    document order, without building a DOM.
+    
+    Args:
+        html (str): Page HTML
+        json_backend (JsonBackend, optional): Decoder for the blobs, stdlib json by default
+        page_type (str, optional): Kind of page, e.g. 'watch', so key lookups can use
+            the paths learned on earlier pages of that kind
+        
+    Returns:
+        list: YoutubePage of the decoded JSON objects, or the raw script texts
+              if the page has none
+    """
+    json_backend = json_backend or DEFAULT_JSON_BACKEND
+    blobs: list[Any] = []
+    for match in PAGE_DATA_PATTERN.finditer(html):
+        script_end = html.find('</script>', match.end())
+        try:
+            data, _ = json_backend.raw_decode(html, match.end(), script_end if script_end != -1 else None)
+        except ValueError:
+            continue
+        blobs.append(data)
     
+    if blobs:
+        page = YoutubePage(blobs, page_type)
+        page.size = len(html)
+        return page
+    
+    return SCRIPT_TEXT_PATTERN.findall(html)
 
 
-def extract_youtube_page_scripts(url: str, headers: dict[str, str] | None = None, payload: dict[str, Any] | None = None) -> list[BeautifulSoup]:
+def extract_youtube_page_scripts(url: str, headers: dict[str, str] | None = None, payload: dict[str, Any] | None = None, session: requests.Session | None = None, json_backend: JsonBackend | None = None) -> list[Any]:
     """
     Extract YouTube initial data from a given URL.
     
     Args:
         url (str): YouTube URL to scrape
-        variable_name (str): JavaScript variable name to extract ('ytInitialData' or 'ytInitialPlayerResponse')
         headers (dict, optional): Custom headers for the request
+        session (requests.Session, optional): Session to send the request with
+        json_backend (JsonBackend, optional): Decoder for the page blobs
         
     Returns:
-        dict: Parsed JSON data from the JavaScript variable
+        list: Decoded JSON blobs of the page, see parse_youtube_page_scripts
         
     Raises:
-        Exception: If the variable is not found or JSON parsing fails
+        requests.HTTPError: If the page request fails
     """
 
     # Get the webpage content
-    response = requests.get(url, headers=headers, json=payload)
+    if session is not None:
+        response = session.get(url, headers=headers, json=payload)
+    else:
+        response = requests.get(url, headers=headers, json=payload, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
     response.raise_for_status()
     
-    # Parse with BeautifulSoup
-    soup = BeautifulSoup(response.text, "html.parser")
+    return parse_youtube_page_scripts(response.text, json_backend, page_type_for_url(url))
+
+
+async def aextract_youtube_page_scripts(url: str, session: AsyncYoutubeSession, headers: dict[str, str] | None = None, json_backend: JsonBackend | None = None) -> list[Any]:
+    """
+    Async version of extract_youtube_page_scripts.
     
-    # Find all script tags
-    scripts = soup.find_all('script')
+    Args:
+        url (str): YouTube URL to scrape
+        session (AsyncYoutubeSession): Async session to send the request with
+        headers (dict, optional): Custom headers for the request
+        json_backend (JsonBackend, optional): Decoder for the page blobs
+        
+    Returns:
+        list: Decoded JSON blobs of the page, see parse_youtube_page_scripts
+    """
+    response = await session.get(url, headers=headers)
+    response.raise_for_status()
+    
+    return parse_youtube_page_scripts(response.text, json_backend, page_type_for_url(url))
 
-    return scripts
 
+# Start of the player response assignment on a watch page
+PLAYER_RESPONSE_PATTERN = re.compile(r'ytInitialPlayerResponse(?:["\']\])?\s*=\s*(?=\{)')
 
-def grab_dict_by_key(result_set: list[BeautifulSoup], target_key: str) -> dict | None:
+
+class _PlayerResponseScanner:
     """
-    Ultra-fast search using string operations only, avoiding regex entirely.
+    Accumulates a streamed watch page until its ytInitialPlayerResponse script is complete.
+    
+    The player response is complete once the closing </script> of the script
+    assigning it has been received, so no brace matching is needed while
+    streaming.
     """
-    import json
     
-    def find_key_in_dict(data, target_key):
-        """Recursively search for a key in nested dictionaries/lists"""
-        if isinstance(data, dict):
-            if target_key in data:
-                return data
-            for value in data.values():
-                result = find_key_in_dict(value, target_key)
-                if result is not None:
-                    return result
-        elif isinstance(data, list):
-            for item in data:
-                result = find_key_in_dict(item, target_key)
-                if result is not None:
-                    return result
-        return None
+    def __init__(self):
+        self.text = ''
+        self.complete = False
+        self._start = -1
+        self._scanned = 0
+    
+    def feed(self, chunk: str) -> bool:
+        """Add a chunk of the page. Returns True once the player response is complete."""
+        self.text += chunk
+        
+        if self._start == -1:
+            # Rescan a little before the new chunk in case the marker was split
+            match = PLAYER_RESPONSE_PATTERN.search(self.text, max(0, self._scanned - 64))
+            self._scanned = len(self.text)
+            if match is None:
+                return False
+            self._start = match.end()
+            self._scanned = self._start
+        
+        if self.text.find('</script>', max(self._start, self._scanned - len('</script>'))) != -1:
+            self.complete = True
+        self._scanned = len(self.text)
+        return self.complete
+    
+    def page(self, json_backend: JsonBackend | None = None) -> list[Any]:
+        """Parse what was received. Pages cut short are flagged with partial=True."""
+        page = parse_youtube_page_scripts(self.text, json_backend, 'watch')
+        if isinstance(page, YoutubePage):
+            page.partial = self.complete
+        return page
+
+
+def extract_youtube_player_response(url: str, headers: dict[str, str] | None = None, session: requests.Session | None = None, json_backend: JsonBackend | None = None) -> list[Any]:
+    """
+    Fetch a watch page only up to its ytInitialPlayerResponse.
+    
+    The page is streamed and the connection closed as soon as the player
+    response has been received, so the rest of the ~1 MB body (ytInitialData,
+    comments and related videos) is never downloaded or decoded. Enough for
+    video details and caption tracks.
+    
+    Args:
+        url (str): YouTube watch URL
+        headers (dict, optional): Custom headers for the request
+        session (requests.Session, optional): Session to send the request with
+        json_backend (JsonBackend, optional): Decoder for the page blobs
+        
+    Returns:
+        list: YoutubePage with the blobs before the end of the player response,
+              with partial=True if the download was stopped early
+        
+    Raises:
+        requests.HTTPError: If the page request fails
+    """
+    if session is not None:
+        response = session.get(url, headers=headers, stream=True)
+    else:
+        response = requests.get(url, headers=headers, stream=True, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+    
+    scanner = _PlayerResponseScanner()
+    try:
+        response.raise_for_status()
+        if response.encoding is None:
+            response.encoding = 'utf-8'
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE, decode_unicode=True):
+            if scanner.feed(chunk):
+                break
+    finally:
+        response.close()
+    
+    return scanner.page(json_backend)
+
+
+async def aextract_youtube_player_response(url: str, session: AsyncYoutubeSession, headers: dict[str, str] | None = None, json_backend: JsonBackend | None = None) -> list[Any]:
+    """
+    Async version of extract_youtube_player_response.
+    
+    Args:
+        url (str): YouTube watch URL
+        session (AsyncYoutubeSession): Async session to send the request with
+        headers (dict, optional): Custom headers for the request
+        json_backend (JsonBackend, optional): Decoder for the page blobs
+        
+    Returns:
+        list: YoutubePage with the blobs before the end of the player response
+    """
+    response = await session.get(url, headers=headers, stream=True)
+    
+    scanner = _PlayerResponseScanner()
+    try:
+        response.raise_for_status()
+        async for chunk in response.aiter_text():
+            if scanner.feed(chunk):
+                break
+    finally:
+        await response.aclose()
+    
+    return scanner.page(json_backend)
+
+
+# Start of a JSON object literal: `{` followed by a quoted key or `}`
+JSON_OBJECT_START_PATTERN = re.compile(r'\{\s*["}]')
+
+
+def iter_json_objects(text: str, target_key: str | None = None) -> Iterator[Any]:
+    """
+    Lazily decode the top-level JSON objects embedded in a script text.
     
-    def find_json_with_key(text, target_key):
-        """Find JSON objects containing the target key using string operations"""
-        search_pattern = f'"{target_key}"'
-        candidates = []
+    The text is scanned once from left to right: each object literal is decoded
+    with raw_decode and scanning resumes after its end, so the cost grows
+    linearly with the script size and braces inside strings are handled by the
+    JSON decoder. Objects are only decoded until the caller stops iterating.
+    
+    Args:
+        text (str): Script text
+        target_key (str, optional): Only yield objects whose source contains this key
         
-        # Find all occurrences of the key
-        pos = 0
-        while True:
+    Yields:
+        Decoded JSON objects, in document order
+    """
+    search_pattern = f'"{target_key}"' if target_key is not None else None
+    key_pos = -1
+    pos = 0
+    
+    while True:
+        if search_pattern is not None and key_pos < pos:
+            # Nothing after the last occurrence of the key can contain it
             key_pos = text.find(search_pattern, pos)
             if key_pos == -1:
-                break
-            
-            # Find the start of the JSON object (nearest { before the key)
-            json_start = key_pos
-            brace_count = 0
-            while json_start >= 0:
-                if text[json_start] == '}':
-                    brace_count += 1
-                elif text[json_start] == '{':
-                    if brace_count == 0:
-                        break
-                    brace_count -= 1
-                json_start -= 1
-            
-            if json_start < 0:
-                pos = key_pos + 1
-                continue
-            
-            # Find the end of the JSON object
-            json_end = json_start + 1
-            brace_count = 1
-            in_string = False
-            escape_next = False
-            
-            while json_end < len(text) and brace_count > 0:
-                char = text[json_end]
-                
-                if escape_next:
-                    escape_next = False
-                elif char == '\\':
-                    escape_next = True
-                elif char == '"' and not escape_next:
-                    in_string = not in_string
-                elif not in_string:
-                    if char == '{':
-                        brace_count += 1
-                    elif char == '}':
-                        brace_count -= 1
-                
-                json_end += 1
-            
-            if brace_count == 0:
-                candidate = text[json_start:json_end]
-                candidates.append(candidate)
-            
-            pos = key_pos + 1
+                return
+        
+        match = JSON_OBJECT_START_PATTERN.search(text, pos)
+        if match is None:
+            return
+        
+        start = match.start()
+        try:
+            data, end = _json_decoder.raw_decode(text, start)
+        except json.JSONDecodeError:
+            pos = start + 1
+            continue
+        
+        pos = end
+        if search_pattern is None or search_pattern in text[start:end]:
+            yield data
+
+
+def grab_dict_by_key(result_set: list[Any], target_key: str) -> dict | None:
+    """
+    Find the first dictionary containing target_key in a page's decoded JSON blobs.
+    
+    Lookups on a YoutubePage are answered from its memoized index. Raw script
+    texts (the fallback of parse_youtube_page_scripts) are scanned once with
+    iter_json_objects.
+    """
+    if isinstance(result_set, YoutubePage):
+        return result_set.find(target_key)
+    
+    def find_key_in_dict(data, target_key):
+        """Search for a key in nested dictionaries/lists, in document order, with an explicit stack"""
+        if isinstance(data, dict):
+            stack = [(data, iter(data.items()))]
+        elif isinstance(data, list):
+            stack = [(data, enumerate(data))]
+        else:
+            return None
         
-        return candidates
+        while stack:
+            node, items = stack[-1]
+            for key, value in items:
+                if key == target_key:
+                    return node
+                value_type = type(value)
+                if value_type is dict:
+                    stack.append((value, iter(value.items())))
+                    break
+                if value_type is list:
+                    stack.append((value, enumerate(value)))
+                    break
+            else:
+                stack.pop()
+        return None
     
     target_pattern = f'"{target_key}"'
     
     for tag in result_set:
-        try:
-            tag_text = tag.get_text() if hasattr(tag, 'get_text') else str(tag)
-            
-            # Ultra-fast string check
-            if target_pattern not in tag_text or len(tag_text) < 50:
-                continue
-            
-            # Find JSON candidates
-            candidates = find_json_with_key(tag_text, target_key)
-            
-            # Parse candidates
-            for candidate in candidates:
-                try:
-                    data = json.loads(candidate)
-                    result = find_key_in_dict(data, target_key)
-                    if result is not None:
-                        return result
-                except json.JSONDecodeError:
-                    continue
-                    
-        except (AttributeError, TypeError):
+        if isinstance(tag, (dict, list)):
+            result = find_key_in_dict(tag, target_key)
+            if result is not None:
+                return result
+            continue
+        
+        # Script tags from earlier versions of parse_youtube_page_scripts are still accepted
+        tag_text = tag if isinstance(tag, str) else tag.get_text() if hasattr(tag, 'get_text') else str(tag)
+        if target_pattern not in tag_text:
             continue
+        
+        for data in iter_json_objects(tag_text, target_key):
+            result = find_key_in_dict(data, target_key)
+            if result is not None:
+                return result
     
-    return None
\ No newline at end of file
+    return None
@@ -1,13 +1,61 @@
 from .utils import *
-from .youtube_search import SearchMixin
-from .youtube_comments import CommentsMixin
-from .youtube_transcript import TranscriptMixin
-from .youtube_news import NewsMixin
+from .youtube_search import SearchMixin, AsyncSearchMixin
+from .youtube_comments import CommentsMixin, AsyncCommentsMixin
+from .youtube_transcript import TranscriptMixin, AsyncTranscriptMixin
+from .youtube_news import NewsMixin, AsyncNewsMixin
 from .youtube_trending import TrendingMixin
-from .youtube_playlist import PlaylistMixin
-from typing import Any
+from .youtube_playlist import PlaylistMixin, AsyncPlaylistMixin
+from .youtube_batch import BatchMixin, AsyncBatchMixin
+from .transport import YoutubeSession, AsyncYoutubeSession
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy, CircuitBreaker
+from .singleflight import SingleFlight, AsyncSingleFlight
+from .json_backend import JsonBackend
+from .pathcache import PATH_CACHE
+from .pagecache import PageCache, video_id_for_url
+from .responsecache import ResponseCache
+from .spcache import SearchParamCache
+from .negcache import NegativeCache
+from .innertube import InnertubeContext
+from .config import (POOL_CONNECTIONS, POOL_MAXSIZE, ASYNC_MAX_CONNECTIONS,
+                     ASYNC_MAX_KEEPALIVE_CONNECTIONS, ASYNC_KEEPALIVE_EXPIRY, CONNECT_TIMEOUT, READ_TIMEOUT, JSON_BACKEND,
+                     SEARCH_PARAM_CACHE_PATH, NEGATIVE_CACHE_TTL, NEGATIVE_CACHE_PATH)
+from typing import Any, Awaitable, Callable
 
-class YoutubeAPI(SearchMixin, CommentsMixin, TranscriptMixin, NewsMixin, TrendingMixin, PlaylistMixin):
+
+def _parse_video_details(scripts: list[Any], fields: list[str] | None = None) -> dict[str, Any]:
+    """
+    Extract the videoDetails and microformat sections from a watch page.
+    
+    With fields, only those keys are returned, read from videoDetails or, failing
+    that, from the playerMicroformatRenderer (missing fields are None).
+    
+    Raises:
+        ResourceUnavailableError: If the page has no videoDetails, e.g. the video was removed
+    """
+    video_details_dict = grab_dict_by_key(scripts, 'videoDetails')
+    if not video_details_dict:
+        raise unavailable_error(scripts, 'details', "No video details found")
+    
+    video_details_key_data = video_details_dict.get('videoDetails')
+    microformat_key_data = video_details_dict.get('microformat')
+    
+    if fields is not None:
+        video_details_key_data = video_details_key_data or {}
+        microformat_renderer = (microformat_key_data or {}).get('playerMicroformatRenderer', {})
+        return {field: video_details_key_data[field] if field in video_details_key_data else microformat_renderer.get(field)
+                for field in fields}
+
+    # Wrap both in video_details dictionary
+    video_details = {
+        'videoDetails': video_details_key_data,
+        'microformat': microformat_key_data
+    }
+    
+    return video_details
+
+
+class YoutubeAPI(SearchMixin, CommentsMixin, TranscriptMixin, NewsMixin, TrendingMixin, PlaylistMixin, BatchMixin):
     """
     YouTube scraping API with multiple functionality mixins.
     
@@ -15,31 +63,311 @@ class YoutubeAPI(SearchMixin, CommentsMixin, TranscriptMixin, NewsMixin, Trendin
     due to YouTube's deprecation of trending feed endpoints.
     """
 
-    def get_video_details(self, video_id: str) -> dict[str, Any]:
+    def __init__(self,
+                 pool_connections: int = POOL_CONNECTIONS,
+                 pool_maxsize: int = POOL_MAXSIZE,
+                 pool_block: bool = False,
+                 keep_alive: bool = True,
+                 rate_limits: dict[str, tuple[float, int]] | None = None,
+                 rate_limiter: RateLimiter | None = None,
+                 retry_policy: RetryPolicy | None = None,
+                 circuit_breaker: CircuitBreaker | None = None,
+                 timeout: tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+                 http2: bool = False,
+                 json_backend: str = JSON_BACKEND,
+                 page_cache: PageCache | None = None,
+                 response_cache: ResponseCache | None = None,
+                 search_param_cache: SearchParamCache | None = None,
+                 negative_cache: NegativeCache | None = None,
+                 innertube: InnertubeContext | None = None,
+                 session: requests.Session | None = None):
+        """
+        Args:
+            pool_connections (int): Number of per-host connection pools to keep
+            pool_maxsize (int): Maximum number of connections kept open per host
+            pool_block (bool): If True, wait for a free pooled connection instead of
+                               opening an extra one when a host's pool is exhausted
+            keep_alive (bool): Reuse connections between requests. Defaults to True.
+            rate_limits (dict, optional): Per-endpoint (requests per second, burst) budgets
+                                          overriding config.RATE_LIMITS
+            rate_limiter (RateLimiter, optional): Existing limiter to share, e.g. between
+                                                  several YoutubeAPI instances
+            retry_policy (RetryPolicy, optional): Retry settings for transient failures.
+                                                  Use RetryPolicy(max_attempts=1) to disable retries.
+            circuit_breaker (CircuitBreaker, optional): Breaker that fails fast while YouTube is unhealthy
+            timeout (tuple): (connect, read) timeout in seconds for every request
+            http2 (bool): Multiplex requests over HTTP/2 connections. Requires httpx[http2].
+            json_backend (str): JSON library for every decode: 'orjson', 'simdjson', 'ujson' or 'json'.
+                                Falls back to the standard library if it is not installed.
+            page_cache (PageCache, optional): Cache of parsed watch pages reused by video details,
+                                              transcripts and comments. Use PageCache(max_bytes=0) to disable.
+            response_cache (ResponseCache, optional): Disk cache of raw responses, shared between
+                                                      processes and runs. Disabled by default.
+            search_param_cache (SearchParamCache, optional): sp values resolved for each filter
+                                                             combination by filter_mode='crawl' searches
+            negative_cache (NegativeCache, optional): Videos known to have no transcript, comments
+                                                      or details, skipped without a request
+            innertube (InnertubeContext, optional): Client version, visitor ID, API key and context
+                                                    read from the pages loaded, sent with continuation requests
+            session (requests.Session, optional): Pre-configured session to use instead of
+                                                  building a new pooled one
+        """
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter(rate_limits)
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.circuit_breaker = circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        self.json_backend = JsonBackend(json_backend)
+        self.path_cache = PATH_CACHE
+        self.page_cache = page_cache if page_cache is not None else PageCache()
+        self.search_param_cache = search_param_cache if search_param_cache is not None else SearchParamCache(SEARCH_PARAM_CACHE_PATH)
+        self.negative_cache = negative_cache if negative_cache is not None else NegativeCache(NEGATIVE_CACHE_TTL, NEGATIVE_CACHE_PATH)
+        self.innertube = innertube if innertube is not None else InnertubeContext()
+        if session is None:
+            session = YoutubeSession(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                     pool_block=pool_block, keep_alive=keep_alive,
+                                     rate_limiter=self.rate_limiter, retry_policy=self.retry_policy,
+                                     circuit_breaker=self.circuit_breaker, timeout=timeout, http2=http2,
+                                     response_cache=response_cache)
+        self.session = session
+        self._page_flight = SingleFlight()
+
+    def _fetch_page_scripts(self, url: str, headers: dict[str, str] | None = None) -> list[Any]:
+        """
+        Fetch and parse a YouTube page through the shared session.
+        
+        Concurrent calls for the same URL (e.g. details, transcript and comments
+        of one video dispatched together) share a single download and parse.
+        Watch pages are kept in the page cache, so later calls for the same video
+        are served without a download.
+        The innertube client settings are refreshed from the page once they have expired.
+        
+        Args:
+            url (str): YouTube page URL
+            headers (dict, optional): Custom headers for the request
+            
+        Returns:
+            list: Decoded JSON blobs of the page
+        """
+        page = self._cached_page(url, url, False, lambda: extract_youtube_page_scripts(url, headers=headers, session=self.session,
+                                                                                        json_backend=self.json_backend))
+        self.innertube.update(page)
+        return page
+
+    def _fetch_player_response(self, url: str, headers: dict[str, str] | None = None) -> list[Any]:
+        """
+        Fetch a watch page only up to its ytInitialPlayerResponse, which holds the
+        video details and caption tracks. See extract_youtube_player_response.
+        
+        Args:
+            url (str): YouTube watch URL
+            headers (dict, optional): Custom headers for the request
+            
+        Returns:
+            list: Decoded JSON blobs of the start of the page
+        """
+        page = self._cached_page(('player', url), url, True, lambda: extract_youtube_player_response(url, headers=headers, session=self.session,
+                                                                                                     json_backend=self.json_backend))
+        self.innertube.update(page)
+        return page
+
+    def _cached_page(self, key: Any, url: str, partial_ok: bool, fetch: Callable[[], list[Any]]) -> list[Any]:
+        """
+        Serve a watch page from the page cache, or fetch it once for all concurrent callers and cache it.
+        
+        Args:
+            key: Single-flight key of the fetch
+            url (str): Page URL; only /watch?v= pages are cached
+            partial_ok (bool): Whether a page downloaded only up to its player response will do.
+                               Such calls also join a running download of the full page.
+            fetch (callable): Downloads and parses the page
+            
+        Returns:
+            list: Decoded JSON blobs of the page
+        """
+        covered_by = (url,) if partial_ok else ()
+        video_id = video_id_for_url(url)
+        if video_id is None:
+            return self._page_flight.do(key, fetch, covered_by)
+        
+        page = self.page_cache.get(video_id, partial_ok)
+        if page is not None:
+            return page
+        
+        def fetch_and_cache() -> list[Any]:
+            page = fetch()
+            self.page_cache.put(video_id, page)
+            return page
+        
+        return self._page_flight.do(key, fetch_and_cache, covered_by)
+
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections"""
+        self.session.close()
+
+    def __enter__(self) -> 'YoutubeAPI':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def get_video_details(self, video_id: str, fields: list[str] | None = None) -> dict[str, Any]:
         """
         Get video details from YouTube video ID
         
         Args:
             video_id (str): YouTube video ID
+            fields (list, optional): Keep only these fields, e.g. ['videoId', 'title', 'viewCount',
+                                     'lengthSeconds'], read from videoDetails or microformat.
+                                     By default the full videoDetails and microformat dicts are returned.
             
         Returns:
-            dict: Video details including title, description, view count etc.
+            dict: Video details including title, description, view count etc.,
+                  or a flat dict of the requested fields
         """
         # Get the webpage content
         url = f"https://www.youtube.com/watch?v={video_id}"
-        scripts = extract_youtube_page_scripts(url, headers=HEADERS)
+        with self.negative_cache.track('details', video_id):
+            scripts = self._fetch_player_response(url, headers=HEADERS)
+            return _parse_video_details(scripts, fields)
+
+
+class AsyncYoutubeAPI(AsyncSearchMixin, AsyncCommentsMixin, AsyncTranscriptMixin, AsyncNewsMixin, AsyncPlaylistMixin, AsyncBatchMixin):
+    """
+    Asyncio version of YoutubeAPI, running on httpx.
+
+    Every method is a coroutine mirroring its YoutubeAPI counterpart, so many
+    videos, searches and comment continuations can be fetched concurrently:
+
+        async with AsyncYoutubeAPI() as yt:
+            results = await asyncio.gather(*(yt.get_video_details(v) for v in video_ids))
+
+    The deprecated get_trending_videos is not mirrored.
+    """
+
+    def __init__(self,
+                 max_connections: int = ASYNC_MAX_CONNECTIONS,
+                 max_keepalive_connections: int = ASYNC_MAX_KEEPALIVE_CONNECTIONS,
+                 keepalive_expiry: float = ASYNC_KEEPALIVE_EXPIRY,
+                 rate_limits: dict[str, tuple[float, int]] | None = None,
+                 rate_limiter: RateLimiter | None = None,
+                 retry_policy: RetryPolicy | None = None,
+                 circuit_breaker: CircuitBreaker | None = None,
+                 timeout: tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+                 http2: bool = False,
+                 json_backend: str = JSON_BACKEND,
+                 page_cache: PageCache | None = None,
+                 response_cache: ResponseCache | None = None,
+                 search_param_cache: SearchParamCache | None = None,
+                 negative_cache: NegativeCache | None = None,
+                 innertube: InnertubeContext | None = None,
+                 session: AsyncYoutubeSession | None = None):
+        """
+        Args:
+            max_connections (int): Maximum number of concurrent connections
+            max_keepalive_connections (int): Maximum number of idle connections kept open
+            keepalive_expiry (float): Seconds an idle connection is kept before closing
+            rate_limits (dict, optional): Per-endpoint (requests per second, burst) budgets
+                                          overriding config.RATE_LIMITS
+            rate_limiter (RateLimiter, optional): Existing limiter to share
+            retry_policy (RetryPolicy, optional): Retry settings for transient failures
+            circuit_breaker (CircuitBreaker, optional): Breaker that fails fast while YouTube is unhealthy
+            timeout (tuple): (connect, read) timeout in seconds for every request
+            http2 (bool): Multiplex requests over HTTP/2 connections. Requires httpx[http2].
+            json_backend (str): JSON library for every decode: 'orjson', 'simdjson', 'ujson' or 'json'.
+                                Falls back to the standard library if it is not installed.
+            page_cache (PageCache, optional): Cache of parsed watch pages reused by video details,
+                                              transcripts and comments. Use PageCache(max_bytes=0) to disable.
+            response_cache (ResponseCache, optional): Disk cache of raw responses, shared between
+                                                      processes and runs. Disabled by default.
+            search_param_cache (SearchParamCache, optional): sp values resolved for each filter
+                                                             combination by filter_mode='crawl' searches
+            negative_cache (NegativeCache, optional): Videos known to have no transcript, comments
+                                                      or details, skipped without a request
+            innertube (InnertubeContext, optional): Client version, visitor ID, API key and context
+                                                    read from the pages loaded, sent with continuation requests
+            session (AsyncYoutubeSession, optional): Pre-configured session to use
+        """
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter(rate_limits)
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.circuit_breaker = circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        self.json_backend = JsonBackend(json_backend)
+        self.path_cache = PATH_CACHE
+        self.page_cache = page_cache if page_cache is not None else PageCache()
+        self.search_param_cache = search_param_cache if search_param_cache is not None else SearchParamCache(SEARCH_PARAM_CACHE_PATH)
+        self.negative_cache = negative_cache if negative_cache is not None else NegativeCache(NEGATIVE_CACHE_TTL, NEGATIVE_CACHE_PATH)
+        self.innertube = innertube if innertube is not None else InnertubeContext()
+        if session is None:
+            session = AsyncYoutubeSession(max_connections=max_connections,
+                                          max_keepalive_connections=max_keepalive_connections,
+                                          keepalive_expiry=keepalive_expiry,
+                                          rate_limiter=self.rate_limiter, retry_policy=self.retry_policy,
+                                          circuit_breaker=self.circuit_breaker, timeout=timeout, http2=http2,
+                                          response_cache=response_cache)
+        self.session = session
+        self._page_flight = AsyncSingleFlight()
+
+    async def _fetch_page_scripts(self, url: str, headers: dict[str, str] | None = None) -> list[Any]:
+        """
+        Fetch and parse a YouTube page. Concurrent calls for the same URL share one download and parse.
+        """
+        page = await self._cached_page(url, url, False, lambda: aextract_youtube_page_scripts(url, self.session, headers=headers,
+                                                                                                json_backend=self.json_backend))
+        self.innertube.update(page)
+        return page
+
+    async def _fetch_player_response(self, url: str, headers: dict[str, str] | None = None) -> list[Any]:
+        """
+        Fetch a watch page only up to its ytInitialPlayerResponse. See YoutubeAPI._fetch_player_response.
+        """
+        page = await self._cached_page(('player', url), url, True, lambda: aextract_youtube_player_response(url, self.session, headers=headers,
+                                                                                                            json_backend=self.json_backend))
+        self.innertube.update(page)
+        return page
+
+    async def _cached_page(self, key: Any, url: str, partial_ok: bool, fetch: Callable[[], Awaitable[list[Any]]]) -> list[Any]:
+        """
+        Serve a watch page from the page cache, or fetch it once and cache it. See YoutubeAPI._cached_page.
+        """
+        covered_by = (url,) if partial_ok else ()
+        video_id = video_id_for_url(url)
+        if video_id is None:
+            return await self._page_flight.do(key, fetch, covered_by)
+        
+        page = self.page_cache.get(video_id, partial_ok)
+        if page is not None:
+            return page
         
-        video_details_dict = grab_dict_by_key(scripts, 'videoDetails')
-        if not video_details_dict:
-            raise Exception("No video details found")
+        async def fetch_and_cache() -> list[Any]:
+            page = await fetch()
+            self.page_cache.put(video_id, page)
+            return page
         
-        video_details_key_data = video_details_dict.get('videoDetails')
-        microformat_key_data = video_details_dict.get('microformat')
+        return await self._page_flight.do(key, fetch_and_cache, covered_by)
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client and its connections"""
+        await self.session.aclose()
+
+    async def __aenter__(self) -> 'AsyncYoutubeAPI':
+        return self
 
-        # Wrap both in video_details dictionary
-        video_details = {
-            'videoDetails': video_details_key_data,
-            'microformat': microformat_key_data
-        }
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    async def get_video_details(self, video_id: str, fields: list[str] | None = None) -> dict[str, Any]:
+        """
+        Get video details from YouTube video ID
         
-        return video_details
\ No newline at end of file
+        Args:
+            video_id (str): YouTube video ID
+            fields (list, optional): Keep only these fields, e.g. ['videoId', 'title', 'viewCount',
+                                     'lengthSeconds'], read from videoDetails or microformat.
+                                     By default the full videoDetails and microformat dicts are returned.
+            
+        Returns:
+            dict: Video details including title, description, view count etc.,
+                  or a flat dict of the requested fields
+        """
+        url = f"https://www.youtube.com/watch?v={video_id}"
+        async with self.negative_cache.atrack('details', video_id):
+            scripts = await self._fetch_player_response(url, headers=HEADERS)
+            return _parse_video_details(scripts, fields)
@@ -0,0 +1,147 @@
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, AsyncIterator
+import asyncio
+from .config import POOL_MAXSIZE
+
+
+def _run_many(func: Callable[[str], Any], video_ids: Iterable[str], concurrency: int, ordered: bool) -> Iterator[tuple[str, Any]]:
+    """
+    Run func over video IDs in a thread pool, keeping at most `concurrency` calls in flight.
+    
+    Args:
+        func: Callable taking a video ID
+        video_ids: Iterable of video IDs, consumed lazily
+        concurrency (int): Maximum number of calls in flight
+        ordered (bool): Yield results in input order instead of completion order
+        
+    Yields:
+        tuple: (video_id, result) or (video_id, exception) if the call failed
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    
+    def call(video_id: str) -> tuple[str, Any]:
+        try:
+            return video_id, func(video_id)
+        except Exception as e:
+            return video_id, e
+    
+    ids = iter(video_ids)
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        if ordered:
+            queue: deque[Future] = deque(executor.submit(call, video_id) for video_id in islice(ids, concurrency))
+            while queue:
+                result = queue.popleft().result()
+                for video_id in islice(ids, 1):
+                    queue.append(executor.submit(call, video_id))
+                yield result
+        else:
+            pending = {executor.submit(call, video_id) for video_id in islice(ids, concurrency)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for video_id in islice(ids, len(done)):
+                    pending.add(executor.submit(call, video_id))
+                for future in done:
+                    yield future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _arun_many(func: Callable[[str], Any], video_ids: Iterable[str], concurrency: int, ordered: bool) -> AsyncIterator[tuple[str, Any]]:
+    """Async version of _run_many; func is a coroutine function"""
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    
+    async def call(video_id: str) -> tuple[str, Any]:
+        try:
+            return video_id, await func(video_id)
+        except Exception as e:
+            return video_id, e
+    
+    ids = iter(video_ids)
+    if ordered:
+        queue: deque[asyncio.Task] = deque(asyncio.ensure_future(call(video_id)) for video_id in islice(ids, concurrency))
+        try:
+            while queue:
+                result = await queue.popleft()
+                for video_id in islice(ids, 1):
+                    queue.append(asyncio.ensure_future(call(video_id)))
+                yield result
+        finally:
+            for task in queue:
+                task.cancel()
+            await asyncio.gather(*queue, return_exceptions=True)
+    else:
+        pending = {asyncio.ensure_future(call(video_id)) for video_id in islice(ids, concurrency)}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for video_id in islice(ids, len(done)):
+                    pending.add(asyncio.ensure_future(call(video_id)))
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+class BatchMixin:
+    """Mixin class for fetching many videos with bounded concurrency"""
+
+    def get_video_details_many(self, video_ids: Iterable[str], concurrency: int = POOL_MAXSIZE, ordered: bool = False, fields: list[str] | None = None) -> Iterator[tuple[str, dict[str, Any] | Exception]]:
+        """
+        Get video details for many video IDs, fetching watch pages in parallel.
+        
+        A failing or slow video does not stop the batch: errors are yielded
+        alongside the video ID instead of being raised.
+        
+        Args:
+            video_ids (Iterable[str]): YouTube video IDs, consumed lazily
+            concurrency (int): Maximum number of pages fetched at once. Keep it at or
+                               below the session's pool_maxsize so connections are reused.
+            ordered (bool): Yield results in input order instead of as they complete
+            fields (list, optional): Keep only these fields of each video, see get_video_details
+            
+        Yields:
+            tuple: (video_id, video details dict or the exception raised for that ID)
+        """
+        return _run_many(lambda video_id: self.get_video_details(video_id, fields), video_ids, concurrency, ordered)
+
+    def get_video_transcripts_many(self, video_ids: Iterable[str], concurrency: int = POOL_MAXSIZE, ordered: bool = False, format: str = 'xml') -> Iterator[tuple[str, dict[str, Any] | Exception]]:
+        """
+        Get transcripts for many video IDs, fetching watch pages and captions in parallel.
+        
+        Args:
+            video_ids (Iterable[str]): YouTube video IDs, consumed lazily
+            concurrency (int): Maximum number of videos processed at once
+            ordered (bool): Yield results in input order instead of as they complete
+            format (str): Caption track format, see get_video_transcript
+            
+        Yields:
+            tuple: (video_id, transcript dict or the exception raised for that ID)
+        """
+        return _run_many(lambda video_id: self.get_video_transcript(video_id, format), video_ids, concurrency, ordered)
+
+
+class AsyncBatchMixin:
+    """Async mirror of BatchMixin, used by AsyncYoutubeAPI"""
+
+    def get_video_details_many(self, video_ids: Iterable[str], concurrency: int = POOL_MAXSIZE, ordered: bool = False, fields: list[str] | None = None) -> AsyncIterator[tuple[str, dict[str, Any] | Exception]]:
+        """
+        Get video details for many video IDs concurrently. See BatchMixin.get_video_details_many.
+        
+        Usage:
+            async for video_id, result in yt.get_video_details_many(video_ids, concurrency=50):
+                ...
+        """
+        return _arun_many(lambda video_id: self.get_video_details(video_id, fields), video_ids, concurrency, ordered)
+
+    def get_video_transcripts_many(self, video_ids: Iterable[str], concurrency: int = POOL_MAXSIZE, ordered: bool = False, format: str = 'xml') -> AsyncIterator[tuple[str, dict[str, Any] | Exception]]:
+        """
+        Get transcripts for many video IDs concurrently. See BatchMixin.get_video_transcripts_many.
+        """
+        return _arun_many(lambda video_id: self.get_video_transcript(video_id, format), video_ids, concurrency, ordered)
@@ -1,4 +1,92 @@
 from .utils import *
+from .config import POOL_MAXSIZE
+import asyncio
+import time
+import requests
+
+
+COMMENT_SORT_DICT = {'top_comments': 0, 'newest': 1}
+
+
+def _get_sort_continuation(scripts: list[Any], sort_index: int) -> tuple[str, str]:
+    """
+    Read the click tracking params and continuation token of a comment sort menu item.
+    
+    Returns:
+        tuple: (click_tracking_params, continuation_token)
+    
+    Raises:
+        ResourceUnavailableError: If the page has no comment sort menu, e.g. comments are turned off
+    """
+    sub_menu_items_dict = grab_dict_by_key(scripts, 'subMenuItems')
+    if not sub_menu_items_dict:
+        raise unavailable_error(scripts, 'comments', "Could not find sub menu items")
+    
+    try:
+        selected_comment_type = sub_menu_items_dict.get('subMenuItems', [])[sort_index]
+        click_tracking_params = selected_comment_type.get('serviceEndpoint').get('clickTrackingParams')
+        continuation_token = selected_comment_type.get('serviceEndpoint').get('continuationCommand').get('token')
+    except (AttributeError, IndexError, TypeError):
+        raise Exception("Could not find comment continuation data")
+    
+    return click_tracking_params, continuation_token
+
+
+def _extract_comments(data: dict[str, Any]) -> list[dict[str, Any]]:
+    """Extract the comment entity payloads from a comments continuation response"""
+    try:
+        mutations_dict = find_nested_key(data, 'mutations', page_type='next')
+        if not mutations_dict:
+            raise Exception("Could not find mutations")
+        
+        mutations_list = mutations_dict.get('mutations', [])
+        return [mutation.get('payload').get('commentEntityPayload') for mutation in mutations_list if 'commentEntityPayload' in mutation.get('payload').keys()]
+    except (AttributeError, TypeError):
+        raise Exception("Could not parse comment data from response")
+
+
+def _extract_comment_replies(data: dict[str, Any], comment_ids: list[str], continuation_token: str) -> list[dict[str, Any]]:
+    """Extract the reply continuation items of every comment thread in a comments continuation response"""
+    comment_replies: list[dict[str, Any]] = []
+    try:
+        framework_updates = data.get('onResponseReceivedEndpoints', [])[-1]
+        if 'reloadContinuationItemsCommand' in framework_updates.keys():
+            continuation_items = framework_updates.get('reloadContinuationItemsCommand').get('continuationItems')
+        elif 'appendContinuationItemsAction' in framework_updates.keys():
+            continuation_items = framework_updates.get('appendContinuationItemsAction').get('continuationItems')
+        else:
+            raise Exception("Could not find comment threads")
+        threads = [item.get('commentThreadRenderer', {}).get('replies') for item in continuation_items if item.get('commentThreadRenderer') and 'replies' in item.get('commentThreadRenderer').keys()]
+
+        for thread in threads:
+            root_comment_id = thread.get('commentRepliesRenderer').get('targetId').split('comment-replies-item-')[1]
+            if comment_ids and root_comment_id not in comment_ids:
+                continue
+            reply_content = thread.get('commentRepliesRenderer').get('contents')[0]
+            reply_content['root_comment_id'] = root_comment_id
+            comment_replies.append(reply_content)
+
+    except Exception:
+        raise Exception(f"Failure on continuation token: {continuation_token}")
+    
+    return comment_replies
+
+
+def _build_comment_thread_params(comment_replies: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Collect the continuation parameters needed to fetch each comment thread"""
+    return [{'root_comment_id': comment_reply.get('root_comment_id'),
+             'continuation_token': comment_reply.get('continuationItemRenderer', {}).get('continuationEndpoint', {}).get('continuationCommand', {}).get('token', ''),
+             'click_tracking_params': comment_reply.get('continuationItemRenderer', {}).get('continuationEndpoint', {}).get('clickTrackingParams', '')} for comment_reply in comment_replies]
+
+
+def _build_comment_thread(root_comment_id: str, comment_thread_continuation: dict[str, Any]) -> dict[str, Any]:
+    """Build a comment thread result from a thread continuation response"""
+    mutations = comment_thread_continuation.get('frameworkUpdates', {}).get('entityBatchUpdate', {}).get('mutations', [])
+
+    sub_comments = [mutation.get('payload').get('commentEntityPayload') for mutation in mutations if 'commentEntityPayload' in mutation.get('payload').keys()]
+
+    return {'root_comment_id': root_comment_id, 'sub_comments': sub_comments}
+
 
 class CommentsMixin:
     """Mixin class for YouTube comments functionality"""
@@ -38,7 +126,7 @@ class CommentsMixin:
             # No more continuation data available
             return None
     
-    def get_video_comments(self, video_id: str, n_comments: int | None = None, sort_by: str = 'top_comments') -> dict[str, Any]:
+    def get_video_comments(self, video_id: str, n_comments: int | None = None, sort_by: str = 'top_comments', max_seconds: float | None = None) -> dict[str, Any]:
         """
         Get video comments from YouTube video ID
             
@@ -46,48 +134,40 @@ class CommentsMixin:
             video_id (str): YouTube video ID
             n_comments (int, optional): Maximum number of comments to fetch. If None, fetches all comments.
             sorting (str): Comment sorting type. Either 'top_comments' or 'newest'. Defaults to 'top_comments'.
+            max_seconds (float, optional): Time budget for the whole call. When it runs out, pagination
+                                           stops and the comments collected so far are returned.
                 
         Returns:
             dict: Video comments data
         """
         # Validate sorting parameter
-        comments_dict = {'top_comments': 0, 'newest': 1}
-        if sort_by not in comments_dict:
-            raise ValueError(f"Invalid sorting option. Must be one of: {list(comments_dict.keys())}")
+        if sort_by not in COMMENT_SORT_DICT:
+            raise ValueError(f"Invalid sorting option. Must be one of: {list(COMMENT_SORT_DICT.keys())}")
         
+        deadline = get_deadline(max_seconds)
         youtube_url = f"https://www.youtube.com/watch?v={video_id}"
-        scripts = extract_youtube_page_scripts(youtube_url)
-
-        sub_menu_items_dict = grab_dict_by_key(scripts, 'subMenuItems')
-        if not sub_menu_items_dict:
-            raise Exception("Could not find sub menu items")
-        
-        try:
-            selected_comment_type = sub_menu_items_dict.get('subMenuItems', [])[comments_dict[sort_by]]
-            click_tracking_params = selected_comment_type.get('serviceEndpoint').get('clickTrackingParams')
-            continuation_token = selected_comment_type.get('serviceEndpoint').get('continuationCommand').get('token')
-        except:
-            raise Exception("Could not find comment continuation data")
+        with self.negative_cache.track('comments', video_id):
+            scripts = self._fetch_page_scripts(youtube_url)
+            click_tracking_params, continuation_token = _get_sort_continuation(scripts, COMMENT_SORT_DICT[sort_by])
 
         all_comments: list[dict[str, Any]] = []
         
         while continuation_token:
-            data = fetch_youtube_continuation_data(continuation_token, click_tracking_params, '/youtubei/v1/next?prettyPrint=false')
-            
             try:
-                mutations_dict = find_nested_key(data, 'mutations')
-                if not mutations_dict:
-                    raise Exception("Could not find mutations")
-                
-                mutations_list = mutations_dict.get('mutations', [])
-                comments = [mutation.get('payload').get('commentEntityPayload') for mutation in mutations_list if 'commentEntityPayload' in mutation.get('payload').keys()]
-                all_comments.extend(comments)
-            except (AttributeError, TypeError):
-                raise Exception("Could not parse comment data from response")
+                data = fetch_youtube_continuation_data(continuation_token, click_tracking_params, '/youtubei/v1/next?prettyPrint=false', session=self.session, json_backend=self.json_backend, innertube=self.innertube,
+                                                       timeout=request_timeout(self.session.timeout, deadline))
+            except requests.Timeout:
+                # The request was cut short by the time budget
+                if deadline_passed(deadline):
+                    break
+                raise
+            all_comments.extend(_extract_comments(data))
             
-            # Check if we've reached the desired number of comments
+            # Check if we've reached the desired number of comments or run out of time
             if n_comments is not None and len(all_comments) >= n_comments:
                 break
+            if deadline_passed(deadline):
+                break
             
             # Extract continuation data for next batch using utility function
             continuation_data = self.get_comment_continuation_data(data)
@@ -106,52 +186,39 @@ class CommentsMixin:
 
 
 
-    def get_video_comment_threads(self, video_id:str, comment_ids:list[str] = []) -> dict[str, Any]:
+    def get_video_comment_threads(self, video_id:str, comment_ids:list[str] = [], max_seconds: float | None = None) -> dict[str, Any]:
+        """
+        Get comment reply threads from YouTube video ID
+        
+        Args:
+            video_id (str): YouTube video ID
+            comment_ids (list[str]): Only fetch threads whose root comment ID is in this list.
+                                     If empty, fetches every thread.
+            max_seconds (float, optional): Time budget for the whole call. When it runs out, the
+                                           threads fetched so far are returned.
+        
+        Returns:
+            dict: Comment threads data
+        """
 
         comment_replies: list[dict[str, Any]] = []
+        deadline = get_deadline(max_seconds)
         youtube_url = f"https://www.youtube.com/watch?v={video_id}"
-        scripts = extract_youtube_page_scripts(youtube_url)
-        sub_menu_items_dict = grab_dict_by_key(scripts, 'subMenuItems')
-        if not sub_menu_items_dict:
-            raise Exception("Could not find sub menu items")
-
-        try:
-            selected_comment_type = sub_menu_items_dict.get('subMenuItems', [])[1]
-            click_tracking_params = selected_comment_type.get('serviceEndpoint').get('clickTrackingParams')
-            continuation_token = selected_comment_type.get('serviceEndpoint').get('continuationCommand').get('token')
-        except (AttributeError, IndexError, TypeError):
-            raise Exception("Could not find comment continuation data")
+        with self.negative_cache.track('comments', video_id):
+            scripts = self._fetch_page_scripts(youtube_url)
+            click_tracking_params, continuation_token = _get_sort_continuation(scripts, 1)
 
         while continuation_token:
-            data = fetch_youtube_continuation_data(continuation_token, click_tracking_params, '/youtubei/v1/next?prettyPrint=false')
-            
             try:
-                framework_updates = data.get('onResponseReceivedEndpoints', [])[-1]
-                if 'reloadContinuationItemsCommand' in framework_updates.keys():
-                    continuation_items = framework_updates.get('reloadContinuationItemsCommand').get('continuationItems')
-                elif 'appendContinuationItemsAction' in framework_updates.keys():
-                    continuation_items = framework_updates.get('appendContinuationItemsAction').get('continuationItems')
-                else:
-                    raise Exception("Could not find comment threads")
-                threads = [item.get('commentThreadRenderer', {}).get('replies') for item in continuation_items if item.get('commentThreadRenderer') and 'replies' in item.get('commentThreadRenderer').keys()]
-
-                if comment_ids:
-                    for thread in threads:
-                        root_comment_id = thread.get('commentRepliesRenderer').get('targetId').split('comment-replies-item-')[1]
-                        if root_comment_id in comment_ids:
-                            reply_content = thread.get('commentRepliesRenderer').get('contents')[0]
-                            reply_content['root_comment_id'] = root_comment_id
-                            comment_replies.append(reply_content)
-                else:
-                    for thread in threads:
-                        root_comment_id = thread.get('commentRepliesRenderer').get('targetId').split('comment-replies-item-')[1]
-                        reply_content = thread.get('commentRepliesRenderer').get('contents')[0]
-                        reply_content['root_comment_id'] = root_comment_id
-                        comment_replies.append(reply_content)
-
-
-            except Exception:
-                raise Exception(f"Failure on continuation token: {continuation_token}")
+                data = fetch_youtube_continuation_data(continuation_token, click_tracking_params, '/youtubei/v1/next?prettyPrint=false', session=self.session, json_backend=self.json_backend, innertube=self.innertube,
+                                                       timeout=request_timeout(self.session.timeout, deadline))
+            except requests.Timeout:
+                if deadline_passed(deadline):
+                    break
+                raise
+            comment_replies.extend(_extract_comment_replies(data, comment_ids, continuation_token))
+            if deadline_passed(deadline):
+                break
 
             continuation_data = self.get_comment_continuation_data(data)
             if continuation_data:
@@ -161,27 +228,165 @@ class CommentsMixin:
                 continuation_token = None
 
 
-        comment_threads_params: list[dict[str, Any]] = [{'root_comment_id': comment_reply.get('root_comment_id'),
-                                       'continuation_token': comment_reply.get('continuationItemRenderer', {}).get('continuationEndpoint', {}).get('continuationCommand', {}).get('token', ''),
-                                       'click_tracking_params': comment_reply.get('continuationItemRenderer', {}).get('continuationEndpoint', {}).get('clickTrackingParams', '')} for comment_reply in comment_replies]
-            
+        comment_threads_params = _build_comment_thread_params(comment_replies)
 
         comment_threads_results: list[dict[str, Any]] = []
         for comment_thread_params in comment_threads_params:
+            if deadline_passed(deadline):
+                break
 
-            comment_thread_continuation = fetch_youtube_continuation_data(comment_thread_params['continuation_token'],
-                                            comment_thread_params['click_tracking_params'],
-                                            '/youtubei/v1/next?prettyPrint=false')
+            try:
+                comment_thread_continuation = fetch_youtube_continuation_data(comment_thread_params['continuation_token'],
+                                                comment_thread_params['click_tracking_params'],
+                                                '/youtubei/v1/next?prettyPrint=false', session=self.session, json_backend=self.json_backend, innertube=self.innertube,
+                                                timeout=request_timeout(self.session.timeout, deadline))
+            except requests.Timeout:
+                if deadline_passed(deadline):
+                    break
+                raise
                 
-            mutations = comment_thread_continuation.get('frameworkUpdates', {}).get('entityBatchUpdate', {}).get('mutations', [])
+            comment_threads_results.append(_build_comment_thread(comment_thread_params['root_comment_id'], comment_thread_continuation))
+            
+            
+
+        return {'comment_threads': comment_threads_results}
+
 
-            sub_comments = [mutation.get('payload').get('commentEntityPayload') for mutation in mutations if 'commentEntityPayload' in mutation.get('payload').keys()]
+class AsyncCommentsMixin:
+    """Async mirror of CommentsMixin, used by AsyncYoutubeAPI"""
+
+    get_comment_continuation_data = CommentsMixin.get_comment_continuation_data
+
+    async def get_video_comments(self, video_id: str, n_comments: int | None = None, sort_by: str = 'top_comments', max_seconds: float | None = None) -> dict[str, Any]:
+        """
+        Get video comments from YouTube video ID
+            
+        Args:
+            video_id (str): YouTube video ID
+            n_comments (int, optional): Maximum number of comments to fetch. If None, fetches all comments.
+            sort_by (str): Comment sorting type. Either 'top_comments' or 'newest'. Defaults to 'top_comments'.
+            max_seconds (float, optional): Time budget for the whole call. When it runs out, pagination
+                                           stops and the comments collected so far are returned.
+                
+        Returns:
+            dict: Video comments data
+        """
+        import httpx
 
-            thread_dict = {'root_comment_id': comment_thread_params['root_comment_id'], 'sub_comments': sub_comments}
+        if sort_by not in COMMENT_SORT_DICT:
+            raise ValueError(f"Invalid sorting option. Must be one of: {list(COMMENT_SORT_DICT.keys())}")
+        
+        deadline = get_deadline(max_seconds)
+        youtube_url = f"https://www.youtube.com/watch?v={video_id}"
+        async with self.negative_cache.atrack('comments', video_id):
+            scripts = await self._fetch_page_scripts(youtube_url)
+            click_tracking_params, continuation_token = _get_sort_continuation(scripts, COMMENT_SORT_DICT[sort_by])
 
-            comment_threads_results.append(thread_dict)
+        all_comments: list[dict[str, Any]] = []
+        
+        while continuation_token:
+            try:
+                data = await afetch_youtube_continuation_data(continuation_token, click_tracking_params, '/youtubei/v1/next?prettyPrint=false', self.session, json_backend=self.json_backend, innertube=self.innertube,
+                                                              timeout=request_timeout(self.session.timeout, deadline))
+            except httpx.TimeoutException:
+                if deadline_passed(deadline):
+                    break
+                raise
+            all_comments.extend(_extract_comments(data))
             
+            if n_comments is not None and len(all_comments) >= n_comments:
+                break
+            if deadline_passed(deadline):
+                break
             
+            continuation_data = self.get_comment_continuation_data(data)
+            if continuation_data:
+                continuation_token = continuation_data['continuation_token']
+                click_tracking_params = continuation_data['click_tracking_params']
+            else:
+                continuation_token = None
 
-        return {'comment_threads': comment_threads_results}
-            
\ No newline at end of file
+        if n_comments is not None:
+            all_comments = all_comments[:n_comments]
+
+        return {'comments': all_comments}
+
+    async def get_video_comment_threads(self, video_id: str, comment_ids: list[str] = [], max_seconds: float | None = None, concurrency: int = POOL_MAXSIZE) -> dict[str, Any]:
+        """
+        Get comment reply threads from YouTube video ID. Individual threads are fetched concurrently.
+        
+        Args:
+            video_id (str): YouTube video ID
+            comment_ids (list[str]): Only fetch threads whose root comment ID is in this list.
+                                     If empty, fetches every thread.
+            max_seconds (float, optional): Time budget for the whole call. When it runs out, the
+                                           threads fetched so far are returned.
+            concurrency (int): Maximum number of threads fetched at the same time
+        
+        Returns:
+            dict: Comment threads data
+        
+        Raises:
+            ValueError: If concurrency is lower than 1
+        """
+        import httpx
+
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        comment_replies: list[dict[str, Any]] = []
+        deadline = get_deadline(max_seconds)
+        youtube_url = f"https://www.youtube.com/watch?v={video_id}"
+        async with self.negative_cache.atrack('comments', video_id):
+            scripts = await self._fetch_page_scripts(youtube_url)
+            click_tracking_params, continuation_token = _get_sort_continuation(scripts, 1)
+
+        while continuation_token:
+            try:
+                data = await afetch_youtube_continuation_data(continuation_token, click_tracking_params, '/youtubei/v1/next?prettyPrint=false', self.session, json_backend=self.json_backend, innertube=self.innertube,
+                                                              timeout=request_timeout(self.session.timeout, deadline))
+            except httpx.TimeoutException:
+                if deadline_passed(deadline):
+                    break
+                raise
+            comment_replies.extend(_extract_comment_replies(data, comment_ids, continuation_token))
+            if deadline_passed(deadline):
+                break
+
+            continuation_data = self.get_comment_continuation_data(data)
+            if continuation_data:
+                continuation_token = continuation_data['continuation_token']
+                click_tracking_params = continuation_data['click_tracking_params']
+            else:
+                continuation_token = None
+
+        comment_threads_params = _build_comment_thread_params(comment_replies)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_thread(comment_thread_params: dict[str, Any]) -> dict[str, Any]:
+            async with semaphore:
+                comment_thread_continuation = await afetch_youtube_continuation_data(comment_thread_params['continuation_token'],
+                                                                                     comment_thread_params['click_tracking_params'],
+                                                                                     '/youtubei/v1/next?prettyPrint=false', self.session, json_backend=self.json_backend, innertube=self.innertube)
+            return _build_comment_thread(comment_thread_params['root_comment_id'], comment_thread_continuation)
+
+        tasks = [asyncio.ensure_future(fetch_thread(params)) for params in comment_threads_params]
+        if not tasks:
+            return {'comment_threads': []}
+
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=timeout)
+        finally:
+            # Wait for the cancelled threads, so none is left running or unretrieved
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Like the sync version, fail once every thread has finished
+        errors = [task.exception() for task in done if task.exception() is not None]
+        if errors:
+            raise errors[0]
+
+        return {'comment_threads': [task.result() for task in tasks if task in done]}
@@ -12,6 +12,26 @@ categories_dict = {'top_stories': 0,
             'health': 8}
 
 
+def _parse_trending_news(scripts: list[Any], category: str) -> dict[str, Any]:
+    """Extract the trending news sections of a category from a news feed page"""
+    try:
+        tabs_dict = grab_dict_by_key(scripts, 'tabs')
+        if not tabs_dict:
+            raise Exception('Tabs not found')
+        
+        tabs: list[dict[str, Any]] = tabs_dict.get('tabs', [])
+        tab_contents_dict = find_nested_key(tabs[categories_dict[category]], 'contents', page_type='news')
+        if not tab_contents_dict:
+            raise Exception('Tab contents not found')
+
+        tab_contents = tab_contents_dict.get('contents', [])
+        trending_sections = [tab_content.get('richSectionRenderer', {}).get('content', {}).get('richShelfRenderer', {}) for tab_content in tab_contents]
+    except (AttributeError, IndexError, TypeError):
+        raise Exception("Could not parse trending news structure")
+    
+    return {'trending_news': trending_sections}
+
+
 class NewsMixin:
     
     def get_trending_news(self, category: str = 'top_stories') -> dict[str, Any]:
@@ -34,21 +54,24 @@ class NewsMixin:
             raise ValueError(f"Invalid category: {category}. Valid categories are: {list(categories_dict.keys())}")
         
         url = f"https://www.youtube.com/feed/news_destination/{category}"
-        scripts = extract_youtube_page_scripts(url, headers=HEADERS)
+        scripts = self._fetch_page_scripts(url, headers=HEADERS)
+        return _parse_trending_news(scripts, category)
+
+
+class AsyncNewsMixin:
+    """Async mirror of NewsMixin, used by AsyncYoutubeAPI"""
+
+    async def get_trending_news(self, category: str = 'top_stories') -> dict[str, Any]:
+        """
+        Scrapes YouTube's trending news page and returns trending video data.
+        See NewsMixin.get_trending_news for the valid categories.
         
-        try:
-            tabs_dict = grab_dict_by_key(scripts, 'tabs')
-            if not tabs_dict:
-                raise Exception('Tabs not found')
-            
-            tabs: list[dict[str, Any]] = tabs_dict.get('tabs', [])
-            tab_contents_dict = find_nested_key(tabs[categories_dict[category]], 'contents')
-            if not tab_contents_dict:
-                raise Exception('Tab contents not found')
-
-            tab_contents = tab_contents_dict.get('contents', [])
-            trending_sections = [tab_content.get('richSectionRenderer', {}).get('content', {}).get('richShelfRenderer', {}) for tab_content in tab_contents]
-        except (AttributeError, IndexError, TypeError):
-            raise Exception("Could not parse trending news structure")
+        Returns:
+            dict: A dictionary containing trending news sections
+        """
+        if category not in categories_dict:
+            raise ValueError(f"Invalid category: {category}. Valid categories are: {list(categories_dict.keys())}")
         
-        return {'trending_news': trending_sections}
\ No newline at end of file
+        url = f"https://www.youtube.com/feed/news_destination/{category}"
+        scripts = await self._fetch_page_scripts(url, headers=HEADERS)
+        return _parse_trending_news(scripts, category)
@@ -1,6 +1,43 @@
 from .utils import *
 
 
+def _parse_playlist_videos(scripts: list[Any]) -> dict[str, Any]:
+    """Extract the playlist video list from a playlist page"""
+    playlist_data_dict = grab_dict_by_key(scripts, 'playlistVideoListRenderer')
+    if not playlist_data_dict:
+        raise Exception("No playlist data found")
+    
+    playlist_video_list_renderer = playlist_data_dict.get('playlistVideoListRenderer')
+    if not playlist_video_list_renderer:
+        raise Exception("No playlistVideoListRenderer found")
+        
+    playlist_contents = playlist_video_list_renderer.get('contents')
+    if not playlist_contents:
+        raise Exception("No playlist contents found")
+
+    # Wrap in playlist_videos dictionary
+    playlist_videos = {
+        'playlist_videos': playlist_contents
+    }
+    
+    return playlist_videos
+
+
+def _parse_playlist_details(scripts: list[Any]) -> dict[str, Any]:
+    """Extract the playlist title and metadata from a playlist page"""
+    playlist_data_dict = grab_dict_by_key(scripts, 'pageHeaderViewModel').get('pageHeaderViewModel')
+    
+    # Keep only the title and metadata keys from the playlist data
+    if playlist_data_dict:
+        keys_to_keep = ['title', 'metadata']
+        filtered_data = {key: playlist_data_dict[key] for key in keys_to_keep if key in playlist_data_dict}
+    else:
+        filtered_data = {}
+    
+    # Wrap in playlist_details dictionary
+    return {'playlist_details': filtered_data}
+
+
 class PlaylistMixin:
     """Mixin class for YouTube playlist functionality"""
     
@@ -16,26 +53,9 @@ class PlaylistMixin:
         """
         # Get the webpage content
         url = f"https://www.youtube.com/playlist?list={playlist_id}"
-        scripts = extract_youtube_page_scripts(url, headers=HEADERS)
+        scripts = self._fetch_page_scripts(url, headers=HEADERS)
         
-        playlist_data_dict = grab_dict_by_key(scripts, 'playlistVideoListRenderer')
-        if not playlist_data_dict:
-            raise Exception("No playlist data found")
-        
-        playlist_video_list_renderer = playlist_data_dict.get('playlistVideoListRenderer')
-        if not playlist_video_list_renderer:
-            raise Exception("No playlistVideoListRenderer found")
-            
-        playlist_contents = playlist_video_list_renderer.get('contents')
-        if not playlist_contents:
-            raise Exception("No playlist contents found")
-
-        # Wrap in playlist_videos dictionary
-        playlist_videos = {
-            'playlist_videos': playlist_contents
-        }
-        
-        return playlist_videos
+        return _parse_playlist_videos(scripts)
 
 
     def get_playlist_details(self, playlist_id: str) -> dict[str, Any]:
@@ -50,17 +70,38 @@ class PlaylistMixin:
         """
         # Get the webpage content
         url = f"https://www.youtube.com/playlist?list={playlist_id}"
-        scripts = extract_youtube_page_scripts(url, headers=HEADERS)
-        
-        playlist_data_dict = grab_dict_by_key(scripts, 'pageHeaderViewModel').get('pageHeaderViewModel')
+        scripts = self._fetch_page_scripts(url, headers=HEADERS)
         
-        # Keep only the title and metadata keys from the playlist data
-        if playlist_data_dict:
-            keys_to_keep = ['title', 'metadata']
-            filtered_data = {key: playlist_data_dict[key] for key in keys_to_keep if key in playlist_data_dict}
-        else:
-            filtered_data = {}
+        return _parse_playlist_details(scripts)
+
+
+class AsyncPlaylistMixin:
+    """Async mirror of PlaylistMixin, used by AsyncYoutubeAPI"""
+
+    async def get_playlist_videos(self, playlist_id: str) -> dict[str, Any]:
+        """
+        Get playlist videos from YouTube playlist ID
         
-        # Wrap in playlist_details dictionary
-        return {'playlist_details': filtered_data}
+        Args:
+            playlist_id (str): YouTube playlist ID
+            
+        Returns:
+            dict: Playlist videos data wrapped in 'playlist_videos' key
+        """
+        url = f"https://www.youtube.com/playlist?list={playlist_id}"
+        scripts = await self._fetch_page_scripts(url, headers=HEADERS)
+        return _parse_playlist_videos(scripts)
 
+    async def get_playlist_details(self, playlist_id: str) -> dict[str, Any]:
+        """
+        Get playlist details from YouTube playlist ID
+        
+        Args:
+            playlist_id (str): YouTube playlist ID
+            
+        Returns:
+            dict: Playlist details with first 2 keys wrapped in 'playlist_details' key
+        """
+        url = f"https://www.youtube.com/playlist?list={playlist_id}"
+        scripts = await self._fetch_page_scripts(url, headers=HEADERS)
+        return _parse_playlist_details(scripts)
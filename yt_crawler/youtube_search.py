@@ -1,7 +1,20 @@
-import requests
-from .utils import extract_json_from_scripts, extract_youtube_page_scripts, grab_dict_by_key, find_nested_key, fetch_youtube_continuation_data
+from .utils import (extract_json_from_scripts, grab_dict_by_key, find_nested_key, fetch_youtube_continuation_data,
+                    afetch_youtube_continuation_data, get_deadline, deadline_passed, request_timeout)
+from .config import SEARCH_FILTER_MODE
+from .spcache import SearchParamCache
 from typing import Any
+from urllib.parse import quote, unquote, urlsplit, parse_qs
+import base64
+import warnings
+import requests
+
+# Accepted values of the filter_mode option, see config.SEARCH_FILTER_MODE
+SEARCH_FILTER_MODES = ('local', 'crawl', 'validate')
 
+# 'index' and 'options' locate a filter option in the results page filter dialog
+# (crawl mode). 'sp_field' and 'sp_values' encode it in the sp protobuf
+# (local mode): sort_by is field 1 of the message, the other filters are fields
+# of the nested filters message (field 2), and each feature is its own boolean field.
 SEARCH_FILTER_DICT: dict[str, Any] = {
     'upload_date': {
         'index': 0,
@@ -11,6 +24,14 @@ SEARCH_FILTER_DICT: dict[str, Any] = {
             'this_week': 2,
             'this_month': 3,
             'this_year': 4
+        },
+        'sp_field': 1,
+        'sp_values': {
+            'last_hour': 1,
+            'today': 2,
+            'this_week': 3,
+            'this_month': 4,
+            'this_year': 5
         }
     },
     'type': {
@@ -20,6 +41,13 @@ SEARCH_FILTER_DICT: dict[str, Any] = {
             'channel': 1,
             'playlist': 2,
             'movie': 3
+        },
+        'sp_field': 2,
+        'sp_values': {
+            'video': 1,
+            'channel': 2,
+            'playlist': 3,
+            'movie': 4
         }
     },
     'duration': {
@@ -28,6 +56,12 @@ SEARCH_FILTER_DICT: dict[str, Any] = {
             'under_4_minutes': 0,
             '4_20_minutes': 1,
             'over_20_minutes': 2
+        },
+        'sp_field': 3,
+        'sp_values': {
+            'under_4_minutes': 1,
+            '4_20_minutes': 3,
+            'over_20_minutes': 2
         }
     },
     'features': {
@@ -44,6 +78,20 @@ SEARCH_FILTER_DICT: dict[str, Any] = {
             'hdr': 8,
             'location': 9,
             'purchased': 10
+        },
+        'sp_field': None,
+        'sp_values': {
+            'hd': 4,
+            'subtitles_cc': 5,
+            'creative_commons': 6,
+            '3d': 7,
+            'live': 8,
+            'purchased': 9,
+            '4k': 14,
+            '360': 15,
+            'location': 23,
+            'hdr': 25,
+            'vr180': 26
         }
     },
     'sort_by': {
@@ -53,17 +101,324 @@ SEARCH_FILTER_DICT: dict[str, Any] = {
             'upload_date': 1,
             'view_count': 2,
             'rating': 3
+        },
+        'sp_field': 1,
+        'sp_values': {
+            'relevance': 0,
+            'rating': 1,
+            'upload_date': 2,
+            'view_count': 3
         }
     }
 }
 
 
 
+def _get_active_search_filters(upload_date: str | None = None, duration: str | None = None, features: str | None = None, sort_by: str = 'relevance') -> dict[str, str]:
+    """
+    Validate the search filters and collect the ones that need to be applied.
+    
+    Raises:
+        ValueError: If any filter option is not valid
+    """
+    type=None # Type filter is not supported yet
+    
+    # Collect active filters
+    active_filters: dict[str, str] = {}
+    filter_params = {
+        'upload_date': upload_date,
+        'type': type,
+        'duration': duration,
+        'features': features,
+        'sort_by': sort_by
+    }
+    
+    # Validate and collect non-None filters (except sort_by='relevance' which is default)
+    for filter_name, filter_value in filter_params.items():
+        if filter_value is not None:
+            if filter_name == 'sort_by' and filter_value == 'relevance':
+                continue  # Skip default sort_by
+            
+            if filter_name not in SEARCH_FILTER_DICT:
+                raise ValueError(f"Unknown filter type: {filter_name}")
+            
+            filter_options: dict[str, Any] = SEARCH_FILTER_DICT[filter_name]['options']
+            if filter_value not in filter_options:
+                raise ValueError(f"Invalid {filter_name} option '{filter_value}'. Must be one of: {list(filter_options.keys())}")
+            
+            active_filters[filter_name] = filter_value
+    
+    return active_filters
+
+
+def _encode_varint(value: int) -> bytes:
+    """Encode a non-negative integer as a protobuf varint"""
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def _encode_search_params(active_filters: dict[str, str]) -> str:
+    """
+    Build the sp parameter of a results URL from the active filters, without a request.
+    
+    sp is a base64 protobuf message: {1: sort, 2: {1: upload date, 2: type,
+    3: duration, <feature field>: 1}}. Fields are written in field number
+    order, as YouTube does, so the result matches the filter links on its pages.
+    
+    Args:
+        active_filters (dict): Filters from _get_active_search_filters
+    
+    Returns:
+        str: The sp value (not URL-encoded), or '' when no filter is active
+    """
+    message = b''
+    filter_fields: list[tuple[int, int]] = []
+    for filter_name, filter_value in active_filters.items():
+        filter_info = SEARCH_FILTER_DICT[filter_name]
+        value = filter_info['sp_values'][filter_value]
+        if filter_name == 'sort_by':
+            message += _encode_varint(filter_info['sp_field'] << 3) + _encode_varint(value)
+        elif filter_info['sp_field'] is None:
+            filter_fields.append((value, 1))
+        else:
+            filter_fields.append((filter_info['sp_field'], value))
+    
+    if filter_fields:
+        filters = b''.join(_encode_varint(field << 3) + _encode_varint(value) for field, value in sorted(filter_fields))
+        message += _encode_varint(2 << 3 | 2) + _encode_varint(len(filters)) + filters
+    
+    return base64.b64encode(message).decode('ascii') if message else ''
+
+
+def _search_url_sp(url: str) -> str:
+    """
+    Read the decoded sp parameter of a results URL, '' if it has none.
+    
+    The filter links of results pages encode sp twice (sp=EgIIAw%253D%253D for
+    EgIIAw==), so it is unquoted until it no longer changes.
+    """
+    sp = parse_qs(urlsplit(url).query).get('sp', [''])[0]
+    while (decoded := unquote(sp)) != sp:
+        sp = decoded
+    return sp
+
+
+def _check_search_filter_mode(filter_mode: str) -> None:
+    """
+    Raises:
+        ValueError: If filter_mode is not one of SEARCH_FILTER_MODES
+    """
+    if filter_mode not in SEARCH_FILTER_MODES:
+        raise ValueError(f"Invalid filter mode '{filter_mode}'. Must be one of: {list(SEARCH_FILTER_MODES)}")
+
+
+def _validated_search_url(local_url: str, crawled_url: str) -> str:
+    """Compare the locally encoded and crawled filter URLs, preferring the crawled one on a mismatch"""
+    if _search_url_sp(local_url) == _search_url_sp(crawled_url):
+        return local_url
+    warnings.warn(f"Locally encoded search filters sp={_search_url_sp(local_url)!r} differ from YouTube's "
+                  f"sp={_search_url_sp(crawled_url)!r}; using YouTube's")
+    return crawled_url
+
+
+class _RejectedSearchPage(Exception):
+    """A results page answered with HTTP 400 or without any results list, as YouTube does for an sp value it does not accept"""
+
+
+def _search_retry_mode(filter_mode: str, active_filters: dict[str, str], search_param_cache: SearchParamCache) -> str | None:
+    """
+    Pick how to retry a filtered search whose first results page was rejected.
+    
+    A locally encoded sp value YouTube did not accept falls back once to the
+    filter links ('crawl'). A remembered crawled value is forgotten so it is
+    resolved again.
+    
+    Returns:
+        str: Filter mode to retry with, or None if the error should be raised
+    """
+    if not active_filters:
+        return None
+    if filter_mode == 'local':
+        return 'crawl'
+    return filter_mode if search_param_cache.invalidate(active_filters) else None
+
+
+def _get_filter_url_path(scripts: list[Any], filter_name: str, filter_value: str) -> str:
+    """
+    Read the URL path that applies a filter option from a search results page.
+    
+    Args:
+        scripts: Decoded JSON blobs of the current search results page
+        filter_name (str): Filter to apply, a key of SEARCH_FILTER_DICT
+        filter_value (str): Option of that filter
+    
+    Returns:
+        str: URL path (starting with '/results') with the filter applied
+    """
+    # Extract JSON data containing filter information
+    json_data = extract_json_from_scripts(scripts, 'searchFilterButton')
+    
+    if not json_data or 'searchFilterButton' not in json_data:
+        raise Exception(f"Could not find search filter data when applying {filter_name} filter")
+    
+    # Navigate through the nested JSON structure to get filter groups
+    search_filter_groups = (json_data
+                        .get('searchFilterButton', {})
+                        .get('buttonRenderer', {})
+                        .get('command', {})
+                        .get('openPopupAction', {})
+                        .get('popup', {})
+                        .get('searchFilterOptionsDialogRenderer', {})
+                        .get('groups', []))
+    
+    # Get the filter group index and option index
+    filter_group_index = SEARCH_FILTER_DICT[filter_name]['index']
+    option_index = SEARCH_FILTER_DICT[filter_name]['options'][filter_value]
+    
+    # Get the specific filter group
+    filter_group = search_filter_groups[filter_group_index]
+    filters = filter_group.get('searchFilterGroupRenderer').get('filters')
+    
+    # Extract the URL path for the specified filter option
+    return (filters[option_index]
+            .get('searchFilterRenderer')
+            .get('navigationEndpoint')
+            .get('commandMetadata')
+            .get('webCommandMetadata')
+            .get('url'))
+
+
+def _get_text(text_obj: dict[str, Any] | None) -> str | None:
+    """Read a YouTube text object, either {'simpleText': ...} or {'runs': [{'text': ...}]}"""
+    if not text_obj:
+        return None
+    if 'simpleText' in text_obj:
+        return text_obj['simpleText']
+    return ''.join(run.get('text', '') for run in text_obj.get('runs', []))
+
+
+def _get_length_seconds(video: dict[str, Any]) -> str | None:
+    """Convert the 'H:MM:SS' length text of a search result to seconds, as in videoDetails"""
+    length_text = _get_text(video.get('lengthText'))
+    if not length_text:
+        return None
+    try:
+        seconds = 0
+        for part in length_text.split(':'):
+            seconds = seconds * 60 + int(part)
+    except ValueError:
+        return None
+    return str(seconds)
+
+
+def _get_view_count(video: dict[str, Any]) -> str | None:
+    """Read the view count of a search result as a digit string, as in videoDetails"""
+    view_count_text = _get_text(video.get('viewCountText'))
+    if view_count_text is None:
+        return None
+    return ''.join(char for char in view_count_text if char.isdigit()) or '0'
+
+
+# Fields of a search result that are not plain videoRenderer keys, named like
+# their videoDetails counterparts. Any other field is read from the renderer as is.
+SEARCH_RESULT_FIELDS = {
+    'title': lambda video: _get_text(video.get('title')),
+    'viewCount': _get_view_count,
+    'lengthSeconds': _get_length_seconds,
+    'author': lambda video: _get_text(video.get('ownerText')),
+    'channelId': lambda video: next((run.get('navigationEndpoint', {}).get('browseEndpoint', {}).get('browseId')
+                                     for run in video.get('ownerText', {}).get('runs', [])), None),
+    'publishedTimeText': lambda video: _get_text(video.get('publishedTimeText')),
+    'thumbnail': lambda video: next(reversed([thumbnail.get('url') for thumbnail in video.get('thumbnail', {}).get('thumbnails', [])]), None),
+}
+
+
+def _select_search_fields(videos: list[dict[str, Any]], fields: list[str] | None) -> list[dict[str, Any]]:
+    """
+    Keep only the requested fields of each videoRenderer, so the full renderers
+    (thumbnails, menus, tracking params, badges) can be freed batch by batch.
+    """
+    if fields is None:
+        return videos
+    return [{field: SEARCH_RESULT_FIELDS[field](video) if field in SEARCH_RESULT_FIELDS else video.get(field)
+             for field in fields} for video in videos]
+
+
+def _parse_search_page(scripts: list[Any]) -> tuple[list[dict[str, Any]], str, str]:
+    """
+    Parse the first batch of results and the continuation data from a search results page.
+    
+    Returns:
+        tuple: (videos, click_tracking_params, continuation_token); a single page of
+               results has an empty continuation token
+    
+    Raises:
+        _RejectedSearchPage: If the page has no results list
+        Exception: If the results list cannot be parsed
+    """
+    section_list_renderer = grab_dict_by_key(scripts, 'sectionListRenderer')
+    if not section_list_renderer:
+        raise _RejectedSearchPage("Could not find sectionListRenderer")
+
+
+    try:
+        search_contents = section_list_renderer.get('sectionListRenderer', {}).get('contents', [])
+
+        item_section_renderer_contents = search_contents[0].get('itemSectionRenderer').get('contents')
+        if not item_section_renderer_contents:
+            raise _RejectedSearchPage("Could not find itemSectionRenderer contents")
+        videos = [video.get('videoRenderer') for video in item_section_renderer_contents if video.get('videoRenderer')]
+    except (AttributeError, IndexError, TypeError):
+        raise Exception("Could not parse search results")
+    
+    # Continuation data for the next batch; a single page of results has none
+    try:
+        click_tracking_params = search_contents[1].get('continuationItemRenderer').get('continuationEndpoint').get('clickTrackingParams')
+        continuation_token = search_contents[1].get('continuationItemRenderer').get('continuationEndpoint').get('continuationCommand').get('token')
+    except (AttributeError, IndexError, TypeError):
+        click_tracking_params, continuation_token = '', ''
+    
+    return videos, click_tracking_params, continuation_token
+
+
+def _parse_search_continuation(continuation_data: dict[str, Any]) -> tuple[list[dict[str, Any]], str, str]:
+    """
+    Parse a batch of results and the next continuation data from a /youtubei/v1/search response.
+    
+    Returns:
+        tuple: (videos, click_tracking_params, continuation_token)
+    """
+    continuation_items_dict = find_nested_key(continuation_data, 'continuationItems', page_type='search')
+    if not continuation_items_dict:
+        raise Exception("Could not find continuation items")
+    else:
+        continuation_items: list[dict[str, Any]] = continuation_items_dict.get('continuationItems', [])
+    
+    next_set_of_videos: list[dict[str, Any]] = continuation_items[0].get('itemSectionRenderer', {}).get('contents', [])
+    if not next_set_of_videos:
+        raise Exception("Could not find next set of videos")
+    
+    next_videos = [video.get('videoRenderer') for video in next_set_of_videos if video.get('videoRenderer')]
+    
+    # Continuation data for next iteration; the last batch has none
+    try:
+        continuation_token:str = continuation_items[1].get('continuationItemRenderer', {}).get('continuationEndpoint', {}).get('continuationCommand', {}).get('token', '')
+        click_tracking_params:str = continuation_items[1].get('continuationItemRenderer', {}).get('continuationEndpoint', {}).get('clickTrackingParams', '')
+    except (AttributeError, IndexError, TypeError):
+        continuation_token, click_tracking_params = '', ''
+    
+    return next_videos, click_tracking_params, continuation_token
+
+
 class SearchMixin:
     """Mixin class providing YouTube search functionality"""
 
 
-    def _get_search_url(self, search_term: str, upload_date: str | None = None, duration: str | None = None, features: str | None = None, sort_by: str = 'relevance') -> str:
+    def _get_search_url(self, search_term: str, upload_date: str | None = None, duration: str | None = None, features: str | None = None, sort_by: str = 'relevance', filter_mode: str = SEARCH_FILTER_MODE) -> str:
         """
         Get a filtered YouTube search URL with specified filters.
         
@@ -74,15 +429,19 @@ class SearchMixin:
             duration (str): Duration filter - one of 'under_4_minutes', '4_20_minutes', 'over_20_minutes'
             features (str): Features filter - one of 'live', '4k', 'hd', 'subtitles_cc', 'creative_commons', '360', 'vr180', '3d', 'hdr', 'location', 'purchased'
             sort_by (str): Sorting option - one of 'relevance', 'upload_date', 'view_count', 'rating'
+            filter_mode (str): 'local' to encode the sp parameter without any request, 'crawl'
+                               to follow the filter links of one results page per filter
+                               (remembered per filter combination in self.search_param_cache),
+                               or 'validate' to do both and warn when they disagree
         
         Returns:
             str: Complete YouTube search URL with filters applied
         
         Raises:
-            ValueError: If any filter option is not valid
+            ValueError: If any filter option or the filter mode is not valid
             Exception: If unable to extract filter data from YouTube
         """
-        type=None # Type filter is not supported yet
+        _check_search_filter_mode(filter_mode)
         
         # Format search term for URL (replace spaces with +)
         formatted_search_term = search_term.replace(' ', '+')
@@ -91,79 +450,48 @@ class SearchMixin:
         base_url = "https://www.youtube.com"
         current_url = f"{base_url}/results?search_query={formatted_search_term}"
         
-        # Collect active filters
-        active_filters: dict[str, str] = {}
-        filter_params = {
-            'upload_date': upload_date,
-            'type': type,
-            'duration': duration,
-            'features': features,
-            'sort_by': sort_by
-        }
-        
-        # Validate and collect non-None filters (except sort_by='relevance' which is default)
-        for filter_name, filter_value in filter_params.items():
-            if filter_value is not None:
-                if filter_name == 'sort_by' and filter_value == 'relevance':
-                    continue  # Skip default sort_by
-                
-                if filter_name not in SEARCH_FILTER_DICT:
-                    raise ValueError(f"Unknown filter type: {filter_name}")
-                
-                filter_options: dict[str, Any] = SEARCH_FILTER_DICT[filter_name]['options']
-                if filter_value not in filter_options:
-                    raise ValueError(f"Invalid {filter_name} option '{filter_value}'. Must be one of: {list(filter_options.keys())}")
-                
-                active_filters[filter_name] = filter_value
+        active_filters = _get_active_search_filters(upload_date, duration, features, sort_by)
         
         # If no filters are active, return base search URL
         if not active_filters:
             return current_url
         
+        local_url = f"{current_url}&sp={quote(_encode_search_params(active_filters), safe='')}"
+        if filter_mode == 'local':
+            return local_url
+        
+        crawled_url = f"{current_url}&sp={quote(self._resolve_search_params(current_url, active_filters), safe='')}"
+        if filter_mode == 'validate':
+            return _validated_search_url(local_url, crawled_url)
+        return crawled_url
+
+    def _resolve_search_params(self, search_url: str, active_filters: dict[str, str]) -> str:
+        """
+        Find YouTube's sp value for a filter combination by following the filter
+        links of results pages, one page per filter. The value is remembered in
+        the search param cache and reused for every search term.
+        
+        Args:
+            search_url (str): Unfiltered results URL to start from
+            active_filters (dict): Filters from _get_active_search_filters
+        
+        Returns:
+            str: The sp value (not URL-encoded)
+        """
+        sp = self.search_param_cache.get(active_filters)
+        if sp is not None:
+            return sp
+        
+        base_url = "https://www.youtube.com"
+        current_url = search_url
+        
         # Apply filters sequentially
         for filter_name, filter_value in active_filters.items():
             try:
                 
-                # Make request to get the current page
-                response = requests.get(current_url)
-                response.raise_for_status()
-                
-                # Parse HTML
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(response.text, 'html.parser')
-                scripts = soup.find_all('script')
-                
-                # Extract JSON data containing filter information
-                json_data = extract_json_from_scripts(scripts, 'searchFilterButton')
-                
-                if not json_data or 'searchFilterButton' not in json_data:
-                    raise Exception(f"Could not find search filter data when applying {filter_name} filter")
-                
-                # Navigate through the nested JSON structure to get filter groups
-                search_filter_groups = (json_data
-                                    .get('searchFilterButton', {})
-                                    .get('buttonRenderer', {})
-                                    .get('command', {})
-                                    .get('openPopupAction', {})
-                                    .get('popup', {})
-                                    .get('searchFilterOptionsDialogRenderer', {})
-                                    .get('groups', []))
-                
-                # Get the filter group index and option index
-                filter_group_index = SEARCH_FILTER_DICT[filter_name]['index']
-                option_index = SEARCH_FILTER_DICT[filter_name]['options'][filter_value]
-                
-                # Get the specific filter group
-                filter_group = search_filter_groups[filter_group_index]
-                filters = filter_group.get('searchFilterGroupRenderer').get('filters')
-                
-                # Extract the URL path for the specified filter option
-                filter_url_path = (filters[option_index]
-                                .get('searchFilterRenderer')
-                                .get('navigationEndpoint')
-                                .get('commandMetadata')
-                                .get('webCommandMetadata')
-                                .get('url'))
+                # Get the current page
+                scripts = self._fetch_page_scripts(current_url)
+                filter_url_path = _get_filter_url_path(scripts, filter_name, filter_value)
                 
                 # Update current URL for next iteration
                 current_url = base_url + filter_url_path
@@ -171,10 +499,30 @@ class SearchMixin:
             except Exception as e:
                 raise Exception(f"Failed to apply {filter_name} filter with value '{filter_value}': {str(e)}")
         
-        return current_url
+        sp = _search_url_sp(current_url)
+        if not sp:
+            raise Exception(f"Filtered search URL has no sp parameter: {current_url}")
+        
+        self.search_param_cache.put(active_filters, sp)
+        return sp
+
+    def _load_search_page(self, url: str) -> tuple[list[dict[str, Any]], str, str]:
+        """
+        Fetch a results page and parse its first batch of results, see _parse_search_page.
+        
+        Raises:
+            _RejectedSearchPage: If YouTube answered HTTP 400 or sent a page without results
+        """
+        try:
+            scripts = self._fetch_page_scripts(url)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 400:
+                raise _RejectedSearchPage(f"YouTube rejected the search URL: {e}") from e
+            raise
+        return _parse_search_page(scripts)
     
 
-    def search(self, search_term: str, n_videos: int = 100, upload_date: str | None = None, duration: str | None = None, features: str | None = None, sort_by: str = 'relevance') -> dict[str, Any]:
+    def search(self, search_term: str, n_videos: int = 100, upload_date: str | None = None, duration: str | None = None, features: str | None = None, sort_by: str = 'relevance', max_seconds: float | None = None, fields: list[str] | None = None, filter_mode: str = SEARCH_FILTER_MODE) -> dict[str, Any]:
         """
         Search YouTube videos
         
@@ -185,61 +533,156 @@ class SearchMixin:
             duration (str): Duration filter - one of 'under_4_minutes', '4_20_minutes', 'over_20_minutes'
             features (str): Features filter - one of 'live', '4k', 'hd', 'subtitles_cc', 'creative_commons', '360', 'vr180', '3d', 'hdr', 'location', 'purchased'
             sort_by (str): Sorting option - one of 'relevance', 'upload_date', 'view_count', 'rating'
+            max_seconds (float, optional): Time budget for the whole call. When it runs out, pagination
+                                           stops and the results collected so far are returned.
+            fields (list, optional): Keep only these fields of each result, e.g.
+                                     ['videoId', 'title', 'viewCount', 'lengthSeconds'].
+                                     See SEARCH_RESULT_FIELDS; other names are read from the
+                                     videoRenderer as is. By default whole videoRenderer dicts are returned.
+            filter_mode (str): How filters are applied: 'local' (default) builds the sp
+                               parameter without extra requests, 'crawl' reads it from the
+                               filter links of results pages, 'validate' does both. See _get_search_url.
+                               If YouTube rejects a local sp value (HTTP 400 or a page
+                               without results), the search is retried once in 'crawl' mode.
             
         Returns:
             dict: Search results
         """
         
+        deadline = get_deadline(max_seconds)
+        
         # Use the updated _get_search_url method to construct the URL with all filters
-        url = self._get_search_url(search_term, upload_date, duration, features, sort_by)
-        scripts = extract_youtube_page_scripts(url)
-        section_list_renderer = grab_dict_by_key(scripts, 'sectionListRenderer')
-        if not section_list_renderer:
-            raise Exception("Could not find sectionListRenderer")
+        url = self._get_search_url(search_term, upload_date, duration, features, sort_by, filter_mode)
+        try:
+            videos, click_tracking_params, continuation_token = self._load_search_page(url)
+        except _RejectedSearchPage:
+            # YouTube did not accept the sp value: retry once with a crawled one.
+            # Other request and parse errors are raised as they are.
+            active_filters = _get_active_search_filters(upload_date, duration, features, sort_by)
+            retry_mode = _search_retry_mode(filter_mode, active_filters, self.search_param_cache)
+            if retry_mode is None:
+                raise
+            url = self._get_search_url(search_term, upload_date, duration, features, sort_by, retry_mode)
+            videos, click_tracking_params, continuation_token = self._load_search_page(url)
+        
+        # Fetch additional batches until we have enough videos
+        all_videos = _select_search_fields(videos, fields)
+        while len(all_videos) < n_videos and continuation_token and not deadline_passed(deadline):
+            try:
+                continuation_data = fetch_youtube_continuation_data(continuation_token, click_tracking_params, '/youtubei/v1/search', session=self.session, json_backend=self.json_backend, innertube=self.innertube,
+                                                                    timeout=request_timeout(self.session.timeout, deadline))
+                next_videos, click_tracking_params, continuation_token = _parse_search_continuation(continuation_data)
+                all_videos.extend(_select_search_fields(next_videos, fields))
+                
+            except (AttributeError, IndexError, TypeError, KeyError):
+                # No more continuation data available
+                break
+            except requests.Timeout:
+                # The request was cut short by the time budget
+                if deadline_passed(deadline):
+                    break
+                raise
+        
+        return {'search_results': all_videos[:n_videos]}
 
 
+class AsyncSearchMixin:
+    """Async mirror of SearchMixin, used by AsyncYoutubeAPI"""
+
+    async def _get_search_url(self, search_term: str, upload_date: str | None = None, duration: str | None = None, features: str | None = None, sort_by: str = 'relevance', filter_mode: str = SEARCH_FILTER_MODE) -> str:
+        """
+        Get a filtered YouTube search URL with specified filters. See SearchMixin._get_search_url.
+        """
+        _check_search_filter_mode(filter_mode)
+        formatted_search_term = search_term.replace(' ', '+')
+        base_url = "https://www.youtube.com"
+        current_url = f"{base_url}/results?search_query={formatted_search_term}"
+        
+        active_filters = _get_active_search_filters(upload_date, duration, features, sort_by)
+        if not active_filters:
+            return current_url
+        
+        local_url = f"{current_url}&sp={quote(_encode_search_params(active_filters), safe='')}"
+        if filter_mode == 'local':
+            return local_url
+        
+        crawled_url = f"{current_url}&sp={quote(await self._resolve_search_params(current_url, active_filters), safe='')}"
+        if filter_mode == 'validate':
+            return _validated_search_url(local_url, crawled_url)
+        return crawled_url
+
+    async def _resolve_search_params(self, search_url: str, active_filters: dict[str, str]) -> str:
+        """
+        Find YouTube's sp value for a filter combination, see SearchMixin._resolve_search_params.
+        """
+        sp = self.search_param_cache.get(active_filters)
+        if sp is not None:
+            return sp
+        
+        base_url = "https://www.youtube.com"
+        current_url = search_url
+        for filter_name, filter_value in active_filters.items():
+            try:
+                scripts = await self._fetch_page_scripts(current_url)
+                current_url = base_url + _get_filter_url_path(scripts, filter_name, filter_value)
+            except Exception as e:
+                raise Exception(f"Failed to apply {filter_name} filter with value '{filter_value}': {str(e)}")
+        
+        sp = _search_url_sp(current_url)
+        if not sp:
+            raise Exception(f"Filtered search URL has no sp parameter: {current_url}")
+        
+        self.search_param_cache.put(active_filters, sp)
+        return sp
+
+    async def _load_search_page(self, url: str) -> tuple[list[dict[str, Any]], str, str]:
+        """
+        Fetch a results page and parse its first batch of results, see SearchMixin._load_search_page.
+        """
+        import httpx
+
         try:
-            search_contents = section_list_renderer.get('sectionListRenderer', {}).get('contents', [])
+            scripts = await self._fetch_page_scripts(url)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 400:
+                raise _RejectedSearchPage(f"YouTube rejected the search URL: {e}") from e
+            raise
+        return _parse_search_page(scripts)
 
-            item_section_renderer_contents = search_contents[0].get('itemSectionRenderer').get('contents')
-            if not item_section_renderer_contents:
-                raise Exception("Could not find itemSectionRenderer contents")
-            videos = [video.get('videoRenderer') for video in item_section_renderer_contents if video.get('videoRenderer')]
-        except (AttributeError, IndexError, TypeError):
-            raise Exception("Could not parse search results")
+    async def search(self, search_term: str, n_videos: int = 100, upload_date: str | None = None, duration: str | None = None, features: str | None = None, sort_by: str = 'relevance', max_seconds: float | None = None, fields: list[str] | None = None, filter_mode: str = SEARCH_FILTER_MODE) -> dict[str, Any]:
+        """
+        Search YouTube videos. See SearchMixin.search for the filter, max_seconds, fields and filter_mode options.
         
+        Returns:
+            dict: Search results
+        """
+        import httpx
+
+        deadline = get_deadline(max_seconds)
+        url = await self._get_search_url(search_term, upload_date, duration, features, sort_by, filter_mode)
         try:
-            click_tracking_params = search_contents[1].get('continuationItemRenderer').get('continuationEndpoint').get('clickTrackingParams')
-            continuation_token = search_contents[1].get('continuationItemRenderer').get('continuationEndpoint').get('continuationCommand').get('token')
-        except (AttributeError, IndexError, TypeError):
-            raise Exception("Could not parse search results")
+            videos, click_tracking_params, continuation_token = await self._load_search_page(url)
+        except _RejectedSearchPage:
+            active_filters = _get_active_search_filters(upload_date, duration, features, sort_by)
+            retry_mode = _search_retry_mode(filter_mode, active_filters, self.search_param_cache)
+            if retry_mode is None:
+                raise
+            url = await self._get_search_url(search_term, upload_date, duration, features, sort_by, retry_mode)
+            videos, click_tracking_params, continuation_token = await self._load_search_page(url)
         
-        # Fetch additional batches until we have enough videos
-        all_videos = videos
-        while len(all_videos) < n_videos and continuation_token:
+        all_videos = _select_search_fields(videos, fields)
+        while len(all_videos) < n_videos and continuation_token and not deadline_passed(deadline):
             try:
-                continuation_data = fetch_youtube_continuation_data(continuation_token, click_tracking_params, '/youtubei/v1/search')
-
-                continuation_items_dict = find_nested_key(continuation_data, 'continuationItems')
-                if not continuation_items_dict:
-                    raise Exception("Could not find continuation items")
-                else:
-                    continuation_items: list[dict[str, Any]] = continuation_items_dict.get('continuationItems', [])
-                
-                next_set_of_videos: list[dict[str, Any]] = continuation_items[0].get('itemSectionRenderer', {}).get('contents', [])
-                if not next_set_of_videos:
-                    raise Exception("Could not find next set of videos")
-                
-                next_videos = [video.get('videoRenderer') for video in next_set_of_videos if video.get('videoRenderer')]
-                
-                all_videos.extend(next_videos)
-                
-                # Update continuation token for next iteration
-                continuation_token:str = continuation_items[1].get('continuationItemRenderer', {}).get('continuationEndpoint', {}).get('continuationCommand', {}).get('token', '')
-                click_tracking_params:str = continuation_items[1].get('continuationItemRenderer', {}).get('continuationEndpoint', {}).get('clickTrackingParams', '')
+                continuation_data = await afetch_youtube_continuation_data(continuation_token, click_tracking_params, '/youtubei/v1/search', self.session, json_backend=self.json_backend, innertube=self.innertube,
+                                                                           timeout=request_timeout(self.session.timeout, deadline))
+                next_videos, click_tracking_params, continuation_token = _parse_search_continuation(continuation_data)
+                all_videos.extend(_select_search_fields(next_videos, fields))
                 
             except (AttributeError, IndexError, TypeError, KeyError):
-                # No more continuation data available
                 break
+            except httpx.TimeoutException:
+                if deadline_passed(deadline):
+                    break
+                raise
         
-        return {'search_results': all_videos[:n_videos]}
\ No newline at end of file
+        return {'search_results': all_videos[:n_videos]}
@@ -1,37 +1,116 @@
-import requests
-from .utils import xml_transcript_to_json_bs4, extract_youtube_page_scripts, grab_dict_by_key
+from .utils import xml_transcript_to_json, json3_transcript_to_json, srv3_transcript_to_json, grab_dict_by_key, unavailable_error
 from .config import HEADERS
 from typing import Any
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+# Caption track formats accepted by get_video_transcript
+TRANSCRIPT_FORMATS = ('xml', 'json3', 'srv3')
+
+
+def _get_caption_base_url(scripts: list[Any]) -> str:
+    """
+    Find the English caption track URL on a watch page.
+    
+    Raises:
+        ResourceUnavailableError: If the page has no caption tracks or no English track
+    """
+    caption_tracks_dict = grab_dict_by_key(scripts, 'captionTracks')
+
+    if not caption_tracks_dict:
+        raise unavailable_error(scripts, 'transcript', "Could not find caption tracks")
+    else:
+        caption_tracks: list[dict[str, Any]] = caption_tracks_dict.get('captionTracks', [])
+
+    base_url = next((item['baseUrl'] for item in caption_tracks if item.get('languageCode') == 'en'), None)
+    if not base_url:
+        raise unavailable_error(scripts, 'transcript', "Could not find base URL")
+    
+    return base_url
+
+
+def _check_transcript_format(format: str) -> None:
+    """
+    Raises:
+        ValueError: If format is not one of TRANSCRIPT_FORMATS
+    """
+    if format not in TRANSCRIPT_FORMATS:
+        raise ValueError(f"Invalid transcript format '{format}'. Must be one of: {list(TRANSCRIPT_FORMATS)}")
+
+
+def _caption_url(base_url: str, format: str) -> str:
+    """Return the caption track URL for the requested format"""
+    if format == 'xml':
+        return base_url
+    
+    parts = urlsplit(base_url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != 'fmt']
+    query.append(('fmt', format))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _parse_caption_track(content: bytes, format: str, json_backend: Any) -> dict[str, Any]:
+    """Parse a downloaded caption track into {"transcript": [...]}"""
+    if format == 'json3':
+        return json3_transcript_to_json(json_backend.loads(content))
+    if format == 'srv3':
+        return srv3_transcript_to_json(content)
+    return xml_transcript_to_json(content)
+
 
 class TranscriptMixin:
     
-    def get_video_transcript(self, video_id: str) -> dict[str, Any]:
+    def get_video_transcript(self, video_id: str, format: str = 'xml') -> dict[str, Any]:
         """
         Get video transcript from YouTube video ID
         
         Args:
             video_id (str): YouTube video ID
+            format (str): Caption track format to download: 'xml' (default), 'json3' or 'srv3'.
+                          json3 is decoded with the client's JSON backend. All formats
+                          return the same structure.
             
         Returns:
             dict: Video transcript
         """
+        _check_transcript_format(format)
+        
         # Construct YouTube URL
         youtube_url = f"https://www.youtube.com/watch?v={video_id}"
         
-        # Get the webpage content
-        scripts = extract_youtube_page_scripts(youtube_url, headers=HEADERS)
-        caption_tracks_dict = grab_dict_by_key(scripts, 'captionTracks')
+        # Get the webpage content, unless the video is known to have no captions
+        with self.negative_cache.track('transcript', video_id):
+            scripts = self._fetch_player_response(youtube_url, headers=HEADERS)
+            base_url = _caption_url(_get_caption_base_url(scripts), format)
+        
+        caption_request = self.session.get(base_url, headers=HEADERS)
+        video_transcript = _parse_caption_track(caption_request.content, format, self.json_backend)
+        
+        return video_transcript
 
-        if not caption_tracks_dict:
-            raise Exception("Could not find caption tracks")
-        else:
-            caption_tracks: list[dict[str, Any]] = caption_tracks_dict.get('captionTracks', [])
 
-        base_url = next((item['baseUrl'] for item in caption_tracks if item.get('languageCode') == 'en'), None)
-        if not base_url:
-            raise Exception("Could not find base URL")
+class AsyncTranscriptMixin:
+    """Async mirror of TranscriptMixin, used by AsyncYoutubeAPI"""
+
+    async def get_video_transcript(self, video_id: str, format: str = 'xml') -> dict[str, Any]:
+        """
+        Get video transcript from YouTube video ID
+        
+        Args:
+            video_id (str): YouTube video ID
+            format (str): Caption track format to download: 'xml' (default), 'json3' or 'srv3'.
+                          json3 is decoded with the client's JSON backend. All formats
+                          return the same structure.
+            
+        Returns:
+            dict: Video transcript
+        """
+        _check_transcript_format(format)
+        youtube_url = f"https://www.youtube.com/watch?v={video_id}"
         
-        caption_request = requests.get(base_url, headers=HEADERS)
-        video_transcript = xml_transcript_to_json_bs4(caption_request.text)
+        async with self.negative_cache.atrack('transcript', video_id):
+            scripts = await self._fetch_player_response(youtube_url, headers=HEADERS)
+            base_url = _caption_url(_get_caption_base_url(scripts), format)
         
-        return video_transcript
\ No newline at end of file
+        caption_request = await self.session.get(base_url, headers=HEADERS)
+        return _parse_caption_track(caption_request.content, format, self.json_backend)
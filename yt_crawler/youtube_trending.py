@@ -46,11 +46,11 @@ class TrendingMixin:
         if category == 'now':
             # Use existing logic for 'now' category
             url = base_url + "/feed/trending"
-            scripts = extract_youtube_page_scripts(url, headers=HEADERS)
+            scripts = self._fetch_page_scripts(url, headers=HEADERS)
         else:
             # For other categories, first get the main trending page to extract category URL
             main_url = base_url + "/feed/trending"
-            scripts = extract_youtube_page_scripts(main_url, headers=HEADERS)
+            scripts = self._fetch_page_scripts(main_url, headers=HEADERS)
             
             
             try:
@@ -63,7 +63,7 @@ class TrendingMixin:
                 
                 # Make request to category-specific URL
                 url = base_url + category_url
-                scripts = extract_youtube_page_scripts(url, headers=HEADERS)
+                scripts = self._fetch_page_scripts(url, headers=HEADERS)
             except (AttributeError, IndexError, TypeError):
                 raise Exception(f"Could not extract URL for category '{category}'")
         
@@ -74,7 +74,7 @@ class TrendingMixin:
             else:
                 tabs:list[dict[str, Any]] = tabs_dict.get('tabs', [])
 
-            contents_dict = find_nested_key(tabs[category_index], 'contents')
+            contents_dict = find_nested_key(tabs[category_index], 'contents', page_type='trending')
             if not contents_dict:
                 raise Exception('Contents not found')
             else: